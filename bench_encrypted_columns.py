@@ -0,0 +1,79 @@
+import random
+import time
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, create_engine, insert, select
+
+from src.model.StudentsDB import create_encrypted_text_type, fernet
+
+
+# Same shape as the student list: name + the three encrypted Aadhaar columns
+def student_table(encrypted_type, name):
+    return Table(
+        name, MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("STUDENTS_NAME", Text),
+        Column("AADHAAR", encrypted_type),
+        Column("FATHERS_AADHAR", encrypted_type),
+        Column("MOTHERS_AADHAR", encrypted_type),
+    )
+
+
+def synthetic_students(engine, table, students, seed=0):
+    rng = random.Random(seed)
+    table.metadata.create_all(engine)
+    rows = [
+        {
+            "id": i,
+            "STUDENTS_NAME": f"Student {i}",
+            "AADHAAR": f"{rng.randrange(10 ** 11, 10 ** 12)}",
+            "FATHERS_AADHAR": f"{rng.randrange(10 ** 11, 10 ** 12)}" if rng.random() < 0.7 else None,
+            "MOTHERS_AADHAR": f"{rng.randrange(10 ** 11, 10 ** 12)}" if rng.random() < 0.5 else None,
+        }
+        for i in range(1, students + 1)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(table), rows)
+
+
+def timed(engine, query, repeat, before=None):
+    best = float("inf")
+    for _ in range(repeat):
+        if before:
+            before()
+        start = time.perf_counter()
+        with engine.connect() as conn:
+            result = conn.execute(query).all()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    students, repeat = 2000, 5
+
+    engine = create_engine("sqlite://")
+    Uncached = create_encrypted_text_type(fernet, cache_size=0)
+    Cached = create_encrypted_text_type(fernet)
+
+    # Both tables read the same ciphertexts
+    legacy = student_table(Uncached, "students")
+    synthetic_students(engine, legacy, students)
+    cached = student_table(Cached, "students")
+
+    list_columns = lambda t: select(t.c.id, t.c.STUDENTS_NAME, t.c.AADHAAR)
+    modal_columns = lambda t: select(t.c.id, t.c.STUDENTS_NAME, t.c.AADHAAR, t.c.FATHERS_AADHAR, t.c.MOTHERS_AADHAR)
+
+    for label, columns in [("list (AADHAAR)", list_columns), ("all 3 encrypted", modal_columns)]:
+        legacy_time, legacy_rows = timed(engine, columns(legacy), repeat)
+        cold_time, _ = timed(engine, columns(cached), repeat, before=Cached.decrypt.cache_clear)
+        warm_time, cached_rows = timed(engine, columns(cached), repeat)
+
+        print(
+            f"{students} students, {label:<16} | decrypt every row {legacy_time * 1000:7.1f} ms | "
+            f"cache cold {cold_time * 1000:7.1f} ms | cache warm {warm_time * 1000:6.1f} ms | "
+            f"x{legacy_time / warm_time:5.1f} | identical: {legacy_rows == cached_rows}"
+        )
+
+    # ?aadhaar=0 on /api/get_students_data
+    excluded_time, _ = timed(engine, select(cached.c.id, cached.c.STUDENTS_NAME,
+                                            cached.c.AADHAAR.isnot(None).label("has_aadhaar")), repeat)
+    print(f"{students} students, {'AADHAAR excluded':<16} | {excluded_time * 1000:7.1f} ms")
@@ -0,0 +1,158 @@
+import random
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+from decimal import Decimal
+
+from src.controller.fees.utils.fetch_fee_data import build_fee_data
+from src.controller.images.thumbnail_cache import thumbnail_url
+
+
+# Reference implementation: the per-student loop that build_fee_data() replaced.
+# Only kept here to check the output and time it.
+
+def build_fee_data_legacy(students, fee_structure, fee_payments, current_session):
+    today = date.today()
+    result = []
+
+    for idx, s in enumerate(students):
+        student = {
+            "id": idx,
+            "student_session_id": s.student_session_id,
+            "name": s.STUDENTS_NAME,
+            "class": s.CLASS,
+            "class_id": s.class_id,
+            "rollNo": s.ROLL,
+            "phone": s.PHONE,
+            "image": thumbnail_url(s.IMAGE, 50) if s.IMAGE else "",
+            "monthlyFees": [],
+            "otherFees": [],
+            "selectedFees": [],
+            "total_due_amount": 0,
+            "total_due_terms": 0
+        }
+
+        payment_map = {}
+        for fee in fee_payments:
+            payment_map[(fee.student_session_id, fee.fee_session_id)] = {
+                "status": fee.payment_status,
+                "payment_date": fee.payment_date,
+                "transaction_no": fee.transaction_no,
+            }
+
+        i=0
+        for f in fee_structure:
+            i+=1
+
+            if f.class_id != s.class_id:
+                continue
+
+            # Determine year
+            due_year = int(current_session) + (f.year_increment or 0)
+            due_date = date(due_year, f.start_month, f.start_day)
+
+            key = (student["student_session_id"], f.fee_session_id)
+            payment = payment_map.get(key)
+
+            if payment:
+                status = payment["status"]
+                paid_date = payment["payment_date"]
+                transaction_no = payment["transaction_no"]
+            else:
+                status = "due" if today > due_date else "upcoming"
+                paid_date = None
+                transaction_no = None
+
+            amount = float(f.amount or 0)
+
+            if status == "due":
+                student["total_due_amount"] += amount
+                if f.fee_type.lower() == "tuition fee":
+                    student["total_due_terms"] += 1
+
+            fee_item = {
+                "id": i,
+                "fee_id": f.fee_session_id,
+                "fee_type": f.fee_type,
+                "period_name": f.period_name,
+                "amount": float(f.amount) if f.amount else 0,
+                "dueDate": f"{f.start_day}-{f.start_month}-{due_year}",
+                "status": status,
+                "paid_date": paid_date.strftime("%d-%m-%Y") if paid_date else None,   # <-- UPDATED
+                "transaction_no": transaction_no,
+            }
+
+            if f.fee_type.lower() == "tuition fee":
+                student["monthlyFees"].append(fee_item)
+            else:
+                student["otherFees"].append(fee_item)
+
+        result.append(student)
+
+    return result
+
+
+# Same columns as the queries in fetch_fee_data()
+Student = namedtuple("Student", "student_id STUDENTS_NAME FATHERS_NAME PHONE IMAGE "
+                                "student_session_id class_id session_id ROLL CLASS")
+Structure = namedtuple("Structure", "fee_type structure_id period_name year_increment "
+                                    "start_day start_month amount class_id fee_session_id")
+Payment = namedtuple("Payment", "fee_session_id student_session_id payment_status "
+                                "paid_amount transaction_no payment_date")
+
+MONTHS = [(4, 0), (5, 0), (6, 0), (7, 0), (8, 0), (9, 0), (10, 0), (11, 0), (12, 0), (1, 1), (2, 1), (3, 1)]
+
+
+def synthetic_school(students, classes=15, session=2025, seed=0):
+    rng = random.Random(seed)
+
+    fee_structure = []
+    fee_session_id = 0
+    for class_id in range(1, classes + 1):
+        for month, year_increment in MONTHS:
+            fee_session_id += 1
+            fee_structure.append(Structure("Tuition Fee", month, f"Month {month}", year_increment,
+                                           10, month, Decimal(500 + class_id * 50), class_id, fee_session_id))
+        for name, month in [("Exam Fee", 9), ("Annual Fee", 4), ("Transport Fee", 7)]:
+            fee_session_id += 1
+            fee_structure.append(Structure(name, 100 + month, name, 0, 1, month,
+                                           Decimal(1000), class_id, fee_session_id))
+
+    school_students = [
+        Student(i, f"Student {i}", f"Father {i}", f"98{i:08d}", None,
+                10_000 + i, rng.randint(1, classes), session, i, f"Class {i % classes}")
+        for i in range(1, students + 1)
+    ]
+
+    fee_payments = []
+    paid_on = date(session, 4, 1)
+    for s in school_students:
+        for f in fee_structure:
+            if f.class_id == s.class_id and rng.random() < 0.5:
+                fee_payments.append(Payment(f.fee_session_id, s.student_session_id, "paid", f.amount,
+                                            f"TXN{len(fee_payments)}", paid_on + timedelta(days=rng.randint(0, 300))))
+
+    return school_students, fee_structure, fee_payments, session
+
+
+def timed(func, args, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    for students, repeat in [(50, 5), (300, 3), (1500, 1)]:
+        args = synthetic_school(students)
+
+        legacy_time, legacy_result = timed(build_fee_data_legacy, args, repeat)
+        new_time, new_result = timed(build_fee_data, args, repeat)
+
+        print(
+            f"{students:>5} students, {len(args[2]):>6} payments | legacy {legacy_time * 1000:9.1f} ms | "
+            f"indexed {new_time * 1000:7.1f} ms | x{legacy_time / new_time:6.1f} | "
+            f"identical: {legacy_result == new_result}"
+        )
@@ -0,0 +1,120 @@
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+
+from bs4 import BeautifulSoup
+from flask import Flask, render_template
+
+from bench_process_marks import synthetic_class
+from src.controller.marks.utils.process_marks import process_marks
+
+
+# Roughly what save_sessions() stores, base.html reads it
+SESSION_DATA = {
+    "role": "Teacher",
+    "all_sessions": [2025, 2024],
+    "school_name": "Example Public School",
+    "user_id": 12,
+    "logo": None,
+    "school_id": "example",
+    "user_name": "Teacher Name",
+    "session_id": 2025,
+    "current_running_session": 2025,
+}
+
+# Same columns as the query in fill_marks.get_marks()
+MarksRow = namedtuple("MarksRow", "id score STUDENTS_NAME GENDER student_id ROLL CLASS exam_id "
+                                  "exam_name weightage subject evaluation_type subject_id")
+
+
+def build_app():
+    app = Flask(__name__, template_folder="src/view/templates", static_folder="src/view/static")
+    app.config["SECRET_KEY"] = "bench"
+    app.jinja_env.globals["getattr"] = getattr
+
+    @app.context_processor
+    def inject_permissions():
+        return dict(has_permission=lambda permission: True)
+
+    return app
+
+
+def fill_marks_rows(students):
+    return [
+        MarksRow(i, None if i % 7 == 0 else i % 80, f"Student {i}", "Male" if i % 2 else "Female", i, i,
+                 "5th", 3, "SA1", 80, "Maths", "numeric", 11)
+        for i in range(1, students + 1)
+    ]
+
+
+# get_marks_api
+def show_marks_full_page(student_marks):
+    html = render_template("show_marks.html", student_marks=student_marks)
+    soup = BeautifulSoup(html, "lxml")
+    return soup.body.find("div", {"id": "results"}).decode_contents()
+
+
+def show_marks_fragment(student_marks):
+    return render_template("html-components/marks_results.html", student_marks=student_marks)
+
+
+# fill_marks.get_marks
+def fill_marks_full_page(rows):
+    html = render_template("fill_marks.html", data=rows, EXAM=None, classes=None)
+    soup = BeautifulSoup(html, "lxml")
+    return soup.body.find("div", {"id": "marksTable"}).decode_contents()
+
+
+def fill_marks_fragment(rows):
+    return render_template("html-components/fill_marks_table.html", data=rows)
+
+
+def measure(func, data, repeat):
+    func(data)  # template compilation is not part of a request
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(data)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(data)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, peak, result
+
+
+def same_content(a, b):
+    """Both renderings show the same text and elements (bs4 re-serialises the markup)."""
+    a, b = BeautifulSoup(a, "lxml"), BeautifulSoup(b, "lxml")
+    return (a.get_text(" ", strip=True) == b.get_text(" ", strip=True)
+            and [tag.name for tag in a.find_all(True)] == [tag.name for tag in b.find_all(True)])
+
+
+if __name__ == "__main__":
+    students = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    repeat = 10
+
+    app = build_app()
+    with app.test_request_context("/"):
+        from flask import session
+        session.update(SESSION_DATA)
+
+        cases = [
+            ("get_marks_api", show_marks_full_page, show_marks_fragment,
+             process_marks(synthetic_class(students), add_grades_flag=False, add_grand_total_flag=True)),
+            ("fill_marks.get_marks", fill_marks_full_page, fill_marks_fragment, fill_marks_rows(students)),
+        ]
+
+        for name, full_page, fragment, data in cases:
+            old_time, old_peak, old_html = measure(full_page, data, repeat)
+            new_time, new_peak, new_html = measure(fragment, data, repeat)
+
+            print(
+                f"{name:>20} | {students} students | page+bs4 {old_time * 1000:7.1f} ms {old_peak / 2**20:6.1f} MiB | "
+                f"fragment {new_time * 1000:6.1f} ms {new_peak / 2**20:5.1f} MiB | "
+                f"x{old_time / new_time:5.1f} | same content: {same_content(old_html, new_html)}"
+            )
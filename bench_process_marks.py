@@ -0,0 +1,359 @@
+import random
+import re
+import time
+from collections import OrderedDict
+from decimal import Decimal
+
+import pandas as pd
+
+from src.controller.marks.utils.calc_grades import get_grade
+from src.controller.marks.utils.process_marks import process_marks
+
+
+# Reference implementation: the per-student groupby.apply pipeline that
+# process_marks() replaced. Only kept here to check the output and time it.
+
+# -------------------------------
+# Utility: Safe subject summation
+# -------------------------------
+
+def sum_subject_marks(df):
+    totals = OrderedDict()
+
+    for subj_dict in df.get("subject_marks_dict", []):
+        if not isinstance(subj_dict, dict):
+            continue
+
+        for subj, mark in subj_dict.items():
+            try:
+                mark = int(mark)
+                totals[subj] = totals.get(subj, 0) + mark
+            except (ValueError, TypeError):
+                continue
+
+    return totals
+
+
+# -------------------------------
+# Add Term Totals
+# -------------------------------
+
+def add_term_totals(group: pd.DataFrame) -> pd.DataFrame:
+    group = group.copy()
+
+    terms = group["exam_term"].dropna().unique()
+
+    # Safe numeric sorting (handles int or "Term 1")
+    def term_sort_key(term):
+        match = re.search(r"(\d+)", str(term))
+        return int(match.group(1)) if match else 0
+
+    terms = sorted(terms, key=term_sort_key)
+
+    new_rows = []
+
+    for term in terms:
+        term_df = group[group["exam_term"] == term]
+        if term_df.empty:
+            continue
+
+        total_subject_marks = sum_subject_marks(term_df)
+
+        base_row = term_df.iloc[0].copy()
+        base_row["exam_name"] = f"{term} Total"
+        base_row["exam_display_order"] = term_df["exam_display_order"].max() + 1
+        base_row["exam_total"] = sum(total_subject_marks.values())
+        base_row["weightage"] = pd.to_numeric(
+            term_df["weightage"], errors="coerce"
+        ).fillna(0).sum()
+        base_row["subject_marks_dict"] = total_subject_marks
+
+        subject_count = len(total_subject_marks)
+        max_marks = base_row["weightage"] * subject_count
+
+        base_row["percentage"] = (
+            (base_row["exam_total"] / max_marks) * 100
+            if max_marks > 0 else 0
+        )
+
+        new_rows.append(base_row)
+
+    if new_rows:
+        return pd.concat([group, pd.DataFrame(new_rows)], ignore_index=True)
+
+    return group
+
+
+# -------------------------------
+# Add Grades
+# -------------------------------
+
+def add_grades(group: pd.DataFrame, exams) -> pd.DataFrame:
+    group = group.copy()
+
+    df = group[group["exam_name"].isin(exams)]
+    if df.empty:
+        return group
+
+    subject_totals = sum_subject_marks(df)
+
+    max_subject_marks = pd.to_numeric(
+        df["weightage"], errors="coerce"
+    ).fillna(0).sum()
+
+    subject_grades = OrderedDict()
+
+    for subj, total in subject_totals.items():
+        percentage = (
+            (total / max_subject_marks) * 100
+            if max_subject_marks > 0 else 0
+        )
+        grade, _ = get_grade(percentage)
+        subject_grades[subj] = grade
+
+    base_row = df.iloc[0].copy()
+
+    subject_count = len(subject_grades)
+    max_total_marks = max_subject_marks * subject_count
+
+    total_percentage = (
+        (sum(subject_totals.values()) / max_total_marks) * 100
+        if max_total_marks > 0 else 0
+    )
+
+    grade, _ = get_grade(total_percentage)
+
+    base_row["exam_name"] = "Grades"
+    base_row["exam_display_order"] = df["exam_display_order"].max() + 2
+    base_row["exam_total"] = grade
+    base_row["weightage"] = ""
+    base_row["percentage"] = None
+    base_row["subject_marks_dict"] = subject_grades
+
+    return pd.concat([group, pd.DataFrame([base_row])], ignore_index=True)
+
+
+# -------------------------------
+# Add Grand Total
+# -------------------------------
+
+def add_grand_total(group: pd.DataFrame, exams) -> pd.DataFrame:
+    group = group.copy()
+
+    df = group[group["exam_name"].isin(exams)]
+    if df.empty:
+        return group
+
+    total_subject_marks = sum_subject_marks(df)
+
+    base_row = df.iloc[0].copy()
+
+    base_row["exam_name"] = "G. Total"
+    base_row["exam_display_order"] = df["exam_display_order"].max() + 1
+    base_row["exam_total"] = sum(total_subject_marks.values())
+    base_row["weightage"] = pd.to_numeric(
+        df["weightage"], errors="coerce"
+    ).fillna(0).sum()
+    base_row["subject_marks_dict"] = total_subject_marks
+
+    subject_count = len(total_subject_marks)
+    max_marks = base_row["weightage"] * subject_count
+
+    base_row["percentage"] = (
+        (base_row["exam_total"] / max_marks) * 100
+        if max_marks > 0 else 0
+    )
+
+    return pd.concat([group, pd.DataFrame([base_row])], ignore_index=True)
+
+
+# -------------------------------
+# Legacy Processor (per-student groupby.apply)
+# -------------------------------
+
+def process_marks_legacy(
+    student_marks_data,
+    add_grades_flag=True,
+    add_grand_total_flag=True,
+):
+
+    if not student_marks_data:
+        return []
+
+    student_marks_df = pd.DataFrame(student_marks_data)
+
+    # Preserve original exams before mutation
+    original_exams = set(student_marks_df["exam_name"].dropna().unique())
+
+    # ---------------- Term Totals ----------------
+    student_marks_df = (
+        student_marks_df
+        .groupby("student_id", group_keys=False)
+        .apply(add_term_totals)
+        .reset_index(drop=True)
+    )
+
+    # ---------------- Grades ----------------
+    if add_grades_flag:
+        student_marks_df = (
+            student_marks_df
+            .groupby("student_id", group_keys=False)
+            .apply(lambda g: add_grades(g, original_exams))
+            .reset_index(drop=True)
+        )
+
+    # ---------------- Grand Total ----------------
+    if add_grand_total_flag:
+        student_marks_df = (
+            student_marks_df
+            .groupby("student_id", group_keys=False)
+            .apply(lambda g: add_grand_total(g, original_exams))
+            .reset_index(drop=True)
+        )
+
+    # ---------------- Clean numeric columns ----------------
+
+    student_marks_df["percentage"] = (
+        pd.to_numeric(student_marks_df["percentage"], errors="coerce")
+        .fillna(0)
+        .round(1)
+    )
+
+    student_marks_df["exam_total"] = (
+        pd.to_numeric(student_marks_df["exam_total"], errors="coerce")
+        .fillna(0)
+        .round(1)
+    )
+
+    # ---------------- Final Structuring ----------------
+
+    non_common_columns = [
+        "exam_name",
+        "subject_marks_dict",
+        "exam_total",
+        "percentage",
+        "exam_display_order",
+        "weightage",
+        "exam_term",
+    ]
+
+    common_columns = [
+        col for col in student_marks_df.columns
+        if col not in non_common_columns
+    ]
+
+    def exam_info_group(df):
+        # Stable: equal display orders keep row layout, like marks_engine
+        df_sorted = df.sort_values(
+            "exam_display_order", na_position="last", kind="stable"
+        )
+
+        ordered_exams = OrderedDict()
+
+        for _, row in df_sorted.iterrows():
+            ordered_exams[row["exam_name"]] = {
+                "subject_marks_dict": row["subject_marks_dict"],
+                "exam_total": row["exam_total"],
+                "percentage": row["percentage"],
+                "weightage": row["weightage"],
+                "exam_term": row["exam_term"],
+            }
+
+        return ordered_exams
+
+    student_marks_df[common_columns] = (
+        student_marks_df[common_columns].fillna("")
+    )
+
+    student_marks_df = (
+        student_marks_df
+        .groupby(common_columns, group_keys=False)
+        .apply(exam_info_group)
+        .reset_index(name="marks")
+    )
+
+    student_marks_df = (
+        student_marks_df
+        .sort_values(["CLASS", "ROLL"])
+        .reset_index(drop=True)
+    )
+
+    return student_marks_df.to_dict(orient="records")
+
+
+
+# Exams as returned by result_data(): (exam_name, term, weightage, display_order)
+EXAMS = [
+    ("FA1", 1, 20, 1), ("FA2", 1, 20, 1), ("SA1", 1, 80, 3), ("HY", 1, 100, 4),
+    ("FA3", 2, 20, 6), ("FA4", 2, 20, 7), ("SA2", 2, 80, 8), ("ANNUAL", 2, 100, 9),
+]
+SUBJECTS = ["Hindi", "English", "Maths", "Science", "Social Science", "Computer"]
+
+
+def synthetic_class(students, seed=0):
+    rng = random.Random(seed)
+    rows = []
+
+    for student_id in range(1, students + 1):
+        grand_total = 0.0
+        exam_rows = []
+
+        for exam_name, term, weightage, display_order in EXAMS:
+            subject_marks = OrderedDict()
+            for subject in SUBJECTS:
+                # ~5% of marks are not filled yet
+                subject_marks[subject] = "" if rng.random() < 0.05 else str(rng.randint(0, weightage))
+
+            exam_total = float(sum(int(m) for m in subject_marks.values() if m))
+            grand_total += exam_total
+
+            exam_rows.append({
+                "exam_name": exam_name,
+                "weightage": Decimal(weightage),
+                "exam_term": Decimal(term),
+                "subject_marks_dict": subject_marks,
+                "exam_total": exam_total,
+                "percentage": exam_total * 100.0 / (weightage * len(SUBJECTS)),
+                "exam_display_order": Decimal(display_order),
+            })
+
+        for row in exam_rows:
+            row.update({
+                "grand_total": grand_total,
+                "overall_rank": 0,
+                "student_id": student_id,
+                "STUDENTS_NAME": f"Student {student_id}",
+                "FATHERS_NAME": f"Father {student_id}",
+                "CLASS": "5th",
+                "ROLL": student_id,
+                "class_id": 5,
+            })
+            rows.append(row)
+
+    # result_data() orders rows by overall rank, not by student
+    rng.shuffle(rows)
+    return rows
+
+
+def timed(func, data, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(data, add_grades_flag=True, add_grand_total_flag=True)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == "__main__":
+    for students, repeat in [(40, 5), (200, 3), (2000, 1)]:
+        data = synthetic_class(students)
+
+        legacy_time, legacy_result = timed(process_marks_legacy, data, repeat)
+        new_time, new_result = timed(process_marks, data, repeat)
+
+        identical = repr(legacy_result) == repr(new_result)
+        print(
+            f"{students:>5} students | legacy {legacy_time * 1000:9.1f} ms | "
+            f"vectorized {new_time * 1000:8.1f} ms | "
+            f"x{legacy_time / new_time:5.1f} | identical: {identical}"
+        )
@@ -0,0 +1,92 @@
+import os
+import sys
+import tempfile
+import time
+
+from dotenv import load_dotenv
+from flask import Flask, session
+from flask_session import Session
+
+from src import configure_sessions
+
+
+load_dotenv()
+
+BASE_URL = "https://localhost"  # session cookies are Secure
+
+# Roughly what save_sessions() stores for a teacher
+SESSION_DATA = {
+    "role": "Teacher",
+    "all_sessions": [2025, 2024, 2023],
+    "school_name": "Example Public School",
+    "user_id": 12,
+    "logo": "1AbCdEfGhIjKlMnOpQrStUvWxYz",
+    "email": "teacher@example.com",
+    "school_id": "example",
+    "permission_no": 3,
+    "user_name": "Teacher Name",
+    "user_image": None,
+    "permissions": [f"permission_{i}" for i in range(40)],
+    "session_id": 2025,
+    "current_running_session": 2025,
+}
+
+
+def build_app(backend):
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "bench"
+    configure_sessions(app, backend)
+
+    if backend == "filesystem":
+        app.config["SESSION_FILE_DIR"] = tempfile.mkdtemp(prefix="bench_sessions_")
+
+    Session(app)
+
+    @app.route("/login")
+    def login():
+        session.update(SESSION_DATA)
+        return "ok"
+
+    @app.route("/read")
+    def read():
+        # Same access pattern as login_required + a typical view
+        return str(all(key in session for key in SESSION_DATA) and session["school_id"])
+
+    @app.route("/write")
+    def write():
+        session["session_id"] = session["session_id"]
+        return "ok"
+
+    return app
+
+
+def bench(backend, requests):
+    app = build_app(backend)
+    client = app.test_client()
+    client.get("/login", base_url=BASE_URL)
+
+    results = {}
+    for path in ["/read", "/write"]:
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(path, base_url=BASE_URL)
+        results[path] = (time.perf_counter() - start) / requests * 1_000_000
+
+    return results
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    backends = ["filesystem"]
+    if os.getenv("REDIS_HOST"):
+        backends.append("redis")
+    else:
+        print("REDIS_HOST not set, skipping the redis backend")
+
+    for backend in backends:
+        results = bench(backend, requests)
+        print(
+            f"{backend:>10} | read-only request {results['/read']:8.1f} us | "
+            f"modifying request {results['/write']:8.1f} us"
+        )
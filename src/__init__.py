@@ -7,6 +7,9 @@ from flask_session import Session
 from flask_sqlalchemy import SQLAlchemy
 import redis
 
+from .db_pool import engine_options
+from .profiler import init_profiler
+
 # ——— Load environment variables ———
 load_dotenv()
 
@@ -16,6 +19,49 @@ sess = Session()
 r = None  # Redis instance
 
 
+def redis_client(decode_responses=True):
+    """Redis Cloud client built from the REDIS_* environment variables."""
+    return redis.Redis(
+        host=os.getenv('REDIS_HOST'),
+        port=int(os.getenv('REDIS_PORT')),
+        username=os.getenv('REDIS_USERNAME', 'default'),
+        password=os.getenv('REDIS_PASSWORD'),
+        decode_responses=decode_responses
+    )
+
+
+def configure_sessions(app, backend=None):
+    """
+    Flask-Session configuration, backend selected by SESSION_BACKEND:
+      - "filesystem" (default): one file per session under app.root_path/flask_session
+      - "redis": msgpack payloads with a Redis TTL, shared by every app instance
+    """
+    backend = (backend or os.getenv('SESSION_BACKEND', 'filesystem')).lower()
+
+    app.config['SESSION_PERMANENT'] = True
+    app.config['PERMANENT_SESSION_LIFETIME'] = 60 * 60 * 24 * 7  # 7 days
+    app.config['SESSION_USE_SIGNER'] = True
+    app.config['SESSION_COOKIE_HTTPONLY'] = True
+    app.config['SESSION_COOKIE_SECURE'] = True   # False for localhost
+
+    if backend == 'redis':
+        app.config['SESSION_TYPE'] = 'redis'
+        # Session payloads are binary msgpack, so this client must not decode responses
+        app.config['SESSION_REDIS'] = redis_client(decode_responses=False)
+        app.config['SESSION_KEY_PREFIX'] = 'session:'
+        app.config['SESSION_SERIALIZATION_FORMAT'] = 'msgpack'
+        # Expiry is the Redis TTL (PERMANENT_SESSION_LIFETIME from the last change);
+        # the session is only written back when it was modified
+        app.config['SESSION_REFRESH_EACH_REQUEST'] = False
+    elif backend == 'filesystem':
+        app.config['SESSION_TYPE'] = 'filesystem'
+        app.config['SESSION_FILE_DIR'] = os.path.join(app.root_path, 'flask_session')
+        app.config['SESSION_FILE_THRESHOLD'] = 500
+        app.config['SESSION_REFRESH_EACH_REQUEST'] = True
+    else:
+        raise ValueError(f"Unknown SESSION_BACKEND: {backend}")
+
+
 def create_app():
     global r
 
@@ -42,43 +88,39 @@ def create_app():
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('URI')
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-    # 🔴 CRITICAL: Supabase connection pool limits
-    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
-        "pool_size": 3,
-        "max_overflow": 2,
-        "pool_timeout": 30,
-        "pool_recycle": 1800,
-        "pool_pre_ping": True,
-    }
+    # 🔴 CRITICAL: Supabase connection pool limits (DB_POOL_MODE, DB_CONNECTION_LIMIT, see db_pool.py)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+
+    # ——— Profiler (PROFILER=1, see profiler.py) ———
+    app.config['PROFILER_ENABLED'] = os.getenv('PROFILER', '0').lower() in ('1', 'true', 'yes', 'on')
+    app.config['PROFILER_SLOW_QUERY_MS'] = float(os.getenv('PROFILER_SLOW_QUERY_MS', 200))
+    app.config['PROFILER_N_PLUS_ONE'] = int(os.getenv('PROFILER_N_PLUS_ONE', 10))
 
     # ——— SESSION CONFIGURATION (Flask-Session) ———
-    app.config['SESSION_TYPE'] = 'filesystem'
-    app.config['SESSION_FILE_DIR'] = os.path.join(app.root_path, 'flask_session')
-    app.config['SESSION_FILE_THRESHOLD'] = 500
-    app.config['SESSION_PERMANENT'] = True
-    app.config['PERMANENT_SESSION_LIFETIME'] = 60 * 60 * 24 * 7  # 7 days
-    app.config['SESSION_USE_SIGNER'] = True
-    app.config['SESSION_COOKIE_HTTPONLY'] = True
-    app.config['SESSION_COOKIE_SECURE'] = True   # False for localhost
-    app.config['SESSION_REFRESH_EACH_REQUEST'] = True
+    configure_sessions(app)
 
     # ——— Initialize extensions ———
     sess.init_app(app)
     db.init_app(app)
 
+    with app.app_context():
+        init_profiler(app, db.engine)
+
+        # ——— Schema steps the models need before any request (no migrations) ———
+        from .controller.students.utils.aadhaar_index import migrate_blind_index
+        try:
+            migrate_blind_index()
+        except Exception as e:
+            db.session.rollback()
+            print("❌ Blind index migration failed, run `flask backfill-blind-index`:", e)
+
     # 🔴 CRITICAL: ALWAYS release DB session after request
     @app.teardown_appcontext
     def shutdown_session(exception=None):
         db.session.remove()
 
     # ——— Redis Cloud setup (independent of DB) ———
-    r = redis.Redis(
-        host=os.getenv('REDIS_HOST'),
-        port=int(os.getenv('REDIS_PORT')),
-        username=os.getenv('REDIS_USERNAME', 'default'),
-        password=os.getenv('REDIS_PASSWORD'),
-        decode_responses=True
-    )
+    r = redis_client()
 
     try:
         r.ping()
@@ -116,6 +158,13 @@ def create_app():
     from .controller import register_blueprints
     register_blueprints(app)
 
+    from .controller.images.thumbnail_cache import thumbnail_url
+    app.jinja_env.globals['thumbnail_url'] = thumbnail_url
+
+    # ——— Command line tools (flask --app app <command>) ———
+    from .commands import register_commands
+    register_commands(app)
+
     # ——— Inject permissions globally in templates ———
     from src.controller.permissions.has_permission import has_permission
 
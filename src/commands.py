@@ -0,0 +1,112 @@
+# src/commands.py
+
+"""Command line tools, run with `flask --app app <command>`."""
+
+import multiprocessing
+
+import click
+
+from src import db
+
+
+def _document_worker_process(app):
+    # Connections opened by the parent must not be shared with the children
+    with app.app_context():
+        db.engine.dispose(close=False)
+
+        from src.controller.jobs.document_jobs import run_worker
+        run_worker(app)
+
+
+def register_commands(app):
+
+    @app.cli.command("image-worker")
+    def image_worker():
+        """Uploads / moves student photos queued by admissions and updates."""
+        from src.controller.students.utils.image_pipeline import run_image_worker
+
+        with app.app_context():
+            run_image_worker()
+
+    @app.cli.command("prefetch-photos")
+    @click.option("--class-id", "class_ids", type=int, multiple=True, required=True, help="Class to warm, repeatable.")
+    @click.option("--session-id", type=int, default=None, help="Defaults to the latest session of each class.")
+    @click.option("--size", "sizes", type=int, multiple=True, default=(200, 220), show_default=True,
+                  help="Thumbnail size, repeatable (200 = admit cards / seat chits, 220 = ID cards).")
+    def prefetch_photos(class_ids, session_id, sizes):
+        """Warms the thumbnail cache before bulk ID card / admit card generation."""
+        from sqlalchemy import func
+        from src.model.StudentSessions import StudentSessions
+        from src.model.StudentsDB import StudentsDB
+        from src.controller.images.thumbnail_cache import prefetch
+
+        with app.app_context():
+            for class_id in class_ids:
+                class_session_id = session_id or db.session.query(func.max(StudentSessions.session_id)).filter(
+                    StudentSessions.class_id == class_id
+                ).scalar()
+
+                images = [image for (image,) in (
+                    db.session.query(StudentsDB.IMAGE)
+                    .join(StudentSessions, StudentSessions.student_id == StudentsDB.id)
+                    .filter(
+                        StudentSessions.class_id == class_id,
+                        StudentSessions.session_id == class_session_id,
+                        StudentsDB.IMAGE.isnot(None),
+                    )
+                    .all()
+                )]
+
+                click.echo(f"Class {class_id} (session {class_session_id}): {len(images)} photos")
+                prefetch(images, sizes=sizes)
+
+    @app.cli.command("backfill-blind-index")
+    @click.option("--batch-size", default=500, show_default=True, help="Students per UPDATE.")
+    @click.option("--all", "recompute", is_flag=True, help="Recompute every row, after changing BLIND_INDEX_KEY.")
+    def backfill_blind_index_command(batch_size, recompute):
+        """Adds and fills the Aadhaar blind index columns of existing students."""
+        from src.controller.students.utils.aadhaar_index import ensure_blind_index_columns, backfill_blind_index
+
+        with app.app_context():
+            ensure_blind_index_columns()
+            updated = backfill_blind_index(batch_size=batch_size, recompute=recompute)
+            click.echo(f"{updated} students updated")
+
+    @app.cli.command("reload-permissions")
+    def reload_permissions():
+        """Makes every process reload Permissions / RolePermissions (after editing them in the database)."""
+        from src.controller.permissions.permission_registry import invalidate_permission_registry
+
+        with app.app_context():
+            invalidate_permission_registry()
+
+    @app.cli.command("reload-reference-data")
+    @click.option("--school-id", "school_ids", multiple=True, help="School to reload, repeatable. Defaults to every school.")
+    def reload_reference_data(school_ids):
+        """Drops cached classes, subjects, exams and school details (after editing them in the database)."""
+        from src.model.Schools import Schools
+        from src.controller.utils.reference_cache import bump_reference_version
+
+        with app.app_context():
+            if not school_ids:
+                school_ids = [school_id for (school_id,) in db.session.query(Schools.id).all()]
+            for school_id in school_ids:
+                bump_reference_version(school_id)
+            click.echo(f"{len(school_ids)} schools reloaded")
+
+    @app.cli.command("document-worker")
+    @click.option("--processes", default=1, show_default=True, help="Worker processes to start.")
+    def document_worker(processes):
+        """Renders queued documents (results, admit cards, registers, ...)."""
+        if processes <= 1:
+            _document_worker_process(app)
+            return
+
+        workers = [
+            multiprocessing.get_context("fork").Process(target=_document_worker_process, args=(app,), daemon=True)
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
@@ -7,6 +7,8 @@ from .home import home_bp
 from .students_list.student_list import student_list_bp
 from .students_list.student_modal_data_api import student_modal_data_api_bp
 from .students_list.get_students_data_api import get_students_data_api_bp
+from .students_list.search_aadhaar_api import search_aadhaar_api_bp
+from .students_list.student_stats_api import student_stats_api_bp
 from .students_list.get_students_pdf_api import get_students_pdf_api_bp
 from .students_list.get_admit_cards_api import get_admit_cards_api_bp
 from .students_list.admit_card_view import admit_card_view_bp
@@ -17,6 +19,8 @@ from .students_list.admit_card_view import admit_card_view_bp
 from .attendance.attendance import attendance_bp
 from .attendance.get_attendance_data_api import get_attendance_data_api_bp
 from .attendance.mark_attendance_api import mark_attendance_api_bp
+from .attendance.bulk_mark_attendance_api import bulk_mark_attendance_api_bp
+from .attendance.attendance_matrix_api import attendance_matrix_api_bp
 from .attendance.add_holiday_api import add_holiday_api_bp
 from .attendance.messages_api import get_message_api_bp
 
@@ -27,9 +31,11 @@ from .fees.get_transactions_api import get_transactions_api_bp
 from .fees.transaction_action_api import transaction_action_api_bp
 from .fees.demand_fee_message_api import demand_fee_message_bp
 from .fees.transaction_watsapp_message_api import transaction_whatsapp_message_bp
+from .fees.dues_report_api import dues_report_api_bp
 
 from .marks.fill_marks import fill_marks_bp
 from .marks.update_marks_api import update_marks_api_bp
+from .marks.bulk_update_marks_api import bulk_update_marks_api_bp
 from .marks.show_marks import show_marks_bp
 from .marks.get_marks_api import get_marks_api_bp
 from .marks.get_result_api import get_result_api_bp
@@ -44,6 +50,11 @@ from .staff_module.utils.get_role_permission import get_role_permissions_bp
 
 from .idcard.idcard import idcard_bp
 
+from .jobs.document_jobs_api import document_jobs_api_bp
+from .images.image_proxy import image_proxy_bp
+from .monitoring.pool_metrics_api import pool_metrics_api_bp
+from .monitoring.debug_perf_api import debug_perf_api_bp
+
 from .sessions.change_session import change_session_bp
 from .RTE.RTE_students import RTE_students_bp
 
@@ -53,6 +64,7 @@ from .promote.get_promotion_student_data_api import get_student_promotion_data_a
 from .promote.get_promoted_student_data_api import get_promoted_student_data_api_bp
 
 from .promote.promote_student_api import promote_student_api_bp
+from .promote.bulk_promote_api import bulk_promote_api_bp
 from .promote.update_promotion_api import update_promotion_api_bp
 from .promote.depromote_student_api import depromote_student_api_bp
 from .promote.promotion_message_api import generate_promotion_message_api_bp
@@ -92,6 +104,8 @@ def register_blueprints(app):
     app.register_blueprint(student_list_bp)
     app.register_blueprint(student_modal_data_api_bp)
     app.register_blueprint(get_students_data_api_bp)
+    app.register_blueprint(search_aadhaar_api_bp)
+    app.register_blueprint(student_stats_api_bp)
     app.register_blueprint(get_students_pdf_api_bp)
     app.register_blueprint(get_admit_cards_api_bp)
     app.register_blueprint(admit_card_view_bp)
@@ -103,6 +117,8 @@ def register_blueprints(app):
     app.register_blueprint(attendance_bp)
     app.register_blueprint(get_attendance_data_api_bp)
     app.register_blueprint(mark_attendance_api_bp)
+    app.register_blueprint(bulk_mark_attendance_api_bp)
+    app.register_blueprint(attendance_matrix_api_bp)
     app.register_blueprint(add_holiday_api_bp)
     app.register_blueprint(get_message_api_bp)
     
@@ -112,6 +128,7 @@ def register_blueprints(app):
     app.register_blueprint(transaction_action_api_bp)
     app.register_blueprint(demand_fee_message_bp)
     app.register_blueprint(transaction_whatsapp_message_bp)
+    app.register_blueprint(dues_report_api_bp)
 
     app.register_blueprint(admission_bp)
     app.register_blueprint(pydantic_verification_api_bp)
@@ -123,6 +140,7 @@ def register_blueprints(app):
 
     app.register_blueprint(fill_marks_bp)
     app.register_blueprint(update_marks_api_bp)
+    app.register_blueprint(bulk_update_marks_api_bp)
     app.register_blueprint(show_marks_bp)
     app.register_blueprint(get_marks_api_bp)
     app.register_blueprint(get_result_api_bp)
@@ -136,6 +154,10 @@ def register_blueprints(app):
     app.register_blueprint(get_role_permissions_bp)
 
     app.register_blueprint(idcard_bp)
+    app.register_blueprint(document_jobs_api_bp)
+    app.register_blueprint(image_proxy_bp)
+    app.register_blueprint(pool_metrics_api_bp)
+    app.register_blueprint(debug_perf_api_bp)
 
     app.register_blueprint(promote_student_bp)
     app.register_blueprint(get_students_by_class_api_bp)
@@ -143,6 +165,7 @@ def register_blueprints(app):
     app.register_blueprint(get_promoted_student_data_api_bp)
 
     app.register_blueprint(promote_student_api_bp)
+    app.register_blueprint(bulk_promote_api_bp)
     app.register_blueprint(update_promotion_api_bp)
     app.register_blueprint(depromote_student_api_bp)
     app.register_blueprint(generate_promotion_message_api_bp)
@@ -1,5 +1,7 @@
 from flask import request, Blueprint, session, current_app
-from datetime import datetime, timedelta
+from datetime import datetime
+from sqlalchemy import BigInteger, Date, DateTime, Text, cast, exists, func, insert, literal, literal_column, select
+from sqlalchemy.orm import aliased
 
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
@@ -11,6 +13,44 @@ from src import db
 add_holiday_api_bp = Blueprint('add_holiday_api_bp', __name__)
 
 
+def insert_holiday_range(school_id, session_id, class_id, s_date, e_date, holiday_name, created_at):
+    """Inserts one holiday row per day of the range in a single INSERT ... SELECT.
+
+    Days already marked as a holiday for the same school, session and class are skipped.
+    Returns the number of rows added.
+    """
+    days = func.generate_series(
+        cast(s_date, Date), cast(e_date, Date), literal_column("interval '1 day'")
+    ).table_valued("day").render_derived(name="days")
+    day = cast(days.c.day, Date)
+
+    existing = aliased(AttendanceHolidays)
+    rows = (
+        select(
+            literal(str(school_id), Text),
+            day,
+            literal(holiday_name, Text),
+            literal(class_id, BigInteger),
+            literal(session_id, BigInteger),
+            literal(created_at, DateTime),
+        )
+        .select_from(days)
+        .where(~exists().where(
+            existing.school_id == str(school_id),
+            existing.session_id == session_id,
+            existing.date == day,
+            existing.class_id.is_not_distinct_from(literal(class_id, BigInteger)),
+        ))
+    )
+
+    result = db.session.execute(
+        insert(AttendanceHolidays).from_select(
+            ["school_id", "date", "name", "class_id", "session_id", "created_at"], rows
+        )
+    )
+    return result.rowcount
+
+
 @add_holiday_api_bp.route('/api/add-holiday', methods=["POST"])
 @login_required
 @permission_required('mark_holiday')
@@ -56,36 +96,11 @@ def add_holiday():
     created_at_batch = datetime.utcnow()
 
     # Create holiday rows for each date in range, avoid duplicates
-    added = 0
-    cur = s_date
-    while cur <= e_date:
-        exists = db.session.query(AttendanceHolidays).filter(
-            AttendanceHolidays.school_id == str(school_id),
-            AttendanceHolidays.session_id == current_session_id,
-            AttendanceHolidays.date == cur,
-            (AttendanceHolidays.class_id == class_id if class_id is not None else AttendanceHolidays.class_id.is_(None))
-        ).first()
-
-        if not exists:
-            holiday = AttendanceHolidays(
-                school_id=str(school_id),
-                date=cur,
-                name=holiday_name,
-                class_id=class_id,
-                session_id=current_session_id,
-                created_at=created_at_batch
-            )
-            db.session.add(holiday)
-            added += 1
-
-        cur = cur + timedelta(days=1)
-
     try:
-        if added > 0:
-            db.session.commit()
-        else:
-            # nothing new added, still return success but note 0
-            db.session.rollback()
+        added = insert_holiday_range(
+            school_id, current_session_id, class_id, s_date, e_date, holiday_name, created_at_batch
+        )
+        db.session.commit()
     except Exception as e:
         current_app.logger.exception('Failed to add holiday(s)')
         db.session.rollback()
@@ -107,7 +122,8 @@ def list_holidays():
         return {"error": "Missing school context (school_id)"}, 400
 
     rows = (
-        db.session.query(AttendanceHolidays)
+        db.session.query(AttendanceHolidays, ClassData.CLASS)
+            .outerjoin(ClassData, ClassData.id == AttendanceHolidays.class_id)
             .filter(AttendanceHolidays.school_id == str(school_id),
                     AttendanceHolidays.session_id == current_session_id)
             .order_by(AttendanceHolidays.created_at.desc(), AttendanceHolidays.date.asc())
@@ -115,15 +131,10 @@ def list_holidays():
         )
 
     batches = {}
-    for r in rows:
+    for r, class_name in rows:
         key = r.created_at.isoformat() if r.created_at else 'single-' + str(r.id)
         ent = {"id": r.id, "date": r.date.isoformat(), "name": r.name, "class_id": r.class_id}
         if key not in batches:
-            # try to get class name
-            class_name = None
-            if r.class_id:
-                c = db.session.query(ClassData).filter(ClassData.id == r.class_id).first()
-                class_name = c.CLASS if c else None
             batches[key] = {"batch_id": key, "name": r.name, "class_id": r.class_id, "class_name": class_name, "entries": [ent], "dates": [r.date]}
         else:
             batches[key]["entries"].append(ent)
@@ -189,20 +200,9 @@ def update_holiday_batch(batch_id):
         ).delete()
 
         # recreate rows for new range with same created_at and proper session_id
-        cur = s_date
-        added = 0
-        while cur <= e_date:
-            holiday = AttendanceHolidays(
-                school_id=str(school_id),
-                date=cur,
-                name=holiday_name,
-                class_id=class_id,
-                session_id=current_session_id,
-                created_at=created_at_dt
-            )
-            db.session.add(holiday)
-            added += 1
-            cur = cur + timedelta(days=1)
+        added = insert_holiday_range(
+            school_id, current_session_id, class_id, s_date, e_date, holiday_name, created_at_dt
+        )
 
         db.session.commit()
     except Exception as e:
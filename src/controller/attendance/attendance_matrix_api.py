@@ -0,0 +1,169 @@
+# src/controller/attendance/attendance_matrix_api.py
+
+from datetime import timedelta
+from sqlalchemy import and_, or_, func, cast, Text
+from flask import session, request, jsonify, Blueprint
+
+from src.model import StudentsDB, StudentSessions
+from src.model.Attendance import Attendance
+from src.model.AttendanceHolidays import AttendanceHolidays
+from src import db
+
+from src.controller.attendance.get_attendance_data_api import parse_date
+from src.controller.permissions.permission_required import permission_required
+from src.controller.auth.login_required import login_required
+
+attendance_matrix_api_bp = Blueprint( 'attendance_matrix_api_bp',   __name__)
+
+MAX_RANGE_DAYS = 366
+
+# One character per day in the encoded matrix, "-" is a working day that was not marked
+STATUS_CODES = {
+    "PRESENT": "P",
+    "ABSENT": "A",
+    "HALF_DAY": "H",
+    "LEAVE": "L",
+    "HOLIDAY": "O",
+}
+NOT_MARKED = "-"
+
+
+def working_days(school_id, class_id, start, end):
+    """Dates between start and end (inclusive) that are neither Sundays nor holidays of the class."""
+    holidays = {
+        row.date for row in
+        db.session.query(AttendanceHolidays.date)
+        .filter(
+            AttendanceHolidays.school_id == school_id,
+            AttendanceHolidays.date.between(start, end),
+            or_(
+                AttendanceHolidays.class_id == class_id,
+                AttendanceHolidays.class_id.is_(None)
+            )
+        )
+        .distinct()
+        .all()
+    }
+
+    days = []
+    day = start
+    while day <= end:
+        # weekday(): Monday=0 ... Sunday=6
+        if day.weekday() != 6 and day not in holidays:
+            days.append(day)
+        day += timedelta(days=1)
+
+    return days
+
+
+def run_length_encode(codes):
+    """"PPPPAPP-" -> "4P1A2P1-"."""
+    runs = []
+    previous, count = None, 0
+    for code in codes:
+        if code == previous:
+            count += 1
+            continue
+        if previous is not None:
+            runs.append(f"{count}{previous}")
+        previous, count = code, 1
+    if previous is not None:
+        runs.append(f"{count}{previous}")
+    return "".join(runs)
+
+
+def attendance_matrix(class_id, session_id, days):
+    """
+    One grouped query for the whole class: per-student status counts plus the
+    "date:status" marks used to build the day columns.
+    """
+    attendance_join = and_(
+        Attendance.student_session_id == StudentSessions.id,
+        Attendance.date.in_(days)
+    )
+
+    def status_count(status):
+        return func.count(Attendance.id).filter(Attendance.status == status)
+
+    return (
+        db.session.query(
+            StudentSessions.id.label("student_session_id"),
+            StudentSessions.ROLL,
+            StudentsDB.STUDENTS_NAME,
+            status_count("PRESENT").label("present"),
+            status_count("ABSENT").label("absent"),
+            status_count("HALF_DAY").label("half_day"),
+            status_count("LEAVE").label("leave"),
+            func.array_agg(
+                func.to_char(Attendance.date, "YYYY-MM-DD").op("||")(":").op("||")(cast(Attendance.status, Text))
+            ).filter(Attendance.id.isnot(None)).label("marks"),
+        )
+        .join(StudentsDB, StudentsDB.id == StudentSessions.student_id)
+        .outerjoin(Attendance, attendance_join)
+        .filter(
+            StudentSessions.class_id == class_id,
+            StudentSessions.session_id == session_id
+        )
+        .group_by(StudentSessions.id, StudentSessions.ROLL, StudentsDB.STUDENTS_NAME)
+        .order_by(StudentSessions.ROLL.asc())
+        .all()
+    )
+
+
+@attendance_matrix_api_bp.route('/api/attendance_matrix', methods=["GET"])
+@login_required
+@permission_required('attendance')
+def attendance_matrix_api():
+    """
+    Students x days attendance for a date range.
+
+    Query args: classID, start, end (same formats as /api/get_attendance_data).
+    Sundays and holidays are left out of "days". Each student's "days" string is
+    run-length encoded over those columns (P/A/H/L, O = holiday status, - = not marked),
+    e.g. "4P1A2P1-".
+    """
+    class_id = request.args.get("classID")
+    start = parse_date(request.args.get("start") or "")
+    end = parse_date(request.args.get("end") or "")
+
+    current_session = session["session_id"]
+    school_id = session["school_id"]
+
+    if not class_id or start is None or end is None:
+        return jsonify({"message": "classID, start and end are required. Use YYYY-MM-DD, DD/MM/YYYY or DD-MM-YYYY"}), 400
+
+    if end < start:
+        return jsonify({"message": "end must not be before start"}), 400
+
+    if (end - start).days >= MAX_RANGE_DAYS:
+        return jsonify({"message": f"Date range cannot be longer than {MAX_RANGE_DAYS} days"}), 400
+
+    days = working_days(school_id, class_id, start, end)
+    column = {day.isoformat(): index for index, day in enumerate(days)}
+
+    students = []
+    for row in attendance_matrix(class_id, current_session, days):
+        codes = [NOT_MARKED] * len(days)
+        for mark in row.marks or []:
+            day, _, status = mark.partition(":")
+            codes[column[day]] = STATUS_CODES.get(status, NOT_MARKED)
+
+        students.append({
+            "student_session_id": row.student_session_id,
+            "ROLL": row.ROLL,
+            "STUDENTS_NAME": row.STUDENTS_NAME,
+            "present": row.present,
+            "absent": row.absent,
+            "half_day": row.half_day,
+            "leave": row.leave,
+            "not_marked": codes.count(NOT_MARKED),
+            "days": run_length_encode(codes),
+        })
+
+    return jsonify({
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "working_days": len(days),
+        "days": list(column),
+        "students": students,
+    }), 200
@@ -0,0 +1,144 @@
+# src/controller/attendance/bulk_mark_attendance_api.py
+
+from datetime import datetime
+from flask import session, request, jsonify, Blueprint
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.controller.permissions.has_permission import has_permission
+from src.controller.permissions.permission_required import permission_required
+from src.controller.auth.login_required import login_required
+from src.controller.attendance.get_attendance_data_api import parse_date
+
+from src.model import Attendance, AttendanceHolidays, StudentSessions
+from src import db
+
+bulk_mark_attendance_api_bp = Blueprint( 'bulk_mark_attendance_api_bp',   __name__)
+
+ALLOWED_STATUS = {"PRESENT", "ABSENT", "HALF_DAY", "LEAVE", "HOLIDAY", None}
+
+
+@bulk_mark_attendance_api_bp.route('/api/bulk_mark_attendance', methods=["POST"])
+@login_required
+@permission_required('attendance')
+def bulk_mark_attendance_api():
+    """
+    Marks a whole class register for one date.
+
+    Body: {"class_id": 1, "date": "2025-07-01",
+           "attendance": [{"student_session_id": 10, "status": "PRESENT", "remark": null}, ...]}
+    A null status clears the student's attendance for that date.
+    """
+    # --- Read Inputs ---
+    data = request.json or {}
+    class_id = data.get("class_id")
+    date_str = data.get("date")
+    register = data.get("attendance")
+
+    current_session = session["session_id"]
+    user_id = session["user_id"]
+    school_id = session.get("school_id")
+
+    # --- Input Validation ---
+    if not class_id or not date_str or not isinstance(register, list) or not register:
+        return jsonify({"message": "class_id, date and attendance are required"}), 400
+
+    date = parse_date(date_str)
+    if date is None:
+        return jsonify({"message": "Invalid date format"}), 400
+
+    current_date = datetime.today().date()
+    if current_date != date:
+        if not has_permission("mark_any_day_attendance"):
+            return jsonify({"message": "Access denied. You are only authorized to record attendance for today only."}), 403
+
+    # One entry per student, the last one in the register wins
+    entries = {}
+    for entry in register:
+        try:
+            student_session_id = int(entry.get("student_session_id"))
+        except (AttributeError, TypeError, ValueError):
+            return jsonify({"message": "Invalid student session in attendance"}), 400
+
+        status = entry.get("status") or None
+        if status not in ALLOWED_STATUS:
+            return jsonify({"message": "Invalid attendance status"}), 400
+
+        entries[student_session_id] = (status, entry.get("remark") or None)
+
+    # --- Holiday / Sunday rules, checked once for the class ---
+    holiday = AttendanceHolidays.query.filter(
+        AttendanceHolidays.school_id == school_id,
+        AttendanceHolidays.date == date,
+        or_(
+            AttendanceHolidays.class_id == class_id,
+            AttendanceHolidays.class_id.is_(None)
+        )
+    ).first()
+
+    if holiday:
+        return jsonify({"message": (
+            f"Attendance cannot be recorded on "
+            f"{date.strftime('%A, %d %B %Y')} because it is a scheduled holiday "
+            f"({holiday.name}). If you believe this is incorrect, please contact administration."
+        )}), 400
+
+    # Don't allow marking attendance on Sundays (weekday(): Monday=0 ... Sunday=6)
+    if date.weekday() == 6:
+        return jsonify({"message": "Attendance cannot be recorded for Sundays. If this is an exception, please contact administration."}), 400
+
+    # --- Every student must belong to this class in the current session ---
+    valid_ids = {
+        row.id for row in
+        db.session.query(StudentSessions.id)
+        .filter(
+            StudentSessions.id.in_(entries.keys()),
+            StudentSessions.class_id == class_id,
+            StudentSessions.session_id == current_session,
+        )
+        .all()
+    }
+    if len(valid_ids) != len(entries):
+        return jsonify({"message": "Invalid student session"}), 404
+
+    marked = [
+        {
+            "student_session_id": student_session_id,
+            "date": date,
+            "status": status,
+            "marked_by": user_id,
+            "remark": remark,
+        }
+        for student_session_id, (status, remark) in entries.items()
+        if status
+    ]
+    cleared = [student_session_id for student_session_id, (status, _) in entries.items() if not status]
+
+    # --- Single upsert (and delete for cleared rows) in one transaction ---
+    try:
+        if marked:
+            stmt = insert(Attendance).values(marked)
+            stmt = stmt.on_conflict_do_update(
+                constraint='uix_attendance_unique',
+                set_={
+                    "status": stmt.excluded.status,
+                    "remark": stmt.excluded.remark,
+                    "marked_by": stmt.excluded.marked_by,
+                },
+            )
+            db.session.execute(stmt)
+
+        if cleared:
+            Attendance.query.filter(
+                Attendance.student_session_id.in_(cleared),
+                Attendance.date == date,
+            ).delete(synchronize_session=False)
+
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print("Bulk Attendance Error:", e)
+        return jsonify({"message": "Database error"}), 500
+
+    return jsonify({"message": "success", "marked": len(marked), "cleared": len(cleared)}), 200
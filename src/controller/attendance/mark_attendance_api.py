@@ -1,7 +1,6 @@
 # src/controller/get_fee.py
 
 from datetime import datetime
-from time import time
 from flask import session, request, jsonify, Blueprint
 from sqlalchemy import and_, or_
 
@@ -18,7 +17,6 @@ mark_attendance_api_bp = Blueprint( 'mark_attendance_api_bp',   __name__)
 @login_required
 @permission_required('attendance')
 def mark_attendance_api():
-    start_time = time()  # start timer
     # --- Read Inputs ---
     data = request.json
     student_session_id = data.get("student_session_id")
@@ -118,8 +116,6 @@ def mark_attendance_api():
             db.session.delete(attendance)
             try:
                 db.session.commit()
-                end_time = time()  # end timer
-                print(f"Attendance took {end_time - start_time:.6f} to mark")
                 return jsonify({"message": "success"}), 200
             except Exception as e:
                 db.session.rollback()
@@ -149,7 +145,4 @@ def mark_attendance_api():
         print("Attendance Error:", e)
         return jsonify({"message": "Database error"}), 500
     
-    end_time = time()  # end timer
-    print(f"Attendance took {end_time - start_time:.6f} to mark")
-
     return jsonify({"message": "success"}), 200
\ No newline at end of file
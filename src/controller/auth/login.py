@@ -6,10 +6,11 @@ from src.model.Schools import Schools
 from src.model.Sessions import Sessions
 from src.model.TeachersLogin import TeachersLogin
 from src.model.Roles import Roles
-from ..permissions.get_permissions import get_permissions
+from ..permissions.get_permissions import get_permission_mask
+from ..permissions.permission_registry import encode_mask
 from ..utils.subdomain_helper import url_for_school
 import os
-from src import r
+from .permission_versions import set_permission_version
 
 login_bp = Blueprint('login_bp', __name__)
 FERNET_KEY = os.environ.get('FERNET_KEY')
@@ -111,8 +112,8 @@ def save_sessions(user=None, user_id=None):
     session["user_name"] = user.Name
     session["user_image"] = user.image
 
-    permissions = get_permissions(user.id, user.role_id)
-    session["permissions"] = permissions
+    # Bitmask of Permissions.id as hex, see permission_registry.py
+    session["permissions"] = encode_mask(get_permission_mask(user.id, user.role_id))
 
     current_running_session = None
     for s in sessions:
@@ -123,6 +124,6 @@ def save_sessions(user=None, user_id=None):
     session["session_id"] = current_running_session
     session['current_running_session'] = current_running_session
 
-    r.set(session['user_id'], user.permission_number)
+    set_permission_version(session['user_id'], user.permission_number)
 
     return True
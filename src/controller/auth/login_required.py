@@ -1,7 +1,7 @@
 from flask import session, redirect, url_for, request, jsonify
 from functools import wraps
-from src import r
 from .login import save_sessions
+from .permission_versions import get_permission_version
 
 
 def login_required(f):
@@ -20,7 +20,7 @@ def login_required(f):
                 else:
                     return redirect(url_for('login_bp.login'))
                 
-        redis_permission_no = r.get(session['user_id'])
+        redis_permission_no = get_permission_version(session['user_id'])
         session_permission_no = session["permission_no"]
 
         if not redis_permission_no:
@@ -0,0 +1,108 @@
+# src/controller/auth/permission_versions.py
+# Used in --> login_required.py, login.py (save_sessions), update_staff_api.py
+
+"""In-process cache of the per-user permission numbers kept in Redis.
+
+login_required compares the session's permission number with the one in
+Redis on every request. The Redis values are cached here for a few seconds and
+every change is published on a pub/sub channel, so the common path makes no
+network call while permission changes still reach every worker almost
+immediately (or after PERMISSION_VERSION_TTL at worst, if a message is lost).
+"""
+
+import threading
+import time
+
+import redis
+
+from src import r
+
+
+PERMISSION_VERSION_CHANNEL = "permission_versions"
+PERMISSION_VERSION_TTL = 5  # seconds
+
+_versions = {}  # user_id -> (permission number, fetched at)
+_versions_lock = threading.Lock()
+
+_listener = None
+_listener_lock = threading.Lock()
+
+
+# -------------------------------
+# Pub/sub invalidation
+# -------------------------------
+
+def _listen():
+    pubsub = r.pubsub(ignore_subscribe_messages=True)
+    try:
+        pubsub.subscribe(PERMISSION_VERSION_CHANNEL)
+        for message in pubsub.listen():
+            user_id, _, version = message["data"].partition(":")
+            with _versions_lock:
+                _versions[user_id] = (version or None, time.monotonic())
+    except redis.exceptions.RedisError as e:
+        print("Permission version listener stopped:", e)
+    finally:
+        pubsub.close()
+
+
+def _ensure_listener():
+    """Starts the subscriber thread lazily, so every forked worker gets its own."""
+    global _listener
+
+    if _listener is not None and _listener.is_alive():
+        return
+
+    with _listener_lock:
+        if _listener is None or not _listener.is_alive():
+            # Anything cached while no listener was running may have missed a change
+            with _versions_lock:
+                _versions.clear()
+            _listener = threading.Thread(target=_listen, name="permission-versions", daemon=True)
+            _listener.start()
+
+
+# -------------------------------
+# Public API
+# -------------------------------
+
+def get_permission_version(user_id):
+    """Permission number of a user, from the local cache when it is fresh."""
+    _ensure_listener()
+
+    key = str(user_id)
+    now = time.monotonic()
+
+    with _versions_lock:
+        cached = _versions.get(key)
+
+    if cached and cached[0] is not None and now - cached[1] < PERMISSION_VERSION_TTL:
+        return cached[0]
+
+    version = r.get(key)
+    if version:
+        with _versions_lock:
+            _versions[key] = (version, now)
+    return version
+
+
+def set_permission_version(user_id, version):
+    """Stores a user's permission number and tells every worker about it."""
+    key = str(user_id)
+    version = str(version)
+
+    r.set(key, version)
+    with _versions_lock:
+        _versions[key] = (version, time.monotonic())
+
+    try:
+        r.publish(PERMISSION_VERSION_CHANNEL, f"{key}:{version}")
+    except redis.exceptions.RedisError as e:
+        print("Unable to publish permission version:", e)
+
+
+def bump_permission_version(user_id):
+    """Increments the permission number of a logged-in user so their session is rebuilt."""
+    permission_no = r.get(str(user_id))
+    if permission_no:
+        set_permission_version(user_id, int(permission_no) + 1)
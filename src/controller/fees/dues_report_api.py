@@ -0,0 +1,110 @@
+# src/controller/fees/dues_report_api.py
+
+import csv
+import io
+import json
+
+from flask import session, request, jsonify, Blueprint, Response, stream_with_context
+
+from src import db
+from src.controller.fees.utils.fetch_fee_data import query_fee_inputs, iter_fee_data
+from src.controller.permissions.permission_required import permission_required
+from src.controller.auth.login_required import login_required
+
+dues_report_api_bp = Blueprint('dues_report_api_bp',   __name__)
+
+CSV_COLUMNS = ["class", "rollNo", "name", "phone", "total_due_amount", "total_due_terms", "due_fees"]
+
+
+def due_rows(students_fee_data, min_due):
+    """Keeps only defaulters and trims each student to the report fields."""
+    for student in students_fee_data:
+        if student["total_due_amount"] < min_due or student["total_due_amount"] <= 0:
+            continue
+
+        due_fees = [
+            {
+                "fee_type": fee["fee_type"],
+                "period_name": fee["period_name"],
+                "amount": fee["amount"],
+                "dueDate": fee["dueDate"],
+            }
+            for fee in student["monthlyFees"] + student["otherFees"]
+            if fee["status"] == "due"
+        ]
+
+        yield {
+            "student_session_id": student["student_session_id"],
+            "class": student["class"],
+            "class_id": student["class_id"],
+            "rollNo": student["rollNo"],
+            "name": student["name"],
+            "phone": student["phone"],
+            "total_due_amount": student["total_due_amount"],
+            "total_due_terms": student["total_due_terms"],
+            "due_fees": due_fees,
+        }
+
+
+def ndjson_stream(rows):
+    for row in rows:
+        yield json.dumps(row) + "\n"
+
+
+def csv_stream(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(CSV_COLUMNS)
+    for row in rows:
+        row = dict(row, due_fees="; ".join(
+            f"{fee['period_name']} ({fee['amount']:g})" for fee in row["due_fees"]
+        ))
+        writer.writerow([row[column] for column in CSV_COLUMNS])
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+
+
+@dues_report_api_bp.route('/api/dues_report', methods=["GET"])
+@login_required
+@permission_required('view_fee_data')
+def dues_report_api():
+    """
+    Streams every defaulter of the current session.
+
+    Query args:
+      - class_id: only this class (default: whole school)
+      - min_due:  minimum due amount to include (default: any due)
+      - format:   "ndjson" (default) or "csv"
+    """
+    current_session = session["session_id"]
+    school_id = session["school_id"]
+
+    try:
+        class_id = int(request.args["class_id"]) if request.args.get("class_id") else None
+        min_due = float(request.args.get("min_due") or 0)
+    except ValueError:
+        return jsonify({"message": "Invalid class_id or min_due"}), 400
+
+    output_format = request.args.get("format", "ndjson").lower()
+    if output_format not in ("ndjson", "csv"):
+        return jsonify({"message": "format must be ndjson or csv"}), 400
+
+    # Three set-based queries for the whole school, then release the connection while streaming
+    students, fee_structure, fee_payments = query_fee_inputs(
+        current_session, school_id, class_id=class_id, order_by_class=True
+    )
+    db.session.close()
+
+    rows = due_rows(iter_fee_data(students, fee_structure, fee_payments, current_session), min_due)
+
+    if output_format == "csv":
+        return Response(
+            stream_with_context(csv_stream(rows)),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f"attachment; filename=dues_report_{current_session}.csv"},
+        )
+
+    return Response(stream_with_context(ndjson_stream(rows)), mimetype="application/x-ndjson")
@@ -9,11 +9,25 @@ from src.model.FeeHeads import FeeHeads
 from src.model.FeeStructure import FeeStructure
 from src.model.FeeTransaction import FeeTransaction
 from src.model.StudentsDB import StudentsDB
+from src.controller.images.thumbnail_cache import thumbnail_url
 from src import db
 
 
 def fetch_fee_data(session_id, school_id, phone = None, class_id =None, student_session_ids = None, student_id = None):
 
+    students, fee_structure, fee_payments = query_fee_inputs(
+        session_id, school_id, phone=phone, class_id=class_id,
+        student_session_ids=student_session_ids, student_id=student_id
+    )
+
+    students_data = build_fee_data(students, fee_structure, fee_payments, session_id)
+    return students_data
+
+
+def query_fee_inputs(session_id, school_id, phone = None, class_id =None, student_session_ids = None,
+                     student_id = None, order_by_class = False):
+    """Runs the three set-based queries (students, fee structure, payments) used by build_fee_data."""
+
     q = (
         db.session.query(
             StudentsDB.id.label("student_id"),
@@ -45,6 +59,9 @@ def fetch_fee_data(session_id, school_id, phone = None, class_id =None, student_
     if school_id:
         q = q.filter(StudentsDB.school_id == school_id)
 
+    if order_by_class:
+        q = q.order_by(ClassData.display_order.asc(), StudentSessions.ROLL.asc())
+
     students = q.all()
 
     class_ids = list({s.class_id for s in students})
@@ -85,87 +102,112 @@ def fetch_fee_data(session_id, school_id, phone = None, class_id =None, student_
         .all()
     )
 
-    students_data = build_fee_data(students, fee_structure, fee_payments, session_id)
-    return students_data
+    return students, fee_structure, fee_payments
 
 
 
-def build_fee_data(students, fee_structure, fee_payments, current_session):
-    today = date.today()
-    result = []
+# -------------------------------
+# Fee status engine
+# -------------------------------
 
-    for idx, s in enumerate(students):
-        student = {
-            "id": idx,
-            "student_session_id": s.student_session_id,
-            "name": s.STUDENTS_NAME,
-            "class": s.CLASS,
-            "class_id": s.class_id,
-            "rollNo": s.ROLL,
-            "phone": s.PHONE,
-            "image": f"https://lh3.googleusercontent.com/d/{s.IMAGE}=s50" if s.IMAGE else "",
-            "monthlyFees": [],
-            "otherFees": [],
-            "selectedFees": [],
-            "total_due_amount": 0,
-            "total_due_terms": 0
+def index_fee_payments(fee_payments):
+    """Payments keyed by (student_session_id, fee_session_id), built once per call."""
+    payment_map = {}
+    for fee in fee_payments:
+        payment_map[(fee.student_session_id, fee.fee_session_id)] = (
+            fee.payment_status,
+            fee.payment_date.strftime("%d-%m-%Y") if fee.payment_date else None,
+            fee.transaction_no,
+        )
+    return payment_map
+
+
+def index_fee_structure(fee_structure, current_session):
+    """
+    Fee structures grouped by class_id (in sequence order) with the due date,
+    amount and the static part of the fee item computed once per structure.
+    """
+    structures_by_class = {}
+
+    for i, f in enumerate(fee_structure, start=1):
+        due_year = int(current_session) + (f.year_increment or 0)
+        is_tuition = f.fee_type.lower() == "tuition fee"
+
+        fee_item = {
+            "id": i,
+            "fee_id": f.fee_session_id,
+            "fee_type": f.fee_type,
+            "period_name": f.period_name,
+            "amount": float(f.amount) if f.amount else 0,
+            "dueDate": f"{f.start_day}-{f.start_month}-{due_year}",
         }
 
-        payment_map = {}
-        for fee in fee_payments:
-            payment_map[(fee.student_session_id, fee.fee_session_id)] = {
-                "status": fee.payment_status,
-                "payment_date": fee.payment_date,
-                "transaction_no": fee.transaction_no,
-            }
+        structures_by_class.setdefault(f.class_id, []).append((
+            f.fee_session_id,
+            date(due_year, f.start_month, f.start_day),
+            float(f.amount or 0),
+            is_tuition,
+            fee_item,
+        ))
+
+    return structures_by_class
+
 
-        i=0
-        for f in fee_structure:
-            i+=1
+def build_fee_data(students, fee_structure, fee_payments, current_session):
+    """Single pass over students, O(students x structures of their class)."""
+    return list(iter_fee_data(students, fee_structure, fee_payments, current_session))
 
-            if f.class_id != s.class_id:
-                continue
 
-            # Determine year
-            due_year = int(current_session) + (f.year_increment or 0)
-            due_date = date(due_year, f.start_month, f.start_day)
+def iter_fee_data(students, fee_structure, fee_payments, current_session):
+    """Yields the fee data of each student as soon as it is computed."""
+    today = date.today()
 
-            key = (student["student_session_id"], f.fee_session_id)
-            payment = payment_map.get(key)
+    payment_map = index_fee_payments(fee_payments)
+    structures_by_class = index_fee_structure(fee_structure, current_session)
+
+    for idx, s in enumerate(students):
+        monthly_fees = []
+        other_fees = []
+        total_due_amount = 0
+        total_due_terms = 0
+
+        for fee_session_id, due_date, amount, is_tuition, fee_item in structures_by_class.get(s.class_id, ()):
+            payment = payment_map.get((s.student_session_id, fee_session_id))
 
             if payment:
-                status = payment["status"]
-                paid_date = payment["payment_date"]
-                transaction_no = payment["transaction_no"]
+                status, paid_date, transaction_no = payment
             else:
                 status = "due" if today > due_date else "upcoming"
                 paid_date = None
                 transaction_no = None
 
-            amount = float(f.amount or 0)
-
             if status == "due":
-                student["total_due_amount"] += amount
-                if f.fee_type.lower() == "tuition fee":
-                    student["total_due_terms"] += 1
-
-            fee_item = {
-                "id": i,
-                "fee_id": f.fee_session_id,
-                "fee_type": f.fee_type,
-                "period_name": f.period_name,
-                "amount": float(f.amount) if f.amount else 0,
-                "dueDate": f"{f.start_day}-{f.start_month}-{due_year}",
-                "status": status,
-                "paid_date": paid_date.strftime("%d-%m-%Y") if paid_date else None,   # <-- UPDATED
-                "transaction_no": transaction_no,
-            }
-
-            if f.fee_type.lower() == "tuition fee":
-                student["monthlyFees"].append(fee_item)
-            else:
-                student["otherFees"].append(fee_item)
+                total_due_amount += amount
+                if is_tuition:
+                    total_due_terms += 1
 
-        result.append(student)
+            item = dict(fee_item)
+            item["status"] = status
+            item["paid_date"] = paid_date
+            item["transaction_no"] = transaction_no
 
-    return result
+            if is_tuition:
+                monthly_fees.append(item)
+            else:
+                other_fees.append(item)
+
+        yield {
+            "id": idx,
+            "student_session_id": s.student_session_id,
+            "name": s.STUDENTS_NAME,
+            "class": s.CLASS,
+            "class_id": s.class_id,
+            "rollNo": s.ROLL,
+            "phone": s.PHONE,
+            "image": thumbnail_url(s.IMAGE, 50) if s.IMAGE else "",
+            "monthlyFees": monthly_fees,
+            "otherFees": other_fees,
+            "selectedFees": [],
+            "total_due_amount": total_due_amount,
+            "total_due_terms": total_due_terms
+        }
@@ -1,6 +1,5 @@
 from flask import Blueprint, render_template, session
 from src import r
-import time  # <-- to measure execution time
 
 
 
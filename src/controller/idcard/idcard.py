@@ -1,22 +1,34 @@
 # src/controller/idcard/idcard.py
 
+from types import SimpleNamespace
+
 from flask import render_template, session, Blueprint, jsonify
 from sqlalchemy import func
 
-from src.model import Schools, TeachersLogin
+from src.model import TeachersLogin
 from src.model.StudentsDB import StudentsDB
 from src.model.StudentSessions import StudentSessions
 from src.model.ClassData import ClassData
-from src.model.ClassAccess import ClassAccess
 
 from src import db
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
+from src.controller.jobs.document_jobs import background_job
+from src.controller.utils.reference_cache import user_classes, user_class_ids, school_info, school_signs
 
 
 
 idcard_bp = Blueprint( 'idcard_bp',   __name__)
 
+
+def idcard_school(school_id):
+    """Cached school details, the name in capitals as printed on the cards."""
+    school = school_info(school_id)
+    if school is None:
+        return None
+    name = school.School_Name.upper() if school.School_Name else None
+    return SimpleNamespace(**dict(school._asdict(), School_Name=name))
+
 #add the aadhar of aarish in database after taking from udise
 
 @idcard_bp.route('/idcard', methods=['GET'])
@@ -27,42 +39,22 @@ def idcards_page():
     school_id = session['school_id']
     user_id = session["user_id"]
 
-    classes_query = (
-        db.session.query(ClassData)
-        .join(ClassAccess, ClassAccess.class_id == ClassData.id)
-        .filter(ClassAccess.staff_id == user_id)
-        .order_by(ClassData.id.asc())
-    )
-
-    classes = classes_query.all()
-
-    school = db.session.query(
-        func.upper(Schools.School_Name).label('School_Name'),
-        Schools.Address,
-        Schools.Phone,
-        Schools.Logo,
-        Schools.UDISE
-    ).filter(
-        Schools.id == school_id
-    ).first()
+    classes = user_classes(school_id, user_id)
+    school = idcard_school(school_id)
 
     return render_template('/idcard.html', school=school, classes=classes)
 
 @idcard_bp.route('/idcard/api/students/<int:class_id>', methods=['GET'])
 @login_required
 @permission_required('idcard')
+@background_job
 def get_students_by_class(class_id):
     school_id = session['school_id']
     current_session = session["session_id"]
     user_id = session["user_id"]
 
     # Check if user has access to this class
-    has_access = db.session.query(ClassAccess).filter(
-        ClassAccess.staff_id == user_id,
-        ClassAccess.class_id == class_id
-    ).first()
-    
-    if not has_access:
+    if class_id not in user_class_ids(school_id, user_id):
         return jsonify({'error': 'Access denied'}), 403
 
     # Query students for the specific class
@@ -94,20 +86,8 @@ def get_students_by_class(class_id):
     ).all()
 
     # Get school data
-    school = db.session.query(
-        func.upper(Schools.School_Name).label('School_Name'),
-        Schools.Address,
-        Schools.Phone,
-        Schools.Logo,
-        Schools.UDISE
-    ).filter(
-        Schools.id == school_id
-    ).first()
-
-    principal_sign = db.session.query(TeachersLogin.Sign).filter(
-        TeachersLogin.school_id == school_id,
-        TeachersLogin.role_id == 2
-    ).scalar()
+    school = idcard_school(school_id)
+    principal_sign, _ = school_signs(school_id)
 
     current_session = int(current_session)
     session_year = f"{current_session}-{str(current_session + 1)[-2:]}"
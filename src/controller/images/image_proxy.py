@@ -0,0 +1,32 @@
+# src/controller/images/image_proxy.py
+
+from flask import Blueprint, request, redirect, send_file, jsonify
+
+from src.controller.auth.login_required import login_required
+from src.controller.images.thumbnail_cache import DRIVE_IMAGE_URL, valid_request, get_thumbnail
+
+image_proxy_bp = Blueprint('image_proxy_bp', __name__)
+
+# Drive ids are immutable, so a thumbnail URL can be cached by the browser for good
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+@image_proxy_bp.route('/img/<file_id>/<int:size>', methods=["GET"])
+@login_required
+def thumbnail(file_id, size):
+    if not valid_request(file_id, size):
+        return jsonify({"message": "Invalid image or size"}), 404
+
+    # Answer revalidations without touching the disk
+    etag = f"{file_id}-{size}"
+    if etag in request.if_none_match:
+        return "", 304, {"ETag": f'"{etag}"', "Cache-Control": CACHE_CONTROL}
+
+    path = get_thumbnail(file_id, size)
+    if not path:
+        # Let the browser try Google directly
+        return redirect(DRIVE_IMAGE_URL.format(file_id=file_id, size=size))
+
+    response = send_file(path, mimetype="image/jpeg", etag=etag, max_age=31536000, conditional=True)
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
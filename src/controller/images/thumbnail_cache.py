@@ -0,0 +1,148 @@
+# src/controller/images/thumbnail_cache.py
+# Used in --> image_proxy.py, src/commands.py, fetch_fee_data.py, report_card_worker.py (copy), templates (thumbnail_url)
+
+"""On-disk cache of Google Drive photo thumbnails.
+
+Google resizes the photo for us (`=s{size}`), so a thumbnail is fetched once per
+(file id, size) and then served from THUMBNAIL_CACHE_DIR. Drive file ids never
+change content (a new photo gets a new id), so cached files never go stale; the
+cache is only bounded in size, evicting the least recently used files.
+"""
+
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+DRIVE_IMAGE_URL = "https://lh3.googleusercontent.com/d/{file_id}=s{size}"
+THUMBNAIL_SIZES = (50, 100, 200, 220, 300, 500, 600)
+FILE_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{10,200}$")
+
+CACHE_DIR = os.getenv("THUMBNAIL_CACHE_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "thumbnail_cache"
+)
+CACHE_MAX_BYTES = int(os.getenv("THUMBNAIL_CACHE_MAX_MB", 512)) * 1024 * 1024
+FETCH_TIMEOUT = 10
+
+_size_lock = threading.Lock()
+_cache_bytes = None  # bytes on disk, counted lazily
+
+
+def thumbnail_url(file_id, size=200):
+    """Local URL of a photo thumbnail (Jinja global)."""
+    if not file_id:
+        return ""
+    return f"/img/{file_id}/{size}"
+
+
+def valid_request(file_id, size):
+    return size in THUMBNAIL_SIZES and bool(FILE_ID_PATTERN.match(file_id or ""))
+
+
+def cache_path(file_id, size):
+    # Two-level fan-out keeps directories small
+    return os.path.join(CACHE_DIR, file_id[:2], f"{file_id}_{size}.jpg")
+
+
+# -------------------------------
+# Size bound / LRU eviction
+# -------------------------------
+
+def _cached_files():
+    for root, _, names in os.walk(CACHE_DIR):
+        for name in names:
+            if name.endswith(".jpg"):
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield path, stat.st_size, stat.st_mtime
+
+
+def _add_bytes(count):
+    global _cache_bytes
+
+    with _size_lock:
+        if _cache_bytes is None:
+            _cache_bytes = sum(size for _, size, _ in _cached_files())
+        _cache_bytes += count
+        over = _cache_bytes > CACHE_MAX_BYTES
+
+    if over:
+        evict()
+
+
+def evict(target_ratio=0.9):
+    """Deletes least recently used thumbnails until the cache is below 90% of its limit."""
+    global _cache_bytes
+
+    with _size_lock:
+        files = sorted(_cached_files(), key=lambda item: item[2])
+        total = sum(size for _, size, _ in files)
+
+        for path, size, _ in files:
+            if total <= CACHE_MAX_BYTES * target_ratio:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+
+        _cache_bytes = total
+
+
+# -------------------------------
+# Fetching
+# -------------------------------
+
+def get_thumbnail(file_id, size):
+    """Path of the cached thumbnail, fetching it from Google on a miss. None if it can't be fetched."""
+    path = cache_path(file_id, size)
+
+    if os.path.exists(path):
+        # mtime is the LRU clock
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return path
+
+    try:
+        response = requests.get(DRIVE_IMAGE_URL.format(file_id=file_id, size=size), timeout=FETCH_TIMEOUT)
+    except requests.RequestException as e:
+        print(f"Thumbnail fetch failed for {file_id}:", e)
+        return None
+
+    if response.status_code != 200 or not response.headers.get("Content-Type", "").startswith("image/"):
+        print(f"Thumbnail fetch failed for {file_id}: HTTP {response.status_code}")
+        return None
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Concurrent misses for the same photo: each writes its own temp file, the last rename wins
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp_path, path)
+
+    _add_bytes(len(response.content))
+    return path
+
+
+def prefetch(file_ids, sizes=(200,), workers=8):
+    """Warms the cache for many photos. Returns (fetched or cached, failed)."""
+    jobs = [(file_id, size) for file_id in set(file_ids) if file_id for size in sizes
+            if valid_request(file_id, size)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(lambda job: get_thumbnail(*job), jobs))
+
+    ok = sum(1 for path in results if path)
+    print(f"Prefetched {ok}/{len(jobs)} thumbnails in {time.perf_counter() - start:.2f}s")
+    return ok, len(jobs) - ok
@@ -0,0 +1,287 @@
+# src/controller/jobs/document_jobs.py
+# Used in --> get_admit_cards_api.py, exam_seat_chits.py, get_students_pdf_api.py,
+#             idcard.py, bulk_download_results.py, document_jobs_api.py, src/commands.py
+
+"""Background rendering of heavy documents (results, admit cards, registers, ...).
+
+A view decorated with @background_job runs as usual, unless the request asks
+for background=1 (query string or JSON body). Then the request is recorded in
+Redis and queued, and the view answers 202 with a job id right away.
+
+A worker (`flask --app app document-worker`) replays the queued request: it
+rebuilds the request and the user's session, calls the same view function and
+keeps the response body on disk. /api/jobs/<job_id> reports the status and
+/api/jobs/<job_id>/result serves the stored body.
+"""
+
+import hashlib
+import json
+import os
+import time
+import uuid
+from functools import wraps
+
+import redis
+from flask import current_app, jsonify, request, session, url_for
+
+from src import r, db
+
+
+JOB_QUEUE = "doc_jobs:queue"
+JOB_KEY = "doc_job:{}"
+JOB_DEDUPE_KEY = "doc_job_key:{}"
+
+JOB_TTL = 60 * 60 * 24  # job records and result files, seconds
+JOB_REUSE_SECONDS = int(os.getenv("JOB_REUSE_SECONDS", 300))  # same request reuses a finished result
+JOB_RUNNING_TIMEOUT = int(os.getenv("JOB_RUNNING_TIMEOUT", 15 * 60))  # a longer "running" job lost its worker
+CLEANUP_INTERVAL = 600
+
+
+def result_dir():
+    # instance/ sits next to the package, outside the source tree
+    return os.getenv("JOB_RESULT_DIR") or os.path.join(current_app.instance_path, "job_results")
+
+
+def result_path(job_id):
+    return os.path.join(result_dir(), f"{job_id}.body")
+
+
+def get_job(job_id):
+    """The job record, None if unknown. A job running past JOB_RUNNING_TIMEOUT is marked failed."""
+    key = JOB_KEY.format(job_id)
+    job = r.hgetall(key)
+    if not job:
+        return None
+
+    if job["status"] == "running" and time.time() - float(job.get("started_at") or 0) > JOB_RUNNING_TIMEOUT:
+        # The worker died (or was killed) mid-job, it will never finish it
+        job.update({"status": "failed", "error": "Worker stopped while rendering, please try again"})
+        r.hset(key, mapping={"status": job["status"], "error": job["error"]})
+    return job
+
+
+# -------------------------------
+# Web side
+# -------------------------------
+
+def _request_json():
+    return request.get_json(silent=True) if request.is_json else None
+
+
+def _permissions_value(value):
+    # Hex permission mask, or the name list of a session saved before masks
+    return [str(name) for name in value] if isinstance(value, list) else str(value)
+
+
+# Session keys the document views and login_required read, with their types.
+# Only these are replayed, rebuilt with the same types the live request had.
+JOB_SESSION_FIELDS = {
+    "user_id": int,
+    "school_id": str,
+    "session_id": int,
+    "current_running_session": int,
+    "role": str,
+    "permissions": _permissions_value,
+    "permission_no": int,
+    "school_name": str,
+    "logo": str,
+}
+
+
+def job_session(source):
+    """The replayable keys of a session (or of its stored copy), with explicit types."""
+    return {
+        key: None if source[key] is None else cast(source[key])
+        for key, cast in JOB_SESSION_FIELDS.items()
+        if key in source
+    }
+
+
+def wants_background():
+    if request.args.get("background") in ("1", "true"):
+        return True
+    data = _request_json()
+    return isinstance(data, dict) and bool(data.get("background"))
+
+
+def _job_request():
+    """The current request without the background flag, as the worker will replay it."""
+    query = [(key, value) for key, value in request.args.items(multi=True) if key != "background"]
+
+    data = _request_json()
+    if isinstance(data, dict):
+        data = {key: value for key, value in data.items() if key != "background"}
+
+    return {
+        "endpoint": request.endpoint,
+        "path": request.path,
+        "method": request.method,
+        "query": json.dumps(query),
+        "json": json.dumps(data),
+    }
+
+
+def enqueue_current_request():
+    """Queues the current request, or returns the pending/recent job for the same request."""
+    job = _job_request()
+    job.update({
+        "school_id": session["school_id"],
+        "session_id": session["session_id"],
+        "user_id": session["user_id"],
+    })
+
+    digest = hashlib.sha1(json.dumps(job, sort_keys=True, default=str).encode()).hexdigest()
+    dedupe_key = JOB_DEDUPE_KEY.format(digest)
+    job_id = uuid.uuid4().hex
+
+    # Same document already queued, running or just rendered
+    if not r.set(dedupe_key, job_id, nx=True, ex=JOB_TTL):
+        existing = r.get(dedupe_key)
+        existing_job = get_job(existing) if existing else None
+        if existing_job and existing_job["status"] in ("queued", "running", "done"):
+            return existing
+        r.set(dedupe_key, job_id, ex=JOB_TTL)
+
+    job.update({
+        "status": "queued",
+        "session": json.dumps(job_session(session)),
+        "dedupe_key": dedupe_key,
+        "created_at": time.time(),
+    })
+
+    pipe = r.pipeline()
+    pipe.hset(JOB_KEY.format(job_id), mapping={key: str(value) for key, value in job.items()})
+    pipe.expire(JOB_KEY.format(job_id), JOB_TTL)
+    pipe.rpush(JOB_QUEUE, job_id)
+    pipe.execute()
+
+    return job_id
+
+
+def background_job(f):
+    """Lets a document view be queued with background=1 instead of rendering in the request."""
+    @wraps(f)
+    def wrapped(*args, **kwargs):
+        if not wants_background():
+            return f(*args, **kwargs)
+
+        try:
+            job_id = enqueue_current_request()
+        except redis.exceptions.RedisError as e:
+            # Queue unavailable: render it now, as before
+            print("Unable to queue document job:", e)
+            return f(*args, **kwargs)
+
+        return jsonify({
+            "message": "queued",
+            "job_id": job_id,
+            "status_url": url_for("document_jobs_api_bp.job_status", job_id=job_id),
+            "result_url": url_for("document_jobs_api_bp.job_result", job_id=job_id),
+        }), 202
+    return wrapped
+
+
+# -------------------------------
+# Worker side
+# -------------------------------
+
+def _error_message(response):
+    try:
+        return (response.get_json(silent=True) or {}).get("message") or f"HTTP {response.status_code}"
+    except Exception:
+        return f"HTTP {response.status_code}"
+
+
+def execute_job(app, job_id, job):
+    """Replays the queued request as the user who made it and stores the response body."""
+    builder = {
+        "method": job["method"],
+        "query_string": json.loads(job["query"]),
+    }
+    data = json.loads(job["json"])
+    if data is not None:
+        builder["json"] = data
+
+    with app.test_request_context(job["path"], **builder):
+        session.update(job_session(json.loads(job["session"])))
+
+        view = app.view_functions[job["endpoint"]]
+        response = app.make_response(view(**(request.view_args or {})))
+
+        if response.status_code != 200:
+            return "failed", {"error": _error_message(response)}
+
+        os.makedirs(result_dir(), exist_ok=True)
+        path = result_path(job_id)
+        with open(path + ".tmp", "wb") as f:
+            f.write(response.get_data())
+        os.replace(path + ".tmp", path)
+
+        return "done", {"mimetype": response.mimetype}
+
+
+def cleanup_results(max_age=JOB_TTL):
+    """Removes result files whose job records have expired."""
+    directory = result_dir()
+    if not os.path.isdir(directory):
+        return
+
+    cutoff = time.time() - max_age
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def run_worker(app, poll_timeout=5):
+    """Takes jobs off the queue forever. Needs an app context."""
+    print(f"Document worker {os.getpid()} waiting for jobs")
+    last_cleanup = 0
+
+    while True:
+        if time.monotonic() - last_cleanup > CLEANUP_INTERVAL:
+            cleanup_results()
+            last_cleanup = time.monotonic()
+
+        try:
+            popped = r.blpop(JOB_QUEUE, timeout=poll_timeout)
+        except redis.exceptions.RedisError as e:
+            print("Document worker lost Redis:", e)
+            time.sleep(poll_timeout)
+            continue
+
+        if not popped:
+            continue
+
+        job_id = popped[1]
+        key = JOB_KEY.format(job_id)
+        job = r.hgetall(key)
+        if not job:
+            continue
+
+        r.hset(key, mapping={"status": "running", "started_at": time.time()})
+        start = time.perf_counter()
+
+        try:
+            status, fields = execute_job(app, job_id, job)
+        except Exception as e:
+            print(f"Document job {job_id} failed:", e)
+            status, fields = "failed", {"error": str(e)}
+        finally:
+            db.session.remove()
+
+        fields.update({"status": status, "finished_at": time.time()})
+        pipe = r.pipeline()
+        pipe.hset(key, mapping={k: str(v) for k, v in fields.items()})
+        # Unless this job timed out and the same request was queued again meanwhile
+        if r.get(job["dedupe_key"]) == job_id:
+            if status == "done":
+                pipe.expire(job["dedupe_key"], JOB_REUSE_SECONDS)
+            else:
+                pipe.delete(job["dedupe_key"])
+        pipe.execute()
+
+        print(f"Document job {job_id} ({job['endpoint']}) {status} in {time.perf_counter() - start:.2f}s")
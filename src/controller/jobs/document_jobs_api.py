@@ -0,0 +1,60 @@
+# src/controller/jobs/document_jobs_api.py
+
+import os
+
+from flask import session, jsonify, Blueprint, send_file, url_for
+
+from src.controller.auth.login_required import login_required
+from src.controller.jobs.document_jobs import get_job, result_path
+
+document_jobs_api_bp = Blueprint('document_jobs_api_bp', __name__)
+
+
+def own_job(job_id):
+    """The job, if it was queued by the logged-in user of this school."""
+    job = get_job(job_id)
+    if not job:
+        return None
+    if job["school_id"] != str(session["school_id"]) or job["user_id"] != str(session["user_id"]):
+        return None
+    return job
+
+
+@document_jobs_api_bp.route('/api/jobs/<job_id>', methods=["GET"])
+@login_required
+def job_status(job_id):
+    job = own_job(job_id)
+    if not job:
+        return jsonify({"message": "Job not found"}), 404
+
+    response = {
+        "job_id": job_id,
+        "status": job["status"],
+        "endpoint": job["endpoint"],
+    }
+    if job["status"] == "done":
+        response["result_url"] = url_for("document_jobs_api_bp.job_result", job_id=job_id)
+    if job["status"] == "failed":
+        response["error"] = job.get("error")
+
+    return jsonify(response), 200
+
+
+@document_jobs_api_bp.route('/api/jobs/<job_id>/result', methods=["GET"])
+@login_required
+def job_result(job_id):
+    job = own_job(job_id)
+    if not job:
+        return jsonify({"message": "Job not found"}), 404
+
+    if job["status"] == "failed":
+        return jsonify({"message": job.get("error") or "Job failed", "status": "failed"}), 500
+
+    if job["status"] != "done":
+        return jsonify({"message": "Job is not finished yet", "status": job["status"]}), 202
+
+    path = result_path(job_id)
+    if not os.path.exists(path):
+        return jsonify({"message": "Result expired, please generate it again"}), 410
+
+    return send_file(path, mimetype=job.get("mimetype") or "text/html", max_age=0)
@@ -1,27 +1,42 @@
 # src/controller/marks/bulk_download_results.py
 
-from flask import session, request, jsonify, Blueprint, render_template
+import json
+
+from flask import session, request, jsonify, Blueprint, render_template, Response, stream_with_context
 from sqlalchemy import func
 
 from src.model import StudentsDB
-from src.model.ClassAccess import ClassAccess
-from src.model.Roles import Roles
-from src.model.Schools import Schools
-from src.model.TeachersLogin import TeachersLogin
 from src import db
 
 
-from .utils.marks_processing import result_data
+from .utils.result_cache import cached_result_data
 from .utils.process_marks import process_marks
+from .utils.report_card_renderer import render_report_cards, chunked
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.jobs.document_jobs import background_job
+from src.controller.utils.reference_cache import school_classes, school_info, school_signs
 
 bulk_download_results_bp = Blueprint('bulk_download_results_bp', __name__)
 
+RESULT_EXTRA_FIELDS = {
+    "StudentsDB": ["STUDENTS_NAME", "FATHERS_NAME", "IMAGE",
+                   "MOTHERS_NAME", "ADDRESS", "PHONE", 'GENDER', "PEN"],
+    "expr": [func.to_char(StudentsDB.DOB, 'Dy, DD Mon YYYY').label("DOB")],
+    "ClassData": ["CLASS"],
+    "StudentSessions": ["ROLL", "class_id", "Attendance"],
+}
+
+
+def session_year_label(session_id):
+    current_session = int(session_id)
+    return f"{current_session}-{str(current_session + 1)[-2:]}"
+
 
 @bulk_download_results_bp.route('/bulk_download_results', methods=["POST"])
 @login_required
 @permission_required('get_result')  # Assuming same permission as single download
+@background_job
 def bulk_download_results():
     current_session_id = session["session_id"]
     user_id = session["user_id"]
@@ -40,66 +55,21 @@ def bulk_download_results():
     if not student_ids or not current_session_id or not user_id:
         return jsonify({"message": "Session data missing. Please logout and login again!"}), 403
 
-    extra_fields = {
-        "StudentsDB": ["STUDENTS_NAME", "FATHERS_NAME", "IMAGE",
-                       "MOTHERS_NAME", "ADDRESS", "PHONE", 'GENDER', "PEN"],
-        "expr": [func.to_char(StudentsDB.DOB, 'Dy, DD Mon YYYY').label("DOB")],
-        "ClassData": ["CLASS"],
-        "StudentSessions": ["ROLL", "class_id", "Attendance"],
-    }
-
-    student_marks_data = result_data(school_id, current_session_id, 
-                                     class_id, student_ids=student_ids,
-                                     extra_fields=extra_fields)
+    student_marks_data = cached_result_data(school_id, current_session_id,
+                                            class_id, student_ids=student_ids,
+                                            extra_fields=RESULT_EXTRA_FIELDS)
 
     if not student_marks_data:
         return jsonify({"message": "No Data Found"}), 400
 
     student_marks = process_marks(student_marks_data, add_grades_flag=True, add_grand_total_flag=True)
 
-    school = (
-        db.session.query(
-            Schools.Logo,
-            Schools.school_heading_image
-        )
-        .filter(Schools.id == school_id)
-        .first()
-    )
-
-    import time
-
-    start = time.perf_counter()
-
-    rows = (
-        db.session.query(
-            TeachersLogin.Sign,
-            Roles.role_name,
-            ClassAccess.class_id
-        )
-        .join(Roles, Roles.id == TeachersLogin.role_id)
-        .outerjoin(ClassAccess, ClassAccess.staff_id == TeachersLogin.id)
-        .filter(
-            TeachersLogin.school_id == school_id,
-            Roles.role_name.in_(["Principal", "Teacher"])
-        )
-        .all()
-    )
-
-    principal_sign = None
-    teacher_sign = None
-
-    for sign, role, cls_id in rows:
-        if role == "Principal":
-            principal_sign = sign
-        elif role == "Teacher" and cls_id == class_id:
-            teacher_sign = sign
-
-    end = time.perf_counter()
-
-    print(f"Total time taken: {(end - start) * 1000:.2f} ms")
-
-    current_session = int(current_session_id)
-    session_year = f"{current_session}-{str(current_session + 1)[-2:]}"
+    school = school_info(school_id)
+
+    principal_sign, teacher_signs = school_signs(school_id)
+    teacher_sign = teacher_signs.get(class_id)
+
+    session_year = session_year_label(current_session_id)
 
     # Generate HTML for bulk results
     html = render_template('pdf-components/tall_result.html', students=student_marks, 
@@ -107,4 +77,99 @@ def bulk_download_results():
                             school_logo=school.Logo, school_heading_image=school.school_heading_image,
                             sesion_year=session_year)
 
-    return jsonify({"html": html})
\ No newline at end of file
+    return jsonify({"html": html})
+
+
+@bulk_download_results_bp.route('/bulk_download_results_stream', methods=["POST"])
+@login_required
+@permission_required('get_result')
+def bulk_download_results_stream():
+    """
+    Streams report cards for one, several or all classes.
+
+    Body: {"class_ids": [1, 2] | "all", "student_ids": [...] (single class only),
+           "format": "ndjson" (default) | "html"}
+    ndjson: one {"class_id", "class", "html"} line per chunk of students.
+    html:   a single tall_result.html document, sent chunk by chunk.
+    """
+    current_session_id = session["session_id"]
+    school_id = session["school_id"]
+
+    data = request.json or {}
+    output_format = (data.get("format") or "ndjson").lower()
+    if output_format not in ("ndjson", "html"):
+        return jsonify({"message": "format must be ndjson or html"}), 400
+
+    try:
+        class_ids = data.get("class_ids")
+        if class_ids != "all":
+            if not isinstance(class_ids, list) or not class_ids:
+                return jsonify({"message": "Invalid class IDs."}), 400
+            class_ids = [int(cid) for cid in class_ids]
+
+        student_ids = data.get("student_ids") or None
+        if student_ids is not None:
+            if class_ids == "all" or len(class_ids) != 1:
+                return jsonify({"message": "student_ids can only be used with a single class."}), 400
+            student_ids = [int(sid) for sid in student_ids]
+    except (TypeError, ValueError):
+        return jsonify({"message": "Invalid input."}), 400
+
+    # By display_order (NULLs last, as Postgres sorts them), then id
+    classes = [
+        (cls.id, cls.CLASS)
+        for cls in sorted(school_classes(school_id),
+                          key=lambda cls: (cls.display_order is None, cls.display_order or 0, cls.id))
+        if class_ids == "all" or cls.id in class_ids
+    ]
+
+    school = school_info(school_id)
+    principal_sign, teacher_signs = school_signs(school_id)
+
+    base_context = {
+        "principle_sign": principal_sign,
+        "school_logo": school.Logo,
+        "school_heading_image": school.school_heading_image,
+        "sesion_year": session_year_label(current_session_id),
+    }
+
+    # Marks are small next to the HTML: load every class now, then release the connection
+    tasks = []
+    for class_id, class_name in classes:
+        student_marks_data = cached_result_data(school_id, current_session_id, class_id,
+                                                student_ids=student_ids,
+                                                extra_fields=RESULT_EXTRA_FIELDS)
+        if not student_marks_data:
+            continue
+
+        student_marks = process_marks(student_marks_data, add_grades_flag=True, add_grand_total_flag=True)
+        context = dict(base_context, teacher_sign=teacher_signs.get(class_id))
+        for students in chunked(student_marks):
+            tasks.append((class_id, class_name, students, context))
+
+    if not tasks:
+        return jsonify({"message": "No Data Found"}), 400
+
+    if output_format == "html":
+        # The page around the cards: tall_result.html without students
+        page = render_template('pdf-components/tall_result.html', students=[], **base_context)
+        head, _, tail = page.partition("</body>")
+
+    db.session.close()
+
+    rendered = render_report_cards([(students, context) for _, _, students, context in tasks])
+
+    def ndjson_stream():
+        for (class_id, class_name, _, _), html in zip(tasks, rendered):
+            yield json.dumps({"class_id": class_id, "class": class_name, "html": html}) + "\n"
+
+    def html_stream():
+        yield head
+        for html in rendered:
+            yield html
+        yield "</body>" + tail
+
+    if output_format == "html":
+        return Response(stream_with_context(html_stream()), mimetype="text/html")
+
+    return Response(stream_with_context(ndjson_stream()), mimetype="application/x-ndjson")
@@ -0,0 +1,101 @@
+# src/controller/marks/bulk_update_marks_api.py
+
+from datetime import datetime
+
+from flask import request, jsonify, Blueprint, session
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from src import db
+from src.controller.auth.login_required import login_required
+from src.controller.permissions.permission_required import permission_required
+from src.controller.permissions.has_permission import has_permission
+from src.controller.marks.utils.result_cache import bump_marks_version
+from src.model import Exams, StudentMarks, Subjects
+
+bulk_update_marks_api_bp = Blueprint('bulk_update_marks_api_bp',   __name__)
+
+
+@bulk_update_marks_api_bp.route('/bulk_update_marks_api', methods=['POST'])
+@login_required
+@permission_required('fill_marks')
+def bulk_update_marks_api():
+    """
+    Saves a whole marks grid in one transaction.
+
+    Body: {"exam_id": 1, "marks": [{"student_id": 1, "subject_id": 2, "score": "45"}, ...]}
+    """
+    data = request.json or {}
+
+    exam_id = data.get('exam_id')
+    marks = data.get('marks')
+
+    current_session_id = session.get("session_id")
+    school_id = session.get("school_id")
+
+    if not all([exam_id, current_session_id, school_id]) or not isinstance(marks, list) or not marks:
+        return jsonify({"message": "Missing required fields"}), 400
+
+    # Exam lock is checked once for the whole grid
+    exam = Exams.query.filter_by(id=exam_id, school_id=school_id).first()
+    if not exam:
+        return jsonify({"message": "Exam not found"}), 404
+    if not exam.is_enabled and not has_permission('override_marks_lock'):
+        return jsonify({"message": "This exam is disabled. You do not have permission to fill marks for disabled exams."}), 403
+
+    # One row per (student, subject), the last value in the grid wins
+    rows = {}
+    now = datetime.utcnow()
+    for mark in marks:
+        try:
+            student_id = int(mark.get('student_id'))
+            subject_id = int(mark.get('subject_id'))
+        except (AttributeError, TypeError, ValueError):
+            return jsonify({"message": "Invalid student or subject in marks"}), 400
+
+        score = mark.get('score')
+        rows[(student_id, subject_id)] = {
+            "student_id": student_id,
+            "subject_id": subject_id,
+            "exam_id": exam.id,
+            "session_id": current_session_id,
+            "school_id": school_id,
+            # Stored as sent, like update_marks_api ("" stays "")
+            "score": None if score is None else str(score),
+            "created_at": now,
+        }
+
+    subject_ids = {subject_id for _, subject_id in rows}
+    subject_classes = dict(
+        db.session.query(Subjects.id, Subjects.class_id)
+        .filter(Subjects.id.in_(subject_ids), Subjects.school_id == school_id)
+        .all()
+    )
+    if len(subject_classes) != len(subject_ids):
+        return jsonify({"message": "Invalid subject in marks"}), 400
+
+    # Single upsert on (student_id, subject_id, exam_id, session_id)
+    stmt = insert(StudentMarks).values(list(rows.values()))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['student_id', 'subject_id', 'exam_id', 'session_id'],
+        set_={"score": stmt.excluded.score},
+    ).returning(StudentMarks.id, StudentMarks.student_id, StudentMarks.subject_id)
+
+    try:
+        saved = db.session.execute(stmt).all()
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        print("Bulk marks update failed:", e)
+        return jsonify({"message": "Unable to save marks, please try again."}), 500
+
+    for class_id in set(subject_classes.values()):
+        bump_marks_version(school_id, current_session_id, class_id)
+
+    return jsonify({
+        "message": f"Saved marks for {len(saved)} entries successfully",
+        "marks": [
+            {"mark_id": row.id, "student_id": row.student_id, "subject_id": row.subject_id}
+            for row in saved
+        ],
+    }), 200
@@ -4,14 +4,14 @@ from flask import render_template, session, request, jsonify, Blueprint
 
 
 
-from src.model import Exams, StudentsDB, StudentSessions, ClassData, StudentMarks, Subjects, TeachersLogin, ClassExams
-from src.model.ClassAccess import ClassAccess
+from src.model import Exams, StudentsDB, StudentSessions, ClassData, StudentMarks, Subjects
 from src import db
 
-from bs4 import BeautifulSoup
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
 from src.controller.permissions.has_permission import has_permission
+from src.controller.marks.utils.result_cache import bump_school_marks_version
+from src.controller.utils.reference_cache import user_classes, class_subjects, class_exams, bump_reference_version
 
 
 fill_marks_bp = Blueprint( 'fill_marks_bp',   __name__)
@@ -24,49 +24,19 @@ def fill_marks():
     user_id = session["user_id"]
     school_id = session["school_id"]
 
-    classes = (
-        db.session.query(ClassData.id, ClassData.CLASS)
-            .join(ClassAccess, ClassAccess.class_id == ClassData.id)
-            .join(TeachersLogin, TeachersLogin.id == ClassAccess.staff_id)
-            .filter(TeachersLogin.id == user_id)
-            .order_by(ClassData.id.asc())
-            .all()
-    )
-
+    classes = user_classes(school_id, user_id)
     class_ids = [row.id for row in classes]
 
-        
-    subjects = (
-        db.session.query(Subjects.id, Subjects.subject, Subjects.display_order)
-        .filter(
-            Subjects.school_id == school_id,
-            Subjects.is_active == True,
-            Subjects.class_id.in_(class_ids)
-        )
-        .order_by(Subjects.display_order.asc())
-        .all()
-    )
-
     # Build a list of unique subjects by name, but keep an associated id for frontend selection
     unique_subjects = []
     seen = set()
-    for s in subjects:
+    for s in class_subjects(school_id, class_ids):
         if s.subject not in seen:
             seen.add(s.subject)
             unique_subjects.append({"id": s.id, "subject": s.subject})
 
+    exams = class_exams(school_id, class_ids)
 
-    exams = (
-        db.session.query(Exams.exam_name, Exams.id, Exams.is_enabled)
-        .join(ClassExams, ClassExams.exam_id == Exams.id)
-        .filter(ClassExams.class_id.in_(class_ids),
-                Exams.school_id == school_id
-        )
-        .group_by(Exams.id)
-        .order_by(Exams.display_order.asc())
-        .all()
-    )
-        
     data = None
 
     return render_template('fill_marks.html', data=data, classes=classes, exams = exams, subjects = unique_subjects)
@@ -151,11 +121,9 @@ def get_marks():
     
 
 
-    html = render_template('fill_marks.html', data=marks_data, EXAM=None, classes=None)
-    soup=BeautifulSoup(html,"lxml")
-    content=soup.body.find('div',{'id':'marksTable'}).decode_contents()
+    html = render_template('html-components/fill_marks_table.html', data=marks_data)
 
-    return jsonify({"html":str(content)})
+    return jsonify({"html": html})
 
 
 @fill_marks_bp.route('/get_all_exams', methods=['GET'])
@@ -179,4 +147,6 @@ def update_exam_status():
         return jsonify({'error': 'Exam not found'}), 404
     exam.is_enabled = is_enabled
     db.session.commit()
+    bump_school_marks_version(session["school_id"])
+    bump_reference_version(session["school_id"])
     return jsonify({'message': 'Updated successfully'})
@@ -9,10 +9,9 @@ from src.controller.permissions.permission_required import permission_required
 from src.model.ClassAccess import ClassAccess
 from src import db
 
-from src.controller.marks.utils.marks_processing import result_data
+from src.controller.marks.utils.result_cache import cached_result_data
 from src.controller.marks.utils.process_marks import process_marks
 
-from bs4 import BeautifulSoup
 # import time
 
 
@@ -49,8 +48,8 @@ def get_marks_api():
     }
 
     try:
-        student_marks_data = result_data(school_id, current_session_id, class_id, 
-                                     extra_fields=extra_fields)        
+        student_marks_data = cached_result_data(school_id, current_session_id, class_id,
+                                                extra_fields=extra_fields)        
     except Exception as e:
         return jsonify({"message": f"Error fetching marks data: {str(e)}"}), 500
     
@@ -61,10 +60,8 @@ def get_marks_api():
     if not student_marks_data:
         # no students found for this class – render UI with a special flag
         print("No student marks data found for the given class.")
-        html = render_template('show_marks.html', student_marks=[], class_empty=True)
-        soup = BeautifulSoup(html, "lxml")
-        content = soup.body.find('div', {'id': 'results'}).decode_contents()
-        return jsonify({"html": str(content)})
+        html = render_template('html-components/marks_results.html', student_marks=[], class_empty=True)
+        return jsonify({"html": html})
     
     print(f"Fetched {len(student_marks_data)} records of student marks data.")
     
@@ -75,9 +72,7 @@ def get_marks_api():
     # pprint.pprint(student_marks)
    
 
-    html = render_template('show_marks.html', student_marks=student_marks)
-    soup = BeautifulSoup(html,"lxml")
-    content = soup.body.find('div',{'id':'results'}).decode_contents()
+    html = render_template('html-components/marks_results.html', student_marks=student_marks)
 
-    return jsonify({"html":str(content)})
+    return jsonify({"html": html})
     
\ No newline at end of file
@@ -4,16 +4,12 @@ from flask import session, request, jsonify, Blueprint, render_template
 from sqlalchemy import func
 
 from src.model import StudentsDB
-from src.model.ClassAccess import ClassAccess
-from src.model.Roles import Roles
-from src.model.Schools import Schools
-from src.model.TeachersLogin import TeachersLogin
-from src import db
 
-from .utils.marks_processing import result_data
+from .utils.result_cache import cached_result_data
 from .utils.process_marks import process_marks
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.utils.reference_cache import school_info, school_signs
 
 # import time
 
@@ -52,8 +48,8 @@ def get_result_api():
     }
 
 
-    student_marks_data = result_data(school_id, current_session_id, 
-                                     class_id, student_ids=[student_id],
+    student_marks_data = cached_result_data(school_id, current_session_id,
+                                            class_id, student_ids=[student_id],
                                      extra_fields=extra_fields)
 
     # print(student_marks_data)
@@ -67,42 +63,10 @@ def get_result_api():
     # import pprint
     # pprint.pprint(student_marks)
 
-    # get principal and class teacher sign from database
-
-    school = (
-        db.session.query(
-            Schools.Logo,
-            Schools.school_heading_image
-        )
-        .filter(Schools.id == school_id)
-        .first()
-    )
-
-
-
-    rows = (
-        db.session.query(
-            TeachersLogin.Sign,
-            Roles.role_name,
-            ClassAccess.class_id
-        )
-        .join(Roles, Roles.id == TeachersLogin.role_id)
-        .outerjoin(ClassAccess, ClassAccess.staff_id == TeachersLogin.id)
-        .filter(
-            TeachersLogin.school_id == school_id,
-            Roles.role_name.in_(["Principal", "Teacher"])
-        )
-        .all()
-    )
-
-    principal_sign = None
-    teacher_sign = None
-
-    for sign, role, cls_id in rows:
-        if role == "Principal":
-            principal_sign = sign
-        elif role == "Teacher" and cls_id == class_id:
-            teacher_sign = sign
+    # get principal and class teacher sign (cached per school)
+    school = school_info(school_id)
+    principal_sign, teacher_signs = school_signs(school_id)
+    teacher_sign = teacher_signs.get(class_id)
 
     current_session = int(current_session_id)
     session_year = f"{current_session}-{str(current_session + 1)[-2:]}"
@@ -8,7 +8,8 @@ from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
 from src.model import StudentMarks
 from src.controller.permissions.has_permission import has_permission
-from src.model import Exams
+from src.controller.marks.utils.result_cache import bump_marks_version
+from src.model import Exams, Subjects
 
 update_marks_api_bp = Blueprint('update_marks_api_bp',   __name__)
 
@@ -37,6 +38,9 @@ def update_marks_api():
     if not exam.is_enabled and not has_permission('override_marks_lock'):
         return jsonify({"message": "This exam is disabled. You do not have permission to fill marks for disabled exams."}), 403
 
+    # Cached class results are keyed by this version
+    class_id = db.session.query(Subjects.class_id).filter(Subjects.id == subject_id).scalar()
+
     # 🟩 CASE 1: Update existing mark
     if marks_id and marks_id != "":
         
@@ -44,6 +48,7 @@ def update_marks_api():
         if student_marks:
             student_marks.score = score
             db.session.commit()
+            bump_marks_version(school_id, current_session_id, class_id)
             return jsonify({"message": "Updated marks successfully"}), 200
         else:
             return jsonify({"message": "Unable to find student record in database"}), 400
@@ -59,6 +64,7 @@ def update_marks_api():
     if existing:
         existing.score = score
         db.session.commit()
+        bump_marks_version(school_id, current_session_id, class_id)
         return jsonify({"message": "Updated existing marks by composite key", "new_mark_id": existing.id}), 200
 
     # 🟩 CASE 3: Create new record
@@ -72,6 +78,7 @@ def update_marks_api():
     )
     db.session.add(new_mark)
     db.session.commit()
+    bump_marks_version(school_id, current_session_id, class_id)
 
     return jsonify({
         "message": "Inserted new marks successfully",
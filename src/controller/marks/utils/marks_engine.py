@@ -0,0 +1,353 @@
+# src/controller/marks/utils/marks_engine.py
+# Used in --> process_marks.py
+
+"""Vectorized marks engine.
+
+Produces exactly the same records as the legacy ``process_marks`` pipeline,
+but explodes ``subject_marks_dict`` once into a long
+(row, subject, score) frame and computes term totals, grades and grand totals
+with grouped NumPy aggregations instead of three ``groupby().apply()`` passes
+and an ``iterrows()`` pass per student.
+"""
+
+from collections import OrderedDict
+import re
+
+import numpy as np
+import pandas as pd
+
+from .calc_grades import get_grade
+
+
+NON_COMMON_COLUMNS = [
+    "exam_name",
+    "subject_marks_dict",
+    "exam_total",
+    "percentage",
+    "exam_display_order",
+    "weightage",
+    "exam_term",
+]
+
+# Order of synthetic rows inside a student's block (after the real exams)
+TERM_TOTAL_BLOCK = 1
+GRADES_BLOCK = 2
+GRAND_TOTAL_BLOCK = 3
+
+
+# -------------------------------
+# Utility: term sort key
+# -------------------------------
+
+def term_sort_key(term):
+    match = re.search(r"(\d+)", str(term))
+    return int(match.group(1)) if match else 0
+
+
+# -------------------------------
+# Explode subject_marks_dict
+# -------------------------------
+
+def explode_subject_marks(df):
+    """Returns (row position, subject, score) arrays for every valid integer mark."""
+
+    rows, subjects, scores = [], [], []
+
+    if "subject_marks_dict" in df.columns:
+        for pos, subj_dict in enumerate(df["subject_marks_dict"].tolist()):
+            if not isinstance(subj_dict, dict):
+                continue
+
+            for subj, mark in subj_dict.items():
+                try:
+                    score = int(mark)
+                except (ValueError, TypeError):
+                    continue
+
+                rows.append(pos)
+                subjects.append(subj)
+                scores.append(score)
+
+    return (
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(subjects, dtype=object),
+        np.asarray(scores, dtype=np.int64),
+    )
+
+
+# -------------------------------
+# Grouped aggregation over row segments
+# -------------------------------
+
+def summarise_segments(row_group, n_groups, weights, display, long_rows, long_subjects, long_scores):
+    """
+    Aggregates rows tagged with ``row_group`` (-1 = excluded) into ``n_groups`` segments.
+
+    Returns the first row of every segment, the weightage sum, the max display
+    order and an OrderedDict of subject totals (in first-occurrence order).
+    """
+
+    rows = np.flatnonzero(row_group >= 0)
+    rows = rows[np.argsort(row_group[rows], kind="stable")]
+    starts = np.flatnonzero(np.r_[True, np.diff(row_group[rows]) != 0])
+
+    first_rows = rows[starts]
+    weight_totals = np.add.reduceat(weights[rows], starts)
+    with np.errstate(invalid="ignore"):
+        display_max = np.fmax.reduceat(display[rows], starts)
+
+    subject_totals = [OrderedDict() for _ in range(n_groups)]
+
+    long_group = row_group[long_rows]
+    keep = long_group >= 0
+
+    if keep.any():
+        summed = (
+            pd.DataFrame({
+                "group": long_group[keep],
+                "subject": long_subjects[keep],
+                "score": long_scores[keep],
+            })
+            .groupby(["group", "subject"], sort=False)["score"]
+            .sum()
+        )
+
+        groups = summed.index.get_level_values(0).to_numpy()
+        subjects = summed.index.get_level_values(1).to_numpy()
+        totals = summed.to_numpy().tolist()
+
+        for i in np.argsort(groups, kind="stable"):
+            subject_totals[groups[i]][subjects[i]] = totals[i]
+
+    return first_rows, weight_totals, display_max, subject_totals
+
+
+def percentages(exam_totals, weight_totals, subject_counts):
+    max_marks = weight_totals * subject_counts
+    result = np.zeros(len(exam_totals), dtype=np.float64)
+    has_marks = max_marks > 0
+    result[has_marks] = (exam_totals[has_marks] / max_marks[has_marks]) * 100
+    return result
+
+
+def synthetic_rows(df, first_rows, **columns):
+    rows = df.take(first_rows).reset_index(drop=True)
+    for column, values in columns.items():
+        rows[column] = values
+    return rows
+
+
+# -------------------------------
+# Main Processor
+# -------------------------------
+
+def build_marks_records(
+    student_marks_data,
+    add_grades_flag=True,
+    add_grand_total_flag=True,
+):
+
+    if not student_marks_data:
+        return []
+
+    df = pd.DataFrame(student_marks_data)
+
+    # Preserve original exams before mutation
+    original_exams = set(df["exam_name"].dropna().unique())
+
+    student_codes, _ = pd.factorize(df["student_id"], sort=True)
+    df = df[student_codes >= 0].reset_index(drop=True)
+    student_codes = student_codes[student_codes >= 0]
+
+    weights = pd.to_numeric(df["weightage"], errors="coerce").fillna(0).to_numpy()
+    display = pd.to_numeric(df["exam_display_order"], errors="coerce").to_numpy(dtype=np.float64)
+
+    long_rows, long_subjects, long_scores = explode_subject_marks(df)
+
+    frames = [df]
+    students = [student_codes]
+    blocks = [np.zeros(len(df), dtype=np.int64)]
+    positions = [np.arange(len(df))]
+    orders = [display]
+
+    # ---------------- Term Totals ----------------
+    term_codes, _ = pd.factorize(df["exam_term"])
+    has_term = term_codes >= 0
+    term_groups = np.full(len(df), -1, dtype=np.int64)
+
+    if has_term.any():
+        term_pairs = np.stack([student_codes[has_term], term_codes[has_term]], axis=1)
+        _, inverse = np.unique(term_pairs, axis=0, return_inverse=True)
+        term_groups[has_term] = inverse.reshape(-1)
+        n_terms = int(term_groups.max()) + 1
+
+        first_rows, weight_totals, display_max, subject_totals = summarise_segments(
+            term_groups, n_terms, weights, display,
+            long_rows, long_subjects, long_scores,
+        )
+
+        terms = df["exam_term"].to_numpy(dtype=object)[first_rows]
+        exam_totals = np.array([sum(t.values()) for t in subject_totals], dtype=np.int64)
+        subject_counts = np.array([len(t) for t in subject_totals], dtype=np.int64)
+
+        # Terms are ordered numerically, ties keep first appearance
+        term_keys = np.array([term_sort_key(term) for term in terms], dtype=np.int64)
+        term_rank = np.lexsort((first_rows, term_keys, student_codes[first_rows]))
+        term_positions = np.empty(n_terms, dtype=np.int64)
+        term_positions[term_rank] = np.arange(n_terms)
+
+        frames.append(synthetic_rows(
+            df, first_rows,
+            exam_name=[f"{term} Total" for term in terms],
+            exam_total=exam_totals.tolist(),
+            weightage=weight_totals,
+            subject_marks_dict=subject_totals,
+            percentage=percentages(exam_totals, weight_totals, subject_counts),
+        ))
+        students.append(student_codes[first_rows])
+        blocks.append(np.full(n_terms, TERM_TOTAL_BLOCK, dtype=np.int64))
+        positions.append(term_positions)
+        orders.append(display_max + 1)
+
+    # ---------------- Grades / Grand Total ----------------
+    in_original = df["exam_name"].isin(original_exams).to_numpy()
+    exam_groups = np.full(len(df), -1, dtype=np.int64)
+
+    if (add_grades_flag or add_grand_total_flag) and in_original.any():
+        _, inverse = np.unique(student_codes[in_original], return_inverse=True)
+        exam_groups[in_original] = inverse.reshape(-1)
+        n_students = int(exam_groups.max()) + 1
+
+        first_rows, weight_totals, display_max, subject_totals = summarise_segments(
+            exam_groups, n_students, weights, display,
+            long_rows, long_subjects, long_scores,
+        )
+
+        exam_totals = np.array([sum(t.values()) for t in subject_totals], dtype=np.int64)
+        subject_counts = np.array([len(t) for t in subject_totals], dtype=np.int64)
+        student_first = student_codes[first_rows]
+
+        if add_grades_flag:
+            subject_grades = []
+            overall_grades = []
+
+            for totals, max_subject_marks in zip(subject_totals, weight_totals):
+                grades = OrderedDict()
+                for subj, total in totals.items():
+                    percentage = (
+                        (total / max_subject_marks) * 100
+                        if max_subject_marks > 0 else 0
+                    )
+                    grades[subj], _ = get_grade(percentage)
+                subject_grades.append(grades)
+
+                max_total_marks = max_subject_marks * len(grades)
+                total_percentage = (
+                    (sum(totals.values()) / max_total_marks) * 100
+                    if max_total_marks > 0 else 0
+                )
+                grade, _ = get_grade(total_percentage)
+                overall_grades.append(grade)
+
+            frames.append(synthetic_rows(
+                df, first_rows,
+                exam_name="Grades",
+                exam_total=overall_grades,
+                weightage="",
+                percentage=np.nan,
+                subject_marks_dict=subject_grades,
+            ))
+            students.append(student_first)
+            blocks.append(np.full(n_students, GRADES_BLOCK, dtype=np.int64))
+            positions.append(np.zeros(n_students, dtype=np.int64))
+            orders.append(display_max + 2)
+
+        if add_grand_total_flag:
+            frames.append(synthetic_rows(
+                df, first_rows,
+                exam_name="G. Total",
+                exam_total=exam_totals.tolist(),
+                weightage=weight_totals,
+                subject_marks_dict=subject_totals,
+                percentage=percentages(exam_totals, weight_totals, subject_counts),
+            ))
+            students.append(student_first)
+            blocks.append(np.full(n_students, GRAND_TOTAL_BLOCK, dtype=np.int64))
+            positions.append(np.zeros(n_students, dtype=np.int64))
+            orders.append(display_max + 1)
+
+    # Same row layout as the legacy per-student concat:
+    # real exams, term totals, Grades, G. Total
+    students = np.concatenate(students)
+    blocks = np.concatenate(blocks)
+    positions = np.concatenate(positions)
+    layout = np.lexsort((positions, blocks, students))
+
+    # Empty frames add no rows, and would only make concat guess dtypes from them
+    frames = [frame for frame in frames if not frame.empty]
+    marks_df = pd.concat(frames, ignore_index=True).take(layout).reset_index(drop=True)
+    display_orders = np.concatenate(orders)[layout]
+
+    # ---------------- Clean numeric columns ----------------
+
+    marks_df["percentage"] = (
+        pd.to_numeric(marks_df["percentage"], errors="coerce")
+        .fillna(0)
+        .round(1)
+    )
+
+    marks_df["exam_total"] = (
+        pd.to_numeric(marks_df["exam_total"], errors="coerce")
+        .fillna(0)
+        .round(1)
+    )
+
+    # ---------------- Final Structuring ----------------
+
+    common_columns = [
+        col for col in marks_df.columns
+        if col not in NON_COMMON_COLUMNS
+    ]
+
+    marks_df[common_columns] = marks_df[common_columns].fillna("")
+
+    grouped = marks_df.groupby(common_columns)
+    group_codes = grouped.ngroup().to_numpy()
+    result_df = grouped.size().reset_index(name="marks")
+
+    # Exams ordered by display order (missing last). Equal display orders are
+    # broken explicitly by row layout: real exams in input order, then term
+    # totals, Grades, G. Total (a stable sort, not pandas' default quicksort)
+    missing_order = np.isnan(display_orders)
+    row_order = np.lexsort((
+        np.arange(len(marks_df)),
+        np.where(missing_order, 0, display_orders),
+        missing_order,
+        group_codes,
+    ))
+
+    exam_values = marks_df[[
+        "exam_name", "subject_marks_dict", "exam_total",
+        "percentage", "weightage", "exam_term",
+    ]].to_numpy(dtype=object)
+
+    marks = [OrderedDict() for _ in range(len(result_df))]
+    for i in row_order:
+        exam_name, subject_marks_dict, exam_total, percentage, weightage, exam_term = exam_values[i]
+        marks[group_codes[i]][exam_name] = {
+            "subject_marks_dict": subject_marks_dict,
+            "exam_total": exam_total,
+            "percentage": percentage,
+            "weightage": weightage,
+            "exam_term": exam_term,
+        }
+
+    result_df["marks"] = marks
+
+    result_df = (
+        result_df
+        .sort_values(["CLASS", "ROLL"])
+        .reset_index(drop=True)
+    )
+
+    return result_df.to_dict(orient="records")
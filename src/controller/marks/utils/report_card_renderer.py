@@ -0,0 +1,110 @@
+# src/controller/marks/utils/report_card_renderer.py
+# Used in --> bulk_download_results.py
+
+"""Renders report cards (pdf-components/tall_result_card.html) in a process pool.
+
+Each worker compiles the card template once and keeps a request context pushed
+so url_for('static', ...) works. Chunks of students are rendered in parallel and
+handed back in submission order, so the caller can stream them as they finish.
+At most IN_FLIGHT_PER_WORKER chunks per worker are queued or rendered ahead of
+the client, so a slow download doesn't pile the whole school up in memory.
+
+Workers are started by a forkserver (spawn where it is missing), never forked
+from the web worker: by the time the pool is created the web worker runs other
+threads (the permission-versions listener, the DB pool) and a forked child
+would inherit whatever locks they hold. The workers only import
+src/report_card_worker.py.
+"""
+
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import current_app
+
+from src import report_card_worker
+from src.report_card_worker import CARD_TEMPLATE, init_worker, render_chunk
+
+
+CHUNK_SIZE = 20  # students per task / streamed chunk
+IN_FLIGHT_PER_WORKER = 2  # chunks submitted ahead of the client, per worker
+
+# 0 renders in the web worker itself
+REPORT_CARD_WORKERS = int(os.getenv("REPORT_CARD_WORKERS", min(4, os.cpu_count() or 1)))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _pool_context():
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # Imported once by the server, every worker forks from that clean process
+        context.set_forkserver_preload([report_card_worker.__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+# -------------------------------
+# Pool
+# -------------------------------
+
+def _get_pool():
+    """One pool per web worker process, created on first use (after gunicorn forks)."""
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(
+                max_workers=REPORT_CARD_WORKERS,
+                mp_context=_pool_context(),
+                initializer=init_worker,
+            )
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def chunked(items, size=CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def render_report_cards(tasks):
+    """
+    tasks: list (or iterator) of (students, context) where context holds the template variables
+    shared by those students (school_logo, teacher_sign, ...).
+
+    Yields the rendered HTML of every task, in order.
+    """
+    if REPORT_CARD_WORKERS <= 0:
+        # Inside the streaming request, the app's own environment and context are enough
+        template = current_app.jinja_env.get_template(CARD_TEMPLATE)
+        for students, context in tasks:
+            yield render_chunk(students, context, template)
+        return
+
+    pool = _get_pool()
+    pending = iter(tasks)
+    futures = deque()
+
+    def submit_next():
+        task = next(pending, None)
+        if task is not None:
+            students, context = task
+            futures.append(pool.submit(render_chunk, students, context))
+
+    for _ in range(REPORT_CARD_WORKERS * IN_FLIGHT_PER_WORKER):
+        submit_next()
+
+    try:
+        while futures:
+            html = futures.popleft().result()
+            submit_next()
+            yield html
+    finally:
+        # Client went away: drop whatever has not started yet
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,123 @@
+# src/controller/marks/utils/result_cache.py
+# Used in --> get_marks_api.py, get_result_api.py, bulk_download_results.py
+# Invalidated from --> update_marks_api.py, fill_marks.py (update_exam_status)
+
+"""Class-level cache for ``result_data()``.
+
+The whole class result (with overall ranks) is cached in-process per
+(school, session, class, extra_fields). Every key also carries two write
+versions kept in Redis, so all app instances see the same invalidation:
+
+  - ``marks_version:<school>:<session>:<class>`` bumped on every marks write
+  - ``marks_version:<school>`` bumped when an exam is locked/unlocked
+
+A report-card print for one student filters the cached class rows instead of
+running the ranking query again.
+"""
+
+import threading
+
+import redis
+from cachetools import TTLCache
+
+from src import r
+from .marks_processing import result_data
+
+
+RESULT_CACHE_SIZE = 64          # classes kept per process
+RESULT_CACHE_TTL = 10 * 60      # seconds, bounds staleness from non-marks edits (names, rolls...)
+
+_result_cache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+_result_cache_lock = threading.Lock()
+
+
+def _school_version_key(school_id):
+    return f"marks_version:{school_id}"
+
+
+def _class_version_key(school_id, session_id, class_id):
+    return f"marks_version:{school_id}:{session_id}:{class_id}"
+
+
+def _fields_signature(extra_fields):
+    """Hashable, order-preserving signature of the extra_fields argument."""
+    if not extra_fields:
+        return ()
+
+    signature = []
+    for table_name, fields in extra_fields.items():
+        if table_name == "expr":
+            fields = tuple(
+                (getattr(expr, "name", None),
+                 str(expr.compile(compile_kwargs={"literal_binds": True})))
+                for expr in fields
+            )
+        elif isinstance(fields, dict):
+            fields = tuple(fields.items())
+        else:
+            fields = tuple(fields)
+        signature.append((table_name, fields))
+
+    return tuple(signature)
+
+
+# -------------------------------
+# Invalidation
+# -------------------------------
+
+def bump_marks_version(school_id, session_id, class_id):
+    """Invalidate the cached result of one class (call after marks are written)."""
+    try:
+        r.incr(_class_version_key(school_id, session_id, class_id))
+    except redis.exceptions.RedisError as e:
+        print("Unable to bump marks version:", e)
+
+
+def bump_school_marks_version(school_id):
+    """Invalidate the cached results of every class of a school."""
+    try:
+        r.incr(_school_version_key(school_id))
+    except redis.exceptions.RedisError as e:
+        print("Unable to bump school marks version:", e)
+
+
+# -------------------------------
+# Cached result_data
+# -------------------------------
+
+def cached_result_data(school_id, session_id, class_id, student_ids=None, extra_fields=None):
+    """
+    Drop-in replacement for result_data().
+
+    The full class is always fetched (ranks are computed across all students)
+    and `student_ids` is applied on the cached rows.
+    """
+    try:
+        school_version, class_version = r.mget(
+            _school_version_key(school_id),
+            _class_version_key(school_id, session_id, class_id),
+        )
+    except redis.exceptions.RedisError as e:
+        print("Result cache disabled, Redis unavailable:", e)
+        return result_data(school_id, session_id, class_id,
+                           student_ids=student_ids, extra_fields=extra_fields)
+
+    cache_key = (
+        str(school_id), str(session_id), int(class_id),
+        _fields_signature(extra_fields),
+        school_version or "0", class_version or "0",
+    )
+
+    with _result_cache_lock:
+        rows = _result_cache.get(cache_key)
+
+    if rows is None:
+        rows = result_data(school_id, session_id, class_id, extra_fields=extra_fields)
+        with _result_cache_lock:
+            _result_cache[cache_key] = rows
+
+    if student_ids:
+        wanted = set(student_ids)
+        return [dict(row) for row in rows if row["student_id"] in wanted]
+
+    return [dict(row) for row in rows]
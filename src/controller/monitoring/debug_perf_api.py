@@ -0,0 +1,28 @@
+# src/controller/monitoring/debug_perf_api.py
+
+from flask import jsonify, request, Blueprint
+
+from src.profiler import profiler_enabled, perf_report, reset_perf_stats
+from src.controller.permissions.role_required import role_required
+from src.controller.auth.login_required import login_required
+
+
+debug_perf_api_bp = Blueprint('debug_perf_api_bp', __name__)
+
+
+@debug_perf_api_bp.route('/debug/perf', methods=['GET'])
+@login_required
+@role_required('manager', 'admin')
+def debug_perf():
+    """
+    Profiler report of the process answering the request (see pid): request and
+    DB time percentiles, queries per request and N+1 warnings per endpoint, and
+    the latest slow queries. ?reset=1 clears them after reading.
+    """
+    if not profiler_enabled():
+        return jsonify({"message": "Profiler is off, start the app with PROFILER=1"}), 404
+
+    report = perf_report()
+    if request.args.get('reset') == '1':
+        reset_perf_stats()
+    return jsonify(report), 200
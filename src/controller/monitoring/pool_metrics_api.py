@@ -0,0 +1,26 @@
+# src/controller/monitoring/pool_metrics_api.py
+
+from flask import jsonify, request, Blueprint
+
+from src import db
+from src.db_pool import pool_metrics, reset_pool_metrics
+from src.controller.permissions.role_required import role_required
+from src.controller.auth.login_required import login_required
+
+
+pool_metrics_api_bp = Blueprint('pool_metrics_api_bp', __name__)
+
+
+@pool_metrics_api_bp.route('/api/metrics/pool', methods=['GET'])
+@login_required
+@role_required('manager', 'admin')
+def get_pool_metrics():
+    """
+    Connection pool metrics of the process answering the request (see pid):
+    checkout waits, hold time per endpoint, overflow usage and timeouts.
+    ?reset=1 clears them after reading.
+    """
+    metrics = pool_metrics(db.engine)
+    if request.args.get('reset') == '1':
+        reset_pool_metrics()
+    return jsonify(metrics), 200
@@ -1,34 +1,29 @@
-from src.model.Permissions import Permissions
-from src.model.RolePermissions import RolePermissions
 from src import db
 from src.model.StaffPermissions import StaffPermissions
+from .permission_registry import role_mask, mask_to_names
 
-def get_permissions(user_id, role_id):
 
-    permissions_list = set()  #set for unique permissions
+def get_permission_mask(user_id, role_id):
+    """Effective permissions of a staff member as a bitmask (bit = Permissions.id)."""
+    mask = role_mask(role_id)  # role permissions come from the process-wide registry
 
-    role_permissions = (
-            db.session.query(Permissions.permission_name)  #get all the permissions for the role
-            .join(RolePermissions, RolePermissions.permission_id == Permissions.id)
-            .filter(RolePermissions.role_id == role_id)
-            .all()
-        )
-    
+    # get the exceptional permissions for the staff, asigned or unassigned
     staff_specific_permission = (
-            db.session.query(StaffPermissions.is_granted, Permissions.permission_name)  # get the exceptional permissions for the staff, asigned or unassigned
-            .join(StaffPermissions, StaffPermissions.permission_id == Permissions.id)
+            db.session.query(StaffPermissions.is_granted, StaffPermissions.permission_id)
             .filter(StaffPermissions.staff_id == user_id)
             .all()
         )
 
-    for role_permission in role_permissions:
-        permissions_list.add(role_permission.permission_name)
-
-    # Apply staff-specific changes
-    for is_granted, permission_name in staff_specific_permission:
+    for is_granted, permission_id in staff_specific_permission:
         if is_granted:
-            permissions_list.add(permission_name)
+            mask |= 1 << permission_id
         else:
-            permissions_list.discard(permission_name)
+            mask &= ~(1 << permission_id)
+
+    return mask
+
+
+def get_permissions(user_id, role_id):
+    """Permission names of a staff member."""
+    return mask_to_names(get_permission_mask(user_id, role_id))
 
-    return list(permissions_list)
\ No newline at end of file
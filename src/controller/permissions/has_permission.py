@@ -1,9 +1,27 @@
-from flask import session
+from flask import session, g
+
+from .permission_registry import permission_bit, decode_mask
+
+
+def _session_mask(encoded):
+    # Decoded once per request, has_permission runs for every menu item of a page
+    if g.get('_permission_mask_source') != encoded:
+        g._permission_mask = decode_mask(encoded)
+        g._permission_mask_source = encoded
+    return g._permission_mask
+
 
 def has_permission(permission_name):
     try:
         if session['role'].lower() in ['manager', 'admin']:
             return True
-        return permission_name in session.get('permissions', [])
+
+        permissions = session.get('permissions')
+        if isinstance(permissions, list):
+            # Session saved before permission masks
+            return permission_name in permissions
+
+        bit = permission_bit(permission_name)
+        return bit is not None and (_session_mask(permissions) >> bit) & 1 == 1
     except KeyError:
-        return False
\ No newline at end of file
+        return False
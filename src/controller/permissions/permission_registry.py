@@ -0,0 +1,119 @@
+# src/controller/permissions/permission_registry.py
+# Used in --> get_permissions.py, has_permission.py, login.py (save_sessions)
+
+"""Process-wide registry of Permissions and RolePermissions.
+
+Every permission is bit `Permissions.id` of a user's permission mask, so masks
+stay valid across processes and when permissions are added. The session keeps
+the mask as a hex string and has_permission() is a dict lookup plus a bit test.
+
+The registry is loaded once per process. It reloads after REGISTRY_TTL, when
+Redis says it changed (checked whenever a session is rebuilt, i.e. on login and
+on a permission_number change), or when an unknown permission name is asked for.
+"""
+
+import threading
+import time
+
+import redis
+
+from src import r, db
+from src.model.Permissions import Permissions
+from src.model.RolePermissions import RolePermissions
+
+
+REGISTRY_VERSION_KEY = "permission_registry_version"
+REGISTRY_TTL = 10 * 60          # seconds
+UNKNOWN_RELOAD_INTERVAL = 30    # seconds between reloads caused by unknown names
+
+_registry = None    # {"bits": {name: bit}, "roles": {role_id: mask}, "version": str, "loaded_at": float}
+_registry_lock = threading.Lock()
+_last_unknown_reload = 0.0
+
+
+def _redis_version():
+    try:
+        return r.get(REGISTRY_VERSION_KEY) or "0"
+    except redis.exceptions.RedisError as e:
+        print("Permission registry version unavailable:", e)
+        return None
+
+
+def _load(version):
+    bits = {
+        name: permission_id
+        for permission_id, name in db.session.query(Permissions.id, Permissions.permission_name).all()
+    }
+
+    roles = {}
+    for role_id, permission_id in db.session.query(RolePermissions.role_id, RolePermissions.permission_id).all():
+        roles[role_id] = roles.get(role_id, 0) | (1 << permission_id)
+
+    return {"bits": bits, "roles": roles, "version": version, "loaded_at": time.monotonic()}
+
+
+def get_registry(check_version=False):
+    """The loaded registry, (re)loading it if it is missing, expired or (check_version) outdated."""
+    global _registry
+
+    registry = _registry
+    version = _redis_version() if check_version else None
+
+    stale = (
+        registry is None
+        or time.monotonic() - registry["loaded_at"] > REGISTRY_TTL
+        or (version is not None and version != registry["version"])
+    )
+    if stale:
+        with _registry_lock:
+            if _registry is registry:
+                _registry = _load(version if version is not None else _redis_version())
+            registry = _registry
+
+    return registry
+
+
+def invalidate_permission_registry():
+    """Call after Permissions / RolePermissions change; processes reload on their next session rebuild."""
+    global _registry
+
+    with _registry_lock:
+        _registry = None
+    try:
+        r.incr(REGISTRY_VERSION_KEY)
+    except redis.exceptions.RedisError as e:
+        print("Unable to bump permission registry version:", e)
+
+
+# -------------------------------
+# Masks
+# -------------------------------
+
+def role_mask(role_id):
+    return get_registry(check_version=True)["roles"].get(role_id, 0)
+
+
+def permission_bit(permission_name):
+    """Bit of a permission, None if no such permission exists."""
+    global _registry, _last_unknown_reload
+
+    bit = get_registry()["bits"].get(permission_name)
+    if bit is None and time.monotonic() - _last_unknown_reload > UNKNOWN_RELOAD_INTERVAL:
+        # Maybe added after this process loaded the registry
+        _last_unknown_reload = time.monotonic()
+        with _registry_lock:
+            _registry = None
+        bit = get_registry()["bits"].get(permission_name)
+    return bit
+
+
+def mask_to_names(mask):
+    return sorted(name for name, bit in get_registry()["bits"].items() if mask >> bit & 1)
+
+
+def encode_mask(mask):
+    return format(mask, "x")
+
+
+def decode_mask(value):
+    return int(value, 16) if value else 0
@@ -0,0 +1,22 @@
+from flask import session, request, jsonify, render_template
+from functools import wraps
+
+
+def role_required(*roles):
+    """Allows only the given roles (case-insensitive), for pages no Permissions row covers."""
+    allowed = {role.lower() for role in roles}
+
+    def decorator(f):
+        @wraps(f)
+        def wrapped(*args, **kwargs):
+
+            if str(session.get('role', '')).lower() not in allowed:
+
+                if request.blueprint and 'api' in request.blueprint.lower():
+                    return jsonify({"message": "You do not have permission"}), 403
+                else:
+                    return render_template("permission_denied.html"), 403
+
+            return f(*args, **kwargs)
+        return wrapped
+    return decorator
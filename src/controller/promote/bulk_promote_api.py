@@ -0,0 +1,187 @@
+# src/controller/promote/bulk_promote_api.py
+
+from flask import session, request, jsonify, Blueprint
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+
+from src import db
+from src.model import StudentSessions
+from src.model import ClassData
+
+import datetime
+from src.controller.utils.get_gapped_rolls import get_gapped_rolls, lock_class_rolls
+from src.controller.permissions.permission_required import permission_required
+from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import invalidate_student_stats
+
+bulk_promote_api_bp = Blueprint('bulk_promote_api_bp', __name__)
+
+
+def next_class(current_class, school_id):
+    """Class of the next grade_level, same section first."""
+    candidates = ClassData.query.filter_by(
+        school_id=school_id, grade_level=current_class.grade_level + 1
+    ).order_by(ClassData.display_order.asc()).all()
+
+    same_section = [c for c in candidates if c.Section == current_class.Section]
+    return (same_section or candidates or [None])[0]
+
+
+def assign_rolls(count, available):
+    """`count` rolls: the gaps first, then from next_roll upwards."""
+    rolls = available['gapped_rolls'][:count]
+    next_roll = available['next_roll']
+    while len(rolls) < count:
+        rolls.append(next_roll)
+        next_roll += 1
+    return rolls
+
+
+@bulk_promote_api_bp.route('/api/promote/bulk', methods=["POST"])
+@login_required
+@permission_required('promote_student')
+def bulk_promote():
+    """
+    Promotes a whole class (or `student_ids` of it) from the previous session
+    into the current one, in one transaction:
+
+    {"class_id": 12, "promoted_date": "2025-04-01", "student_ids": [...]?, "promoted_class_id": 13?}
+
+    The target class defaults to the next grade_level. Rolls are given in the
+    old roll order, filling the target class gaps first. Students that can't
+    be promoted (TC, left, already promoted) are reported and skipped.
+    """
+    try:
+        school_id = session.get("school_id")
+        current_session = int(session["session_id"])
+    except (KeyError, ValueError):
+        return jsonify({"message": "Session data is missing or corrupted. Please logout and login again!"}), 500
+
+    data = request.get_json() or {}
+
+    try:
+        class_id = int(data.get("class_id"))
+        student_ids = {int(s) for s in data["student_ids"]} if data.get("student_ids") else None
+        promoted_class_id = int(data["promoted_class_id"]) if data.get("promoted_class_id") else None
+    except (TypeError, ValueError):
+        return jsonify({"message": "Class, students or promoted class is not valid!"}), 400
+
+    try:
+        promoted_date = datetime.datetime.strptime(data.get("promoted_date") or "", "%Y-%m-%d").date()
+    except ValueError:
+        return jsonify({"message": "Invalid promotion date format. Use 'year-month-day'."}), 400
+
+    current_class = ClassData.query.filter_by(id=class_id, school_id=school_id).first()
+    if not current_class:
+        return jsonify({"message": "Class does not exist."}), 404
+
+    if promoted_class_id:
+        target_class = ClassData.query.filter_by(id=promoted_class_id, school_id=school_id).first()
+        if not target_class:
+            return jsonify({"message": "Selected class does not exist or is not available."}), 400
+        if target_class.grade_level < current_class.grade_level:
+            return jsonify({"message": "Cannot promote to a lower class."}), 400
+    else:
+        target_class = next_class(current_class, school_id)
+        if not target_class:
+            return jsonify({"message": "No class found for the next grade level."}), 400
+
+    # Previous session rows of the class, in roll order
+    query = StudentSessions.query.filter_by(session_id=current_session - 1, class_id=class_id)
+    if student_ids:
+        query = query.filter(StudentSessions.student_id.in_(student_ids))
+    previous_rows = query.order_by(StudentSessions.ROLL.asc().nulls_last(), StudentSessions.id.asc()).all()
+
+    # Students that already have a row in this session
+    already_in_session = {
+        student_id for (student_id,) in
+        db.session.query(StudentSessions.student_id).filter(
+            StudentSessions.session_id == current_session,
+            StudentSessions.student_id.in_([row.student_id for row in previous_rows]),
+            StudentSessions.status.is_distinct_from("left"),
+        ).all()
+    }
+
+    results = []
+    to_promote = []
+    for row in previous_rows:
+        reason = None
+        if row.status == "tc":
+            reason = "TC already issued."
+        elif row.status == "promoted" or row.student_id in already_in_session:
+            reason = "Already promoted."
+        elif row.status == "left":
+            reason = "Student left the school."
+        elif row.status not in ("active", None, ""):
+            reason = "Promotion not allowed."
+
+        if reason:
+            results.append({"student_id": row.student_id, "state": "SKIPPED", "message": reason})
+        else:
+            to_promote.append(row)
+
+    if student_ids:
+        found = {row.student_id for row in previous_rows}
+        results += [{"student_id": s, "state": "SKIPPED", "message": "Student not found in previous session."}
+                    for s in sorted(student_ids - found)]
+
+    if not to_promote:
+        return jsonify({"message": "No student to promote.", "results": results}), 400
+
+    # One gapped-roll computation for the whole batch, no other promotion/admission
+    # can take a roll of the target class until the commit
+    lock_class_rolls(target_class.id, current_session)
+    rolls = assign_rolls(len(to_promote), get_gapped_rolls(target_class.id, current_session))
+
+    try:
+        new_rows = db.session.execute(
+            insert(StudentSessions).returning(StudentSessions.id, StudentSessions.student_id),
+            [
+                {
+                    "student_id": row.student_id,
+                    "session_id": current_session,
+                    "class_id": target_class.id,
+                    "ROLL": roll,
+                    "created_at": promoted_date,
+                    "status": "active",
+                }
+                for row, roll in zip(to_promote, rolls)
+            ]
+        ).all()
+
+        db.session.execute(
+            update(StudentSessions)
+            .where(StudentSessions.id.in_([row.id for row in to_promote]))
+            .values(status="promoted")
+        )
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"message": "Failed to promote students due to a roll/class conflict, try again."}), 409
+    except Exception as e:
+        db.session.rollback()
+        print("Error in bulk_promote:", e)
+        return jsonify({"message": "Failed to promote students due to a database error."}), 500
+
+    invalidate_student_stats(school_id, current_session)
+
+    promoted_ids = {student_id: new_id for new_id, student_id in new_rows}
+    results += [
+        {
+            "student_id": row.student_id,
+            "state": "PROMOTED",
+            "promoted_session_id": promoted_ids.get(row.student_id),
+            "next_roll": roll,
+            "next_class_id": target_class.id,
+        }
+        for row, roll in zip(to_promote, rolls)
+    ]
+
+    return jsonify({
+        "message": f"{len(to_promote)} students promoted to {target_class.CLASS}",
+        "promoted": len(to_promote),
+        "skipped": len(results) - len(to_promote),
+        "new_class": target_class.CLASS,
+        "created_at": promoted_date.isoformat(),
+        "results": results,
+    }), 200
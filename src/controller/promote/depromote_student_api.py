@@ -7,6 +7,7 @@ from src.model import StudentSessions
 
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import invalidate_student_stats
 
 depromote_student_api_bp = Blueprint('depromote_student_api_bp', __name__)
 
@@ -76,6 +77,7 @@ def depromote_student():
 
         # Commit
         db.session.commit()
+        invalidate_student_stats(session.get("school_id"), session_id)
 
         return jsonify({
             "message": "Student successfully depromoted",
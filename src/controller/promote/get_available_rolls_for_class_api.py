@@ -1,6 +1,6 @@
 from flask import session, request, Blueprint, jsonify
 
-from src.controller.utils.get_gapped_rolls import get_gapped_rolls
+from src.controller.utils.get_gapped_rolls import get_gapped_rolls, get_gapped_rolls_for_classes
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
@@ -13,8 +13,9 @@ get_available_rolls_for_class_api_bp = Blueprint('get_available_rolls_for_class_
 def get_available_rolls():
     data = request.get_json() or {}
     class_id = data.get('class_id')
+    class_ids = data.get('class_ids')
 
-    if not class_id:
+    if not class_id and not class_ids:
         return jsonify({"message": "Class ID is required."}), 400
 
     try:
@@ -22,6 +23,25 @@ def get_available_rolls():
     except (TypeError, ValueError):
         return jsonify({"message": "Invalid session."}), 400
 
+    # Several classes at once (bulk promotion screens), one query
+    if class_ids:
+        try:
+            results = get_gapped_rolls_for_classes(class_ids, session_id)
+        except (TypeError, ValueError):
+            return jsonify({"message": "Invalid class IDs."}), 400
+        except Exception:
+            return jsonify({"message": "Unable to fetch available rolls."}), 500
+
+        return jsonify({
+            'classes': {
+                str(c_id): {
+                    'available_rolls': result['gapped_rolls'] + [result['next_roll']],
+                    'next_roll': result['next_roll']
+                }
+                for c_id, result in results.items()
+            }
+        }), 200
+
     try:
         result = get_gapped_rolls(class_id, session_id)
         available_rolls = result['gapped_rolls'] + [result['next_roll']]
@@ -29,5 +49,5 @@ def get_available_rolls():
             'available_rolls': available_rolls,
             'next_roll': result['next_roll']
         }), 200
-    except Exception as e:
+    except Exception:
         return jsonify({"message": "Unable to fetch available rolls."}), 500
@@ -9,9 +9,10 @@ from src.model import StudentSessions
 from src.model import ClassData
 
 import datetime
-from src.controller.utils.get_gapped_rolls import get_gapped_rolls
+from src.controller.utils.get_gapped_rolls import get_gapped_rolls, lock_class_rolls
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import invalidate_student_stats
 
 promote_student_api_bp = Blueprint('promote_student_api_bp', __name__)
 
@@ -124,7 +125,9 @@ def promote_student():
     if already_promoted and already_promoted.status != "left":
         return jsonify({"message": "Student already has an active entry in this session, promotion not allowed!"}), 400
 
-    # Check for existing roll number in the target class and session
+    # Check for existing roll number in the target class and session,
+    # holding the class roll lock until the commit so a concurrent promotion can't take it
+    lock_class_rolls(class_to_promote, current_session)
     roll_conflict = StudentSessions.query.filter_by(
         session_id=current_session,
         class_id=class_to_promote,
@@ -155,6 +158,8 @@ def promote_student():
         db.session.rollback()
         return jsonify({"message": "Failed to promote student due to a database error."}), 500
 
+    invalidate_student_stats(school_id, current_session)
+
     return jsonify({
         "message": "Student promoted successfully",
         "state": "PROMOTED",
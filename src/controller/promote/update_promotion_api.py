@@ -3,7 +3,7 @@
 from flask import session, request, jsonify, Blueprint
 
 from src import db
-from src.controller.utils.get_gapped_rolls import get_gapped_rolls
+from src.controller.utils.get_gapped_rolls import get_gapped_rolls, lock_class_rolls
 from src.model import StudentsDB
 from src.model import StudentSessions
 from src.model import ClassData
@@ -12,6 +12,7 @@ import datetime
 
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import invalidate_student_stats
 
 
 update_promotion_api_bp = Blueprint('update_promotion_api_bp', __name__)
@@ -71,7 +72,8 @@ def update_promotion():
     class_changed = promoted_class_id != old_class_id
 
     if roll_changed or class_changed:
-        # Get available rolls for the target class
+        # Get available rolls for the target class, locked until the commit
+        lock_class_rolls(promoted_class_id, current_session)
         available_result = get_gapped_rolls(promoted_class_id, current_session)
         available_rolls = available_result['gapped_rolls'] + [available_result['next_roll']]
 
@@ -92,6 +94,7 @@ def update_promotion():
         student_session.class_id = promoted_class_id
 
         db.session.commit()
+        invalidate_student_stats(school_id, current_session)
 
         new_class = selected_class.CLASS
 
@@ -21,6 +21,7 @@ from src.controller.staff_module.utils.class_permission_validator import (valida
 from src import db
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
+from src.controller.utils.reference_cache import bump_reference_version
 
 add_staff_api_bp = Blueprint( 'add_staff_api_bp',   __name__)
 
@@ -152,4 +153,7 @@ def add_staff():
         else:
             return jsonify({'message': 'An unexpected database error occurred while adding staff.'}), 500
 
+    # Class access and signatures are cached per school
+    bump_reference_version(session.get('school_id'))
+
     return jsonify({'message': 'Staff added successfully', 'id': teacher.id}), 200
\ No newline at end of file
@@ -13,8 +13,8 @@ from src.model.ClassAccess import ClassAccess
 from src.model.Roles import Roles
 from src.model.TeachersLogin import TeachersLogin
 from src import db
-
-from src import r
+from src.controller.auth.permission_versions import bump_permission_version
+from src.controller.utils.reference_cache import bump_reference_version
 
 update_staff_api_bp = Blueprint( 'update_staff_api_bp',   __name__)
 
@@ -161,9 +161,7 @@ def update_staff_api():
             ))
         
         # updating permission no to reflect the permissions in client side instantly
-        permission_no = r.get(staff.id)
-        if permission_no:
-            r.set(staff.id, int(permission_no) + 1)
+        bump_permission_version(staff.id)
             
             
         db.session.commit()
@@ -172,4 +170,7 @@ def update_staff_api():
         print(e)
         return jsonify({'message': 'Error occurred while updating staff! Please contact support.', 'error': str(e)}), 500
 
+    # Class access and signatures (by role) are cached per school
+    bump_reference_version(school_id)
+
     return jsonify({'message': 'Staff updated successfully'}), 200
\ No newline at end of file
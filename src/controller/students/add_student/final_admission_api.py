@@ -4,10 +4,10 @@ from flask import session, request, jsonify, Blueprint
 
 from src.controller.students.utils.conflict_verification import verify_conflicts
 from src.controller.students.utils.student_service import StudentService
+from src.controller.students.utils.image_pipeline import image_pending
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
-import time
 
 
 final_admission_api_bp = Blueprint('final_admission_api_bp', __name__)
@@ -18,8 +18,6 @@ final_admission_api_bp = Blueprint('final_admission_api_bp', __name__)
 @permission_required('admission')
 def final_admission_api():
     """Create a new student after all validations."""
-    start = time.perf_counter()
-
     data = request.get_json() or {}
     verified_data = data.get("verifiedData", [])
     image_b64 = data.get("image")
@@ -37,7 +35,5 @@ def final_admission_api():
     if error:
         return jsonify([{"message": error}]), 500
     
-    end = time.perf_counter()
-    print(f"Execution time Final admission: {end - start:.6f} seconds")
-
-    return jsonify({"message": "Student added successfully.", "student_id": student_id}), 200
+    return jsonify({"message": "Student added successfully.", "student_id": student_id,
+                    "image_pending": image_pending(student_id)}), 200
@@ -3,7 +3,9 @@
 from flask import session, Blueprint
 from datetime import datetime, date
 
-from src.model.StudentsDB import StudentsDB
+from sqlalchemy.orm import undefer_group
+
+from src.model.StudentsDB import StudentsDB, ENCRYPTED_GROUP
 from src.model.ClassData import ClassData
 from src.model.ClassAccess import ClassAccess
 from src.model.StudentSessions import StudentSessions
@@ -154,6 +156,8 @@ def get_student_data(student_id, current_session, user_id):
         .join(AdmissionClass, StudentsDB.Admission_Class == AdmissionClass.id)
         .join(CurrentClass, StudentSessions.class_id == CurrentClass.id)
         .outerjoin(RTEInfo, RTEInfo.student_id == StudentsDB.id)
+        # Every column is read below, load the encrypted ones with the row
+        .options(undefer_group(ENCRYPTED_GROUP))
         .filter(
             StudentsDB.id == student_id,
             StudentSessions.session_id == current_session,
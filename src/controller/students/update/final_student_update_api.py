@@ -4,6 +4,7 @@ from flask import session, Blueprint, request, jsonify
 
 from src.controller.students.utils.conflict_verification import verify_conflicts
 from src.controller.students.utils.student_service import StudentService
+from src.controller.students.utils.image_pipeline import image_pending
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
@@ -37,5 +38,6 @@ def student_update_api():
     if error:
         return jsonify([{"message": error}]), 500
 
-    return jsonify({"message": "Student updated successfully.", "student_id": student_id}), 200
+    return jsonify({"message": "Student updated successfully.", "student_id": student_id,
+                    "image_pending": image_pending(student_id)}), 200
    
\ No newline at end of file
@@ -0,0 +1,98 @@
+# src/controller/students/utils/aadhaar_index.py
+# Used in --> src/commands.py, src/__init__.py (create_app)
+
+"""Schema and backfill for the Aadhaar blind index columns of StudentsDB.
+
+New and updated students get their blind index from StudentsDB.set_blind_index;
+rows written before the columns existed are filled by `backfill_blind_index()`.
+
+The schema has no migrations, so create_app runs `migrate_blind_index()` before
+the app serves anything: on a database without the columns it adds and fills
+them once. Every row has its blind index from then on, which has_aadhaar and
+the duplicate checks rely on.
+"""
+
+import time
+
+from sqlalchemy import inspect, text, update, or_, and_
+
+from src import db
+from src.model import StudentsDB
+from src.model.StudentsDB import BLIND_INDEXED, blind_index
+
+
+# Key of the session advisory lock held while one process migrates
+BLIND_INDEX_LOCK = 7302
+
+
+def has_blind_index_columns():
+    columns = {column["name"] for column in inspect(db.engine).get_columns(StudentsDB.__tablename__)}
+    return set(BLIND_INDEXED.values()) <= columns
+
+
+def ensure_blind_index_columns():
+    """Adds the blind index columns and indexes if the table doesn't have them yet."""
+    for column in BLIND_INDEXED.values():
+        db.session.execute(text(f'ALTER TABLE "StudentsDB" ADD COLUMN IF NOT EXISTS "{column}" TEXT'))
+        db.session.execute(text(
+            f'CREATE INDEX IF NOT EXISTS "ix_StudentsDB_{column}" ON "StudentsDB" (school_id, "{column}")'
+        ))
+    db.session.commit()
+
+
+def backfill_blind_index(batch_size=500, recompute=False):
+    """
+    Computes the blind index of rows missing it (every row with recompute=True),
+    in id order batches. Returns the number of rows updated.
+    """
+    encrypted = [getattr(StudentsDB, column) for column in BLIND_INDEXED]
+    missing = or_(*[
+        and_(getattr(StudentsDB, column).isnot(None), getattr(StudentsDB, bidx_column).is_(None))
+        for column, bidx_column in BLIND_INDEXED.items()
+    ])
+
+    last_id = 0
+    updated = 0
+    start = time.perf_counter()
+
+    while True:
+        query = db.session.query(StudentsDB.id, *encrypted).filter(StudentsDB.id > last_id)
+        if not recompute:
+            query = query.filter(missing)
+        rows = query.order_by(StudentsDB.id.asc()).limit(batch_size).all()
+        if not rows:
+            break
+
+        # Bulk UPDATE by primary key, the values are decrypted by EncryptedText
+        db.session.execute(update(StudentsDB), [
+            dict(id=row.id, **{
+                bidx_column: blind_index(getattr(row, column))
+                for column, bidx_column in BLIND_INDEXED.items()
+            })
+            for row in rows
+        ])
+        db.session.commit()
+
+        last_id = rows[-1].id
+        updated += len(rows)
+        print(f"Blind index: {updated} students updated ({time.perf_counter() - start:.1f}s)")
+
+    return updated
+
+
+def migrate_blind_index():
+    """Adds and backfills the blind index columns if they are missing. Returns True if it did."""
+    if has_blind_index_columns():
+        return False
+
+    with db.engine.connect() as lock_connection:
+        # Web workers starting together: one migrates, the others wait and find it done
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": BLIND_INDEX_LOCK})
+        try:
+            if has_blind_index_columns():
+                return False
+            ensure_blind_index_columns()
+            print(f"Blind index columns added, {backfill_blind_index()} students filled")
+            return True
+        finally:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BLIND_INDEX_LOCK})
@@ -105,6 +105,10 @@ def verify_conflicts(verified_data, mode='add', student_id=None):
         return [{'message': error}]
 
     # Check roll availability
+    if mode == 'add' and str(values.get("ROLL") or "").strip() == "":
+        # No roll given: create_student reserves the next free roll of the class
+        return None
+
     try:
         class_id = int(values.get("CLASS", ""))
         roll = int(values.get("ROLL", ""))
@@ -0,0 +1,243 @@
+# src/controller/students/utils/image_pipeline.py
+# Used in --> student_service.py, src/commands.py
+
+"""Student photos are sent to Google Drive after the student row is committed.
+
+StudentService commits the student first and queues an image job in Redis;
+`flask --app app image-worker` uploads / moves the files and then patches
+StudentsDB.IMAGE. While a job is pending, `image_pending(student_id)` is true.
+
+Failed jobs are retried with exponential backoff. IMAGE_STORAGE=local swaps
+Google Drive for a folder on disk (IMAGE_LOCAL_DIR), for development and tests.
+"""
+
+import base64
+import json
+import os
+import shutil
+import time
+import uuid
+
+import redis
+
+from src import r, db
+from src.model import StudentsDB
+from src.controller.students.utils import upload_image as drive
+
+
+IMAGE_QUEUE = "image_jobs:queue"
+IMAGE_RETRY = "image_jobs:retry"  # sorted set, score = when to retry
+IMAGE_JOB_KEY = "image_job:{}"
+IMAGE_PENDING_KEY = "student_image_pending:{}"
+
+IMAGE_JOB_TTL = 60 * 60 * 24 * 7
+MAX_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 10  # 10s, 20s, 40s, ...
+
+DELETED_IMAGES_FOLDER = "1e8iHskcj2Vtv_Mg_Mtp4BzdHocuhLd_f"
+
+
+# -------------------------------
+# Storage backends
+# -------------------------------
+
+class DriveImageStorage:
+    """Google Drive, through upload_image.py."""
+
+    def upload(self, image_base64, image_name, folder_id):
+        return drive.upload_image(image_base64, image_name, folder_id)
+
+    def move(self, file_id, new_folder_id, rename=None):
+        return drive.move_image(file_id, new_folder_id, rename=rename)
+
+
+class LocalImageStorage:
+    """Stand-in for Google Drive: folders under a local directory, file ids are random hex."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _find(self, file_id):
+        for folder in os.listdir(self.root):
+            path = os.path.join(self.root, folder, file_id)
+            if os.path.exists(path):
+                return path
+        raise FileNotFoundError(file_id)
+
+    def upload(self, image_base64, image_name, folder_id):
+        file_id = uuid.uuid4().hex
+        folder = os.path.join(self.root, str(folder_id))
+        os.makedirs(folder, exist_ok=True)
+        with open(os.path.join(folder, file_id), "wb") as f:
+            f.write(base64.b64decode(image_base64))
+        return file_id
+
+    def move(self, file_id, new_folder_id, rename=None):
+        folder = os.path.join(self.root, str(new_folder_id))
+        os.makedirs(folder, exist_ok=True)
+        shutil.move(self._find(file_id), os.path.join(folder, file_id))
+        return True
+
+
+def get_storage():
+    if os.getenv("IMAGE_STORAGE", "drive").lower() == "local":
+        return LocalImageStorage(os.getenv("IMAGE_LOCAL_DIR", "local_drive"))
+    return DriveImageStorage()
+
+
+# -------------------------------
+# Queueing (web side)
+# -------------------------------
+
+def image_pending(student_id):
+    try:
+        return bool(r.exists(IMAGE_PENDING_KEY.format(student_id)))
+    except redis.exceptions.RedisError:
+        return False
+
+
+def queue_image_job(student_id, action, **fields):
+    """
+    Queues an image change for a committed student:
+      - action "replace": upload image_base64 to folder_id, then set IMAGE and move old_image away
+      - action "discard": move old_image to the deleted images folder
+    Without Redis the job runs right away, still outside the student transaction.
+    """
+    job_id = uuid.uuid4().hex
+    job = dict(fields, student_id=student_id, action=action, attempts=0)
+
+    try:
+        pipe = r.pipeline()
+        pipe.set(IMAGE_JOB_KEY.format(job_id), json.dumps(job), ex=IMAGE_JOB_TTL)
+        # Latest job wins: an older job for the same student will not patch IMAGE
+        pipe.set(IMAGE_PENDING_KEY.format(student_id), job_id, ex=IMAGE_JOB_TTL)
+        pipe.rpush(IMAGE_QUEUE, job_id)
+        pipe.execute()
+    except redis.exceptions.RedisError as e:
+        print("Unable to queue image job, processing it now:", e)
+        try:
+            process_image_job(None, job)
+        except Exception as error:
+            db.session.rollback()
+            print(f"Image job for student {student_id} failed:", error)
+
+    return job_id
+
+
+# -------------------------------
+# Processing (worker side)
+# -------------------------------
+
+def _is_latest(job_id, student_id):
+    return job_id is None or r.get(IMAGE_PENDING_KEY.format(student_id)) == job_id
+
+
+def process_image_job(job_id, job, storage=None):
+    """Runs one job. Raises on failure so the caller can retry it."""
+    storage = storage or get_storage()
+    student_id = job["student_id"]
+    old_image = job.get("old_image")
+
+    if job["action"] == "replace":
+        if not _is_latest(job_id, student_id):
+            return "superseded"
+
+        new_image = job.get("new_image")
+        if not new_image:
+            new_image = storage.upload(job["image_base64"], job["image_name"], job["folder_id"])
+            if job_id is not None:
+                # A retry after this point must not upload the photo twice
+                job["new_image"] = new_image
+                r.set(IMAGE_JOB_KEY.format(job_id), json.dumps(job), ex=IMAGE_JOB_TTL)
+
+        # Only if nobody changed the photo since the job was queued
+        updated = (
+            db.session.query(StudentsDB)
+            .filter(StudentsDB.id == student_id, StudentsDB.IMAGE.is_not_distinct_from(old_image))
+            .update({"IMAGE": new_image}, synchronize_session=False)
+        )
+        db.session.commit()
+
+        if not updated:
+            storage.move(new_image, DELETED_IMAGES_FOLDER, rename=str(student_id))
+            return "conflict"
+
+    if old_image:
+        storage.move(old_image, DELETED_IMAGES_FOLDER, rename=str(student_id))
+
+    return "done"
+
+
+def _finish(job_id, job):
+    pending_key = IMAGE_PENDING_KEY.format(job["student_id"])
+    r.delete(IMAGE_JOB_KEY.format(job_id))
+    # Compare-and-delete, a newer job may already own the marker
+    if r.get(pending_key) == job_id:
+        r.delete(pending_key)
+
+
+def _retry_or_give_up(job_id, job, error):
+    job["attempts"] = int(job.get("attempts", 0)) + 1
+    job["error"] = str(error)
+
+    if job["attempts"] >= MAX_ATTEMPTS:
+        print(f"Image job {job_id} for student {job['student_id']} gave up after {job['attempts']} attempts:", error)
+        _finish(job_id, job)
+        return
+
+    delay = RETRY_BASE_SECONDS * 2 ** (job["attempts"] - 1)
+    print(f"Image job {job_id} failed (attempt {job['attempts']}), retrying in {delay}s:", error)
+    pipe = r.pipeline()
+    pipe.set(IMAGE_JOB_KEY.format(job_id), json.dumps(job), ex=IMAGE_JOB_TTL)
+    pipe.zadd(IMAGE_RETRY, {job_id: time.time() + delay})
+    pipe.execute()
+
+
+def _requeue_due_retries():
+    due = r.zrangebyscore(IMAGE_RETRY, 0, time.time())
+    for job_id in due:
+        # zrem returns 0 if another worker took it first
+        if r.zrem(IMAGE_RETRY, job_id):
+            r.rpush(IMAGE_QUEUE, job_id)
+
+
+def process_next_job(storage, poll_timeout=5):
+    """Requeues due retries, then takes and runs one job. False if the queue stayed empty."""
+    _requeue_due_retries()
+    popped = r.blpop(IMAGE_QUEUE, timeout=poll_timeout)
+    if not popped:
+        return False
+
+    job_id = popped[1]
+    raw = r.get(IMAGE_JOB_KEY.format(job_id))
+    if not raw:
+        return True
+    job = json.loads(raw)
+
+    start = time.perf_counter()
+    try:
+        status = process_image_job(job_id, job, storage)
+    except Exception as e:
+        db.session.rollback()
+        _retry_or_give_up(job_id, job, e)
+        return True
+    finally:
+        db.session.remove()
+
+    _finish(job_id, job)
+    print(f"Image job {job_id} ({job['action']}) for student {job['student_id']} "
+          f"{status} in {time.perf_counter() - start:.2f}s")
+    return True
+
+
+def run_image_worker(poll_timeout=5):
+    """Takes image jobs off the queue forever. Needs an app context."""
+    print(f"Image worker {os.getpid()} waiting for jobs")
+    storage = get_storage()
+
+    while True:
+        try:
+            process_next_job(storage, poll_timeout)
+        except redis.exceptions.RedisError as e:
+            print("Image worker lost Redis:", e)
+            time.sleep(poll_timeout)
@@ -3,13 +3,15 @@
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, date
 from sqlalchemy import or_
+from sqlalchemy.orm import undefer_group
 from sqlalchemy.exc import IntegrityError
 
 from src import db
 from src.model import StudentsDB, StudentSessions, ClassData, RTEInfo, Schools
-from src.controller.students.utils.upload_image import upload_image, delete_image, move_image
-from src.controller.utils.get_gapped_rolls import get_gapped_rolls
-import time
+from src.model.StudentsDB import BLIND_INDEXED, BLIND_INDEX_GROUP, AADHAAR_PLACEHOLDER, blind_index
+from src.controller.students.utils.image_pipeline import queue_image_job
+from src.controller.students.utils.student_stats import invalidate_student_stats
+from src.controller.utils.get_gapped_rolls import get_gapped_rolls, lock_class_rolls, reserve_next_roll, roll_is_free
 
 
 class StudentService:
@@ -89,14 +91,23 @@ class StudentService:
     def check_unique_conflicts(values: Dict[str, str], school_id: int, school_fields: list, exclude_student_id: Optional[int] = None) -> Optional[str]:
         """Check for unique field conflicts."""
 
-        school_filters = []        
+        # Encrypted fields are compared through their blind index
+        lookups = {}
         for field in school_fields:
             value = values.get(field, None)
-            if value:
-                school_filters.append(getattr(StudentsDB, field) == value)
+            if not value:
+                continue
+            if field in BLIND_INDEXED:
+                if str(value) == AADHAAR_PLACEHOLDER:
+                    continue
+                lookups[field] = (BLIND_INDEXED[field], blind_index(value))
+            else:
+                lookups[field] = (field, value)
+
+        school_filters = [getattr(StudentsDB, column) == value for column, value in lookups.values()]
 
         if school_filters:
-            query = db.session.query(StudentsDB).filter(
+            query = db.session.query(StudentsDB).options(undefer_group(BLIND_INDEX_GROUP)).filter(
                 StudentsDB.school_id == school_id,
                 or_(*school_filters)
             )
@@ -104,7 +115,7 @@ class StudentService:
                 query = query.filter(StudentsDB.id != exclude_student_id)
             conflict = query.first()
             if conflict:
-                conflicting = [f for f, v in zip(school_fields, [values.get(f, "") for f in school_fields]) if v and getattr(conflict, f) == v]
+                conflicting = [f for f, (column, value) in lookups.items() if getattr(conflict, column) == value]
                 return f"Student '{conflict.STUDENTS_NAME}' already has the same {', '.join(conflicting)}."
 
         return None
@@ -161,6 +172,16 @@ class StudentService:
         sessions_data["created_at"] = studentsdb_data["ADMISSION_DATE"]
 
         try:
+            # The roll was checked before, check again while holding the class roll lock
+            if sessions_data.get("ROLL"):
+                lock_class_rolls(sessions_data["class_id"], session_id)
+                if not roll_is_free(sessions_data["class_id"], session_id, sessions_data["ROLL"]):
+                    db.session.rollback()
+                    return None, f"Roll {sessions_data['ROLL']} was just given to another student, please choose another roll."
+            else:
+                # No roll given: the lowest free roll, held by the lock until the commit
+                sessions_data["ROLL"] = reserve_next_roll(sessions_data["class_id"], session_id)
+
             new_student = StudentsDB(**studentsdb_data)
             db.session.add(new_student)
             db.session.flush()
@@ -170,25 +191,26 @@ class StudentService:
             db.session.add(session_row)
             db.session.add(rte_row)
 
-            # Handle image
-            if image_b64:
-                school = Schools.query.filter_by(id=school_id).first()
-                if school:
-                    encoded = image_b64.split(",")[1]
-                    image_id = upload_image(encoded, data.get("ADMISSION_NO"), school.students_image_folder_id)
-                    new_student.IMAGE = image_id
+            school = Schools.query.filter_by(id=school_id).first() if image_b64 else None
             db.session.commit()
-
-            return new_student.id, None
         except IntegrityError as e:
             db.session.rollback()
             return None, "Database integrity error. Possible duplicate data."
         except Exception as e:
             db.session.rollback()
-            if 'image_id' in locals():
-                delete_image(image_id)
             return None, f"Failed to create student: {str(e)}"
 
+        invalidate_student_stats(school_id, session_id)
+
+        # Handle image: uploaded by the image worker, the row is already saved
+        if image_b64 and school:
+            encoded = image_b64.split(",")[1]
+            queue_image_job(new_student.id, "replace", image_base64=encoded,
+                            image_name=data.get("ADMISSION_NO"),
+                            folder_id=school.students_image_folder_id, old_image=None)
+
+        return new_student.id, None
+
     @staticmethod
     def update_student(student_id: int, verified_data: List[Dict], image_b64: Optional[str], image_status: str, school_id: int, session_id: int) -> Optional[str]:
         """Update an existing student."""
@@ -231,6 +253,15 @@ class StudentService:
             for k, v in sessions_updates.items():
                 setattr(session_row, k, v)
 
+            # Class or roll changed: check the roll again while holding the class roll lock
+            if session_row.ROLL and db.session.is_modified(session_row):
+                with db.session.no_autoflush:
+                    lock_class_rolls(session_row.class_id, session_id)
+                    roll_free = roll_is_free(session_row.class_id, session_id, session_row.ROLL, session_row.id)
+                if not roll_free:
+                    db.session.rollback()
+                    return f"Roll {session_row.ROLL} was just given to another student, please choose another roll."
+
             # Update or create RTE row
             rte_row = RTEInfo.query.filter_by(student_id=student_id).first()
             if not rte_row:
@@ -239,30 +270,32 @@ class StudentService:
             for k, v in rte_updates.items():
                 setattr(rte_row, k, v)
 
-            # Image handling
-            deleted_folder = "1e8iHskcj2Vtv_Mg_Mtp4BzdHocuhLd_f"
+            # Image handling: Drive calls happen in the image worker, after the commit
             school = Schools.query.filter_by(id=school_id).first()
             if not school:
+                db.session.rollback()
                 return "School not found."
 
+            image_job = None
             if image_status == "updated" and image_b64:
-                encoded = image_b64.split(",")[1]
-                image_id = upload_image(encoded, student.ADMISSION_NO, school.students_image_folder_id)
-                if student.IMAGE:
-                    move_image(student.IMAGE, deleted_folder, rename=str(student_id))
-                student.IMAGE = image_id
+                image_job = dict(action="replace", image_base64=image_b64.split(",")[1],
+                                 image_name=student.ADMISSION_NO,
+                                 folder_id=school.students_image_folder_id, old_image=student.IMAGE)
             elif image_status == "removed" and student.IMAGE:
-                old_id = student.IMAGE
+                image_job = dict(action="discard", old_image=student.IMAGE)
                 student.IMAGE = None
-                move_image(old_id, deleted_folder, rename=str(student_id))
-            start = time.perf_counter()
+
             db.session.commit()
-            end = time.perf_counter()
-            print(f"Update student time: {end - start:.6f} seconds")
-            return None
         except IntegrityError:
             db.session.rollback()
             return "Update failed due to data conflicts."
         except Exception as e:
             db.session.rollback()
-            return f"Update failed: {str(e)}"
\ No newline at end of file
+            return f"Update failed: {str(e)}"
+
+        # Gender / admission no / class can change, and the student is counted in neighbouring sessions too
+        invalidate_student_stats(school_id, session_id - 1, session_id, session_id + 1)
+
+        if image_job:
+            queue_image_job(student_id, **image_job)
+        return None
\ No newline at end of file
@@ -0,0 +1,109 @@
+# src/controller/students/utils/student_stats.py
+# Used in --> get_students_data_api.py, student_stats_api.py
+# Invalidated from --> student_service.py, promote_student_api.py, update_promotion_api.py,
+#                      depromote_student_api.py, generate_tc_form_api.py, redo_tc_api.py
+
+"""Per-(school, session) student counts for the student list dashboard.
+
+One grouped query (count(*) FILTER ...) gives total / girls / old students per
+class; the snapshot is kept in Redis until a write that can change it
+(admission, student edit, promotion, TC) deletes it. The dashboard then sums
+the classes the user can access instead of loading every student row.
+"""
+
+import json
+
+import redis
+from sqlalchemy import String, cast, func
+
+from src import r, db
+from src.model import StudentsDB, StudentSessions
+
+
+STATS_KEY = "student_stats:{}:{}"
+STATS_TTL = 60 * 60 * 6  # seconds, bounds staleness from writes that don't invalidate
+
+
+def _admission_prefix_is_not(session_id):
+    # Same rule as before: ADMISSION_NO starting with the session's last two digits is a new admission
+    prefix = func.coalesce(func.substr(cast(StudentsDB.ADMISSION_NO, String), 1, 2), '')
+    return prefix != str(session_id)[-2:]
+
+
+def compute_class_stats(school_id, session_id):
+    """{class_id: {"total", "girls", "old"}} for one session, in one query."""
+    rows = db.session.query(
+        StudentSessions.class_id,
+        func.count().label("total"),
+        func.count().filter(func.lower(cast(StudentsDB.GENDER, String)) == 'female').label("girls"),
+        func.count().filter(_admission_prefix_is_not(session_id)).label("old"),
+    ).join(
+        StudentsDB, StudentsDB.id == StudentSessions.student_id
+    ).filter(
+        StudentsDB.school_id == school_id,
+        StudentSessions.session_id == session_id
+    ).group_by(StudentSessions.class_id).all()
+
+    return {row.class_id: {"total": row.total, "girls": row.girls, "old": row.old} for row in rows}
+
+
+def class_stats(school_id, session_id):
+    """Cached compute_class_stats()."""
+    key = STATS_KEY.format(school_id, session_id)
+    try:
+        cached = r.get(key)
+        if cached:
+            return {int(class_id): counts for class_id, counts in json.loads(cached).items()}
+    except redis.exceptions.RedisError as e:
+        print("Student stats cache unavailable:", e)
+        return compute_class_stats(school_id, session_id)
+
+    stats = compute_class_stats(school_id, session_id)
+    try:
+        r.set(key, json.dumps(stats), ex=STATS_TTL)
+    except redis.exceptions.RedisError as e:
+        print("Unable to cache student stats:", e)
+    return stats
+
+
+def invalidate_student_stats(school_id, *session_ids):
+    """Drops the snapshots of the given sessions (call after the write is committed)."""
+    try:
+        r.delete(*[STATS_KEY.format(school_id, session_id) for session_id in session_ids])
+    except redis.exceptions.RedisError as e:
+        print("Unable to invalidate student stats:", e)
+
+
+def dashboard_stats(school_id, session_id, class_ids):
+    """The `stats` block of /api/get_students_data."""
+    session_id = int(session_id)
+    current = class_stats(school_id, session_id)
+    previous = class_stats(school_id, session_id - 1)
+
+    wanted = [current[class_id] for class_id in class_ids if class_id in current]
+    total_students = sum(c["total"] for c in wanted)
+    total_girls = sum(c["girls"] for c in wanted)
+    old_students = sum(c["old"] for c in wanted)
+    new_students = total_students - old_students
+
+    # Previous year is school-wide
+    previous_year_students_total = sum(c["total"] for c in previous.values())
+    old_students_prv = sum(c["old"] for c in previous.values())
+    new_students_prev = previous_year_students_total - old_students_prv
+
+    increased_students = total_students - previous_year_students_total
+    total_growth_percentage = increased_students / previous_year_students_total * 100 if previous_year_students_total else 0
+    new_students_growth_percentage = (new_students - new_students_prev) / new_students_prev * 100 if new_students_prev else 0
+
+    return {
+        'total_students': total_students,
+        'total_girls': total_girls,
+        'total_boys': total_students - total_girls,
+        'new_students': new_students,
+        'old_students': old_students,
+        'increased_students': increased_students,
+        'new_students_growth_percentage': new_students_growth_percentage,
+        'previous_year_students_total': previous_year_students_total,
+        'total_growth_percentage': total_growth_percentage,
+        'new_students_prev': new_students_prev
+    }
@@ -1,12 +1,16 @@
 import base64
+from contextlib import contextmanager
 from googleapiclient.discovery import build
 from google.oauth2 import service_account
 from googleapiclient.http import MediaIoBaseUpload
+import google_auth_httplib2
+import httplib2
 
 from dotenv import load_dotenv
 import io
 import json
 import os
+import threading
 import time
 
 
@@ -16,17 +20,64 @@ load_dotenv()
 
 scope = ['https://www.googleapis.com/auth/drive']
 
+_credentials = None
+_credentials_lock = threading.Lock()
+
+# httplib2 connections are not thread-safe: one Drive client per thread,
+# all of them sharing the same credentials (and access token)
+_clients = threading.local()
+
+
 def get_credentials():
+    """Service-account credentials, parsed once per process and refreshed by google-auth when they expire."""
+    global _credentials
+
+    if _credentials is not None:
+        return _credentials
+
+    with _credentials_lock:
+        if _credentials is None:
+            creds_json = os.getenv("GOOGLE_SERVICE_ACCOUNT")
+
+            if not creds_json:
+                raise Exception("Environment variable 'GOOGLE_SERVICE_ACCOUNT' not set.")
 
-    creds_json = os.getenv("GOOGLE_SERVICE_ACCOUNT")
+            creds_dict = json.loads(creds_json)
+            _credentials = service_account.Credentials.from_service_account_info(
+                creds_dict, scopes=scope)
+    return _credentials
 
-    if not creds_json:
-        raise Exception("Environment variable 'GOOGLE_SERVICE_ACCOUNT' not set.")
 
-    creds_dict = json.loads(creds_json)
-    creds = service_account.Credentials.from_service_account_info(
-        creds_dict, scopes=scope)
-    return creds
+def get_drive_service():
+    """Drive v3 client of the current thread, built on first use."""
+    service = getattr(_clients, "drive", None)
+    if service is None:
+        http = google_auth_httplib2.AuthorizedHttp(get_credentials(), http=httplib2.Http())
+        # static_discovery: the bundled discovery document, no extra HTTP request
+        service = build('drive', 'v3', http=http, cache_discovery=False, static_discovery=True)
+        _clients.drive = service
+    return service
+
+
+class PhaseTimer:
+    """Collects how long each phase of one Drive operation took and prints them on one line."""
+
+    def __init__(self, operation):
+        self.operation = operation
+        self.phases = []
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - start))
+
+    def report(self):
+        total = sum(seconds for _, seconds in self.phases)
+        details = " | ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in self.phases)
+        print(f"{self.operation} time: {total:.6f} seconds ({details})")
 
 # def compress_image(image_data):
 #     """Compress image to reduce size while maintaining quality."""
@@ -50,12 +101,14 @@ def get_credentials():
 #         return image_data
 
 def upload_image(image_base64, image_name, drive_folder_id):
-    
-    creds = get_credentials()
-    drive_service = build('drive', 'v3', credentials=creds)
-    
-    image_data = base64.b64decode(image_base64)
-    
+    timer = PhaseTimer("Upload image")
+
+    with timer.phase("client"):
+        drive_service = get_drive_service()
+
+    with timer.phase("decode"):
+        image_data = base64.b64decode(image_base64)
+
     byte_stream = io.BytesIO(image_data)
 
     media = MediaIoBaseUpload(byte_stream, mimetype='image/jpeg')
@@ -64,10 +117,8 @@ def upload_image(image_base64, image_name, drive_folder_id):
         'name': str(image_name),
         'parents': [drive_folder_id]
     }
-    start = time.perf_counter()
-    file = drive_service.files().create(body=file_metadata, media_body=media, fields='id').execute()
-    end = time.perf_counter()
-    print(f"Upload image time: {end - start:.6f} seconds")
+    with timer.phase("create"):
+        file = drive_service.files().create(body=file_metadata, media_body=media, fields='id').execute()
     file_id = file.get('id')
 
     # make the file publicly accessible
@@ -75,43 +126,48 @@ def upload_image(image_base64, image_name, drive_folder_id):
         'type': 'anyone',
         'role': 'reader'
     }
-    drive_service.permissions().create(fileId=file_id, body=permission).execute()
+    with timer.phase("permission"):
+        drive_service.permissions().create(fileId=file_id, body=permission).execute()
+
+    timer.report()
     return file_id
 
 
 def delete_image(file_id):
     try:
-        creds = get_credentials()
-        drive_service = build('drive', 'v3', credentials=creds)
-        start = time.perf_counter()
-        drive_service.files().delete(fileId=file_id).execute()
-        end = time.perf_counter()
-        print(f"Delete image time: {end - start:.6f} seconds")
+        timer = PhaseTimer("Delete image")
+
+        with timer.phase("client"):
+            drive_service = get_drive_service()
+
+        with timer.phase("delete"):
+            drive_service.files().delete(fileId=file_id).execute()
+
+        timer.report()
         return True  # Indicate success
     except Exception as error:
         print(f"An error occurred: {error}")
         return False  # Indicate failure
     
 def move_image(file_id, new_folder_id, rename=None, older_images_folder_id=None):
+    timer = PhaseTimer("Move image")
 
-    creds = get_credentials()
-    drive_service = build('drive', 'v3', credentials=creds)
+    with timer.phase("client"):
+        drive_service = get_drive_service()
 
     if not older_images_folder_id:
         # Get current parent folder(s) of the file
-        file = drive_service.files().get(fileId=file_id, fields='parents').execute()
+        with timer.phase("parents"):
+            file = drive_service.files().get(fileId=file_id, fields='parents').execute()
         older_images_folder_id = ",".join(file.get('parents'))
 
-    # Move the file to the new folder
-    start = time.perf_counter()
-    drive_service.files().update(fileId=file_id, addParents=new_folder_id, removeParents=older_images_folder_id).execute()
-    end = time.perf_counter()
-    print(f"Move image time: {end - start:.6f} seconds")
-
-    # Optionally rename the file
-    if rename:
-        drive_service.files().update(fileId=file_id, body={'name': rename}).execute()
+    # Move (and optionally rename) the file in one request
+    body = {'name': rename} if rename else None
+    with timer.phase("update"):
+        drive_service.files().update(fileId=file_id, body=body, addParents=new_folder_id,
+                                     removeParents=older_images_folder_id).execute()
 
+    timer.report()
     return True  # Indicate success
 
 
@@ -3,8 +3,10 @@ from flask import render_template, session, request, Blueprint, jsonify
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
+from src.controller.jobs.document_jobs import background_job
+from src.controller.utils.reference_cache import school_info
 
-from src.model import StudentsDB, ClassData, StudentSessions, Schools
+from src.model import StudentsDB, ClassData, StudentSessions
 from src import db
 
 get_admit_cards_api_bp = Blueprint('get_admit_cards_api_bp', __name__)
@@ -13,6 +15,7 @@ get_admit_cards_api_bp = Blueprint('get_admit_cards_api_bp', __name__)
 @get_admit_cards_api_bp.route('/admit_cards_api', methods=['POST', 'GET'])
 @login_required
 @permission_required('admit_card')
+@background_job
 def get_admit_cards_api():
     """Fetch students for admit cards and render `admit.html`.
 
@@ -102,7 +105,7 @@ def get_admit_cards_api():
     pages = [student_objs[i:i + page_size] for i in range(0, len(student_objs), page_size)]
 
     # Get school info for logo and name
-    school = db.session.query(Schools).filter_by(id=school_id).first()
+    school = school_info(school_id)
     school_name = school.School_Name if school else ''
     logo = school.Logo if school else ''
 
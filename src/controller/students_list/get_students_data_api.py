@@ -1,19 +1,20 @@
 # src/controller/students_list/get_students_data_api.py
 
 from collections import Counter
-from flask import jsonify, session, Blueprint
-from sqlalchemy import String, case, cast, extract, func
+from flask import jsonify, session, Blueprint, request
+from sqlalchemy import String, and_, or_, case, cast, extract, func, tuple_
 from datetime import datetime
 
 from src.model.RTEInfo import RTEInfo
-from src.model.StudentsDB import StudentsDB
+from src.model.StudentsDB import StudentsDB, AADHAAR_PLACEHOLDER, blind_index
 from src.model.StudentSessions import StudentSessions
 from src.model.ClassData import ClassData
-from src.model.ClassAccess import ClassAccess
 
 from src import db
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import dashboard_stats
+from src.controller.utils.reference_cache import user_classes
 
 
 
@@ -21,6 +22,138 @@ from src.controller.auth.login_required import login_required
 get_students_data_api_bp = Blueprint('get_students_data_api_bp', __name__)
 
 
+# ---------------------------------------------------
+# Paginated mode (?limit=...)
+# ---------------------------------------------------
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# Keyset order: (display_order, ROLL, StudentSessions.id), NULLs sorted last
+PAGE_ORDER = (
+    func.coalesce(ClassData.display_order, 32767),
+    func.coalesce(StudentSessions.ROLL, 2147483647),
+    StudentSessions.id,
+)
+
+DEFAULT_PAGE_FIELDS = (
+    'id', 'STUDENTS_NAME', 'FATHERS_NAME', 'GENDER', 'IMAGE', 'ADMISSION_NO', 'PEN',
+    'ROLL', 'CLASS', 'Section', 'is_RTE', 'student_status', 'has_aadhaar',
+)
+
+
+def page_columns(selected_session):
+    """Columns a page can return, by name (?fields=a,b,c)."""
+    return {
+        'id': StudentsDB.id,
+        'STUDENTS_NAME': StudentsDB.STUDENTS_NAME,
+        'DOB': func.to_char(StudentsDB.DOB, 'Dy, DD Mon YYYY'),
+        'AADHAAR': StudentsDB.AADHAAR,
+        'has_aadhaar': and_(
+            StudentsDB.AADHAAR.isnot(None),
+            StudentsDB.AADHAAR_bidx.is_distinct_from(blind_index(AADHAAR_PLACEHOLDER)),
+        ),
+        'FATHERS_NAME': StudentsDB.FATHERS_NAME,
+        'PEN': StudentsDB.PEN,
+        'GENDER': StudentsDB.GENDER,
+        'IMAGE': StudentsDB.IMAGE,
+        'ADMISSION_NO': StudentsDB.ADMISSION_NO,
+        'admission_session_id': StudentsDB.admission_session_id,
+        'PHONE': StudentsDB.PHONE,
+        'Free_Scheme': StudentsDB.Free_Scheme,
+        'ADMISSION_SESSION': StudentsDB.ADMISSION_SESSION,
+        'ADMISSION_DATE': StudentsDB.ADMISSION_DATE,
+        'ROLL': StudentSessions.ROLL,
+        'CLASS': ClassData.CLASS,
+        'Section': ClassData.Section,
+        'display_order': ClassData.display_order,
+        'is_RTE': RTEInfo.is_RTE,
+        'student_status': case(
+            (StudentsDB.admission_session_id == selected_session, 'new'),
+            else_='old'
+        ),
+    }
+
+
+def parse_cursor(cursor):
+    """'display_order:roll:student_session_id' of the last row of the previous page."""
+    parts = cursor.split(':')
+    if len(parts) != 3:
+        raise ValueError(cursor)
+    return tuple(int(part) for part in parts)
+
+
+def students_page(selected_session, class_ids):
+    args = request.args
+
+    try:
+        limit = min(max(int(args.get('limit', PAGE_SIZE)), 1), MAX_PAGE_SIZE)
+        after = parse_cursor(args['cursor']) if args.get('cursor') else None
+        wanted_classes = {int(class_id) for class_id in args.getlist('class_id') if class_id}
+    except ValueError:
+        return jsonify({"message": "Invalid limit, cursor or class_id"}), 400
+
+    columns = page_columns(selected_session)
+    fields = [f for f in args.get('fields', '').split(',') if f] or list(DEFAULT_PAGE_FIELDS)
+    unknown = [f for f in fields if f not in columns]
+    if unknown:
+        return jsonify({"message": f"Unknown fields: {', '.join(unknown)}"}), 400
+
+    # Only classes the user can access
+    if wanted_classes:
+        class_ids = [class_id for class_id in class_ids if class_id in wanted_classes]
+
+    filters = [
+        StudentSessions.session_id == selected_session,
+        ClassData.id.in_(class_ids),
+    ]
+    if args.get('gender'):
+        filters.append(func.lower(cast(StudentsDB.GENDER, String)) == args['gender'].lower())
+    if args.get('rte') == '1':
+        filters.append(RTEInfo.is_RTE.is_(True))
+    elif args.get('rte') == '0':
+        filters.append(or_(RTEInfo.is_RTE.is_(None), RTEInfo.is_RTE.is_(False)))
+    if args.get('status') == 'new':
+        filters.append(StudentsDB.admission_session_id == selected_session)
+    elif args.get('status') == 'old':
+        filters.append(StudentsDB.admission_session_id != selected_session)
+    if args.get('name'):
+        prefix = args['name'].replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        filters.append(StudentsDB.STUDENTS_NAME.ilike(f"{prefix}%", escape='\\'))
+    if after:
+        filters.append(tuple_(*PAGE_ORDER) > tuple_(*after))
+
+    rows = db.session.query(
+        *[columns[f].label(f) for f in fields],
+        *[expr.label(f"_key{i}") for i, expr in enumerate(PAGE_ORDER)],
+    ).join(
+        StudentSessions, StudentSessions.student_id == StudentsDB.id
+    ).join(
+        ClassData, StudentSessions.class_id == ClassData.id
+    ).outerjoin(
+        RTEInfo, RTEInfo.student_id == StudentsDB.id
+    ).filter(
+        *filters
+    ).order_by(
+        *PAGE_ORDER
+    ).limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        next_cursor = f"{last._key0}:{last._key1}:{last._key2}"
+
+    return jsonify({
+        'status': 'success',
+        'students': [{f: getattr(row, f) for f in fields} for row in rows],
+        'count': len(rows),
+        'fields': fields,
+        'next_cursor': next_cursor,
+    }), 200
+
+
 @get_students_data_api_bp.route('/api/get_students_data', methods=['GET'])
 @login_required
 @permission_required('student_list')
@@ -32,15 +165,20 @@ def get_students_data():
     # ---------------------------------------------------
     # 1. Determine classes the user has access to
     # ---------------------------------------------------
-    classes_query = (
-        db.session.query(ClassData)
-        .join(ClassAccess, ClassAccess.class_id == ClassData.id)
-        .filter(ClassAccess.staff_id == user_id)
-        .order_by(ClassData.id.asc())
-    )
+    class_ids = [cls.id for cls in user_classes(school_id, user_id)]
+
+    # Paginated mode: a small page with chosen columns, stats come from /api/student_stats
+    if request.args.get('limit'):
+        return students_page(selected_session, class_ids)
 
-    classes = classes_query.all()
-    class_ids = [cls.id for cls in classes]
+    # ?aadhaar=0 leaves the encrypted column out (nothing to decrypt), only saying whether it is filled
+    if request.args.get('aadhaar', '1') == '0':
+        aadhaar_column = and_(
+            StudentsDB.AADHAAR.isnot(None),
+            StudentsDB.AADHAAR_bidx.is_distinct_from(blind_index(AADHAAR_PLACEHOLDER)),
+        ).label('has_aadhaar')
+    else:
+        aadhaar_column = StudentsDB.AADHAAR
 
     # ---------------------------------------------------
     # 2. Main student data query (single query)
@@ -48,7 +186,7 @@ def get_students_data():
     data = db.session.query(
         StudentsDB.id,StudentsDB.STUDENTS_NAME,
         func.to_char(StudentsDB.DOB, 'Dy, DD Mon YYYY').label('DOB'),
-        StudentsDB.AADHAAR, StudentsDB.FATHERS_NAME,
+        aadhaar_column, StudentsDB.FATHERS_NAME,
         StudentsDB.PEN, StudentsDB.GENDER,
         StudentsDB.IMAGE, StudentsDB.ADMISSION_NO,
         StudentsDB.admission_session_id,
@@ -80,51 +218,12 @@ def get_students_data():
     ).all()
 
     # ---------------------------------------------------
-    # 3. Compute statistics in Python
-    # ---------------------------------------------------
-
-    total_students = len(data)
-    total_girls = sum(1 for s in data if s.GENDER.lower() == 'female')
-    total_boys = total_students - total_girls  # faster than looping again
-
-    # Assuming new students have ADMISSION_NO containing selected_session
-    old_students = sum(1 for s in data if str(s.ADMISSION_NO)[:2] != str(selected_session)[-2:])
-    new_students = total_students - old_students
-
-    # ---------------------------------------------------
-    # 4. Get previous year stats (one small query)
+    # 3. Statistics from the cached per-class snapshot
     # ---------------------------------------------------
-
-    # get total students and old students from previous session from sql
-    previous_year_students_total, old_students_prv = db.session.query(
-        func.count(StudentsDB.id),  # total students
-        func.sum(
-            case(
-                (func.substr(cast(StudentsDB.ADMISSION_NO, String), 1, 2) != str(selected_session-1)[-2:], 1),
-                else_=0
-            )
-        )  # old students
-    ).join(
-        StudentSessions, StudentSessions.student_id == StudentsDB.id
-    ).filter(
-        StudentsDB.school_id == school_id,
-        StudentSessions.session_id == selected_session - 1
-    ).one()
-
-    if previous_year_students_total is None:
-        previous_year_students_total = 0
-    if old_students_prv is None:
-        old_students_prv = 0
-
-    new_students_prev = previous_year_students_total - old_students_prv
-
-    increased_students = total_students - previous_year_students_total
-    total_growth_percentage = increased_students / previous_year_students_total * 100 if previous_year_students_total else 0
-    new_students_growth_percentage = (new_students - new_students_prev) / new_students_prev * 100 if new_students_prev else 0
-    
+    stats = dashboard_stats(school_id, selected_session, class_ids)
 
     # ---------------------------------------------------
-    # 5. Final JSON response
+    # 4. Final JSON response
     # ---------------------------------------------------
     # Convert SQLAlchemy Row objects to dictionaries
     students_list = [s._asdict() for s in data]
@@ -134,17 +233,6 @@ def get_students_data():
     return jsonify({
         'status': 'success',
         'students': students_list,
-        'total_count': total_students,
-        'stats': {
-            'total_students': total_students,
-            'total_girls': total_girls,
-            'total_boys': total_boys,
-            'new_students': new_students,
-            'old_students': old_students,
-            'increased_students': increased_students,
-            'new_students_growth_percentage': new_students_growth_percentage,
-            'previous_year_students_total': previous_year_students_total,
-            'total_growth_percentage': total_growth_percentage,
-            'new_students_prev': new_students_prev
-        }
+        'total_count': len(students_list),
+        'stats': stats
     })
@@ -12,6 +12,7 @@ from src import db
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
+from src.controller.jobs.document_jobs import background_job
 
 
 get_students_pdf_api_bp = Blueprint( 'get_students_pdf_api_bp',   __name__)
@@ -20,6 +21,7 @@ get_students_pdf_api_bp = Blueprint( 'get_students_pdf_api_bp',   __name__)
 @get_students_pdf_api_bp.route('/api/get_students_pdf_api', methods=["GET"])
 @login_required
 @permission_required('admission')
+@background_job
 def get_students_pdf_api():
 
     school_id = session['school_id']
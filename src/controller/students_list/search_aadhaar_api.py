@@ -0,0 +1,67 @@
+# src/controller/students_list/search_aadhaar_api.py
+
+from flask import jsonify, session, Blueprint, request
+from sqlalchemy import and_, or_
+
+from src.model.StudentsDB import StudentsDB, BLIND_INDEXED, AADHAAR_PLACEHOLDER, blind_index
+from src.model.StudentSessions import StudentSessions
+from src.model.ClassData import ClassData
+
+from src import db
+from src.controller.permissions.permission_required import permission_required
+from src.controller.auth.login_required import login_required
+
+
+search_aadhaar_api_bp = Blueprint('search_aadhaar_api_bp', __name__)
+
+
+@search_aadhaar_api_bp.route('/api/search_aadhaar', methods=['GET'])
+@login_required
+@permission_required('student_list')
+def search_aadhaar():
+    """Students of the school whose own, father's or mother's Aadhaar is the given number."""
+    aadhaar = ''.join(ch for ch in request.args.get('aadhaar', '') if ch.isdigit())
+    if len(aadhaar) != 12:
+        return jsonify({"message": "Aadhaar must be 12 digits"}), 400
+    if aadhaar == AADHAAR_PLACEHOLDER:
+        return jsonify({"message": "This is the placeholder for a missing Aadhaar"}), 400
+
+    school_id = session['school_id']
+    digest = blind_index(aadhaar)
+
+    # Index hits on (school_id, *_bidx), nothing is decrypted
+    rows = db.session.query(
+        StudentsDB.id, StudentsDB.STUDENTS_NAME, StudentsDB.FATHERS_NAME,
+        StudentsDB.ADMISSION_NO, StudentsDB.SR, StudentsDB.IMAGE,
+        *[getattr(StudentsDB, column) for column in BLIND_INDEXED.values()],
+        StudentSessions.ROLL, ClassData.CLASS, ClassData.Section,
+    ).outerjoin(
+        StudentSessions, and_(
+            StudentSessions.student_id == StudentsDB.id,
+            StudentSessions.session_id == session['session_id'],
+        )
+    ).outerjoin(
+        ClassData, StudentSessions.class_id == ClassData.id
+    ).filter(
+        StudentsDB.school_id == school_id,
+        or_(*[getattr(StudentsDB, column) == digest for column in BLIND_INDEXED.values()])
+    ).order_by(StudentsDB.id.asc()).all()
+
+    students = [
+        {
+            "id": row.id,
+            "STUDENTS_NAME": row.STUDENTS_NAME,
+            "FATHERS_NAME": row.FATHERS_NAME,
+            "ADMISSION_NO": row.ADMISSION_NO,
+            "SR": row.SR,
+            "IMAGE": row.IMAGE,
+            "CLASS": row.CLASS,
+            "Section": row.Section,
+            "ROLL": row.ROLL,
+            # AADHAAR, FATHERS_AADHAR and/or MOTHERS_AADHAR
+            "matched": [field for field, column in BLIND_INDEXED.items() if getattr(row, column) == digest],
+        }
+        for row in rows
+    ]
+
+    return jsonify({"students": students, "count": len(students)}), 200
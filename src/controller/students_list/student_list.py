@@ -1,10 +1,8 @@
 # src/controller/student_list.py
 
 from flask import render_template, session, Blueprint
-from src.model.ClassData import ClassData
-from src.model.ClassAccess import ClassAccess
 
-from src import db
+from src.controller.utils.reference_cache import user_classes
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
 
@@ -17,15 +15,7 @@ student_list_bp = Blueprint('student_list_bp', __name__)
 @permission_required('student_list')
 def student_list():
 
-    user_id = session["user_id"]
-
-    classes = (
-        db.session.query(ClassData)
-        .join(ClassAccess, ClassAccess.class_id == ClassData.id)
-        .filter(ClassAccess.staff_id == user_id)
-        .order_by(ClassData.id.asc())
-        .all()
-    )
+    classes = user_classes(session["school_id"], session["user_id"])
     return render_template(
         'student_list.html',
         data=[],
@@ -0,0 +1,24 @@
+# src/controller/students_list/student_stats_api.py
+
+from flask import jsonify, session, Blueprint
+
+from src.controller.permissions.permission_required import permission_required
+from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import dashboard_stats
+from src.controller.utils.reference_cache import user_class_ids
+
+
+student_stats_api_bp = Blueprint('student_stats_api_bp', __name__)
+
+
+@student_stats_api_bp.route('/api/student_stats', methods=['GET'])
+@login_required
+@permission_required('student_list')
+def student_stats():
+    """Dashboard counts of /api/get_students_data without the student rows."""
+    class_ids = sorted(user_class_ids(session['school_id'], session["user_id"]))
+
+    return jsonify({
+        'status': 'success',
+        'stats': dashboard_stats(session['school_id'], session['session_id'], class_ids)
+    }), 200
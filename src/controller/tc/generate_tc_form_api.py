@@ -14,6 +14,7 @@ from datetime import datetime
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
+from src.controller.students.utils.student_stats import invalidate_student_stats
 
 generate_and_save_tc_api_bp = Blueprint('generate_and_save_tc_api_bp', __name__)
 
@@ -168,6 +169,8 @@ def generate_and_save_tc():
         db.session.rollback()
         return jsonify({"message": "Database error while saving TC."}), 500
 
+    invalidate_student_stats(school_id, previous_session_id)
+
     # ------------------------------
     # Render TC HTML
     # ------------------------------
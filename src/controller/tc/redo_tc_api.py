@@ -5,6 +5,7 @@ from src.model import StudentSessions
 
 from src.controller.permissions.permission_required import permission_required
 from src.controller.auth.login_required import login_required
+from src.controller.students.utils.student_stats import invalidate_student_stats
 
 revert_tc_api_bp = Blueprint('revert_tc_api_bp', __name__)
 
@@ -40,6 +41,7 @@ def revert_tc():
     student_session.left_reason = None
 
     db.session.commit()
+    invalidate_student_stats(session.get("school_id"), student_session.session_id)
 
     return jsonify({
         "message": "TC reverted successfully.",
@@ -3,6 +3,7 @@ from flask import render_template, session, request, Blueprint, jsonify
 
 from src.controller.auth.login_required import login_required
 from src.controller.permissions.permission_required import permission_required
+from src.controller.jobs.document_jobs import background_job
 
 from src.model import StudentsDB, ClassData, StudentSessions, Schools
 from src import db
@@ -13,6 +14,7 @@ get_seat_chits_bp = Blueprint('get_seat_chits_bp', __name__)
 @get_seat_chits_bp.route('/seat_chits', methods=['GET'])
 @login_required
 @permission_required('admission')
+@background_job
 def get_seat_chits_api():
     """Fetch students for admit cards and render `admit.html`.
 
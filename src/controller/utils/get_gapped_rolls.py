@@ -1,7 +1,51 @@
-from sqlalchemy import select
-from src.model import StudentSessions
+from sqlalchemy import BigInteger, bindparam, text
 from src import db
 
+
+# Missing rolls between 1 and the highest roll of each class, computed by Postgres
+GAPPED_ROLLS_SQL = text("""
+    WITH taken AS (
+        SELECT class_id, "ROLL"
+        FROM "StudentSessions"
+        WHERE session_id = :session_id AND class_id IN :class_ids AND "ROLL" IS NOT NULL
+    ), max_rolls AS (
+        SELECT class_id, max("ROLL") AS max_roll FROM taken GROUP BY class_id
+    )
+    SELECT m.class_id, m.max_roll, ARRAY(
+        SELECT g FROM generate_series(1, m.max_roll) AS g
+        EXCEPT
+        SELECT t."ROLL" FROM taken t WHERE t.class_id = m.class_id
+        ORDER BY 1
+    ) AS gapped_rolls
+    FROM max_rolls m
+""").bindparams(bindparam("class_ids", expanding=True, type_=BigInteger))
+
+# First key of pg_advisory_xact_lock(int, int), the second one is the class/session
+ROLL_LOCK_NAMESPACE = 7301
+
+
+def get_gapped_rolls_for_classes(class_ids, session_id):
+    """
+    get_gapped_rolls() of many classes in one query.
+
+    Returns:
+        dict: {class_id: {'gapped_rolls': [...], 'next_roll': int}}, every requested class included.
+    """
+    class_ids = [int(class_id) for class_id in class_ids]
+    result = {class_id: {'gapped_rolls': [], 'next_roll': 1} for class_id in class_ids}
+    if not class_ids:
+        return result
+
+    rows = db.session.execute(GAPPED_ROLLS_SQL, {"session_id": session_id, "class_ids": class_ids}).all()
+    for class_id, max_roll, gapped_rolls in rows:
+        result[class_id] = {
+            'gapped_rolls': list(gapped_rolls),
+            'next_roll': max_roll + 1
+        }
+
+    return result
+
+
 def get_gapped_rolls(class_id, session_id):
     """
     Get the gapped (missing) roll numbers in a specific class and session,
@@ -12,44 +56,43 @@ def get_gapped_rolls(class_id, session_id):
         session_id (int): The ID of the session.
 
     Returns:
-        dict: A dictionary with 'gaped_rolls' (list of missing roll numbers)
+        dict: A dictionary with 'gapped_rolls' (list of missing roll numbers)
               and 'next_roll' (the next available roll number).
     """
-    # Query to get all roll numbers for the given class and session, ordered by roll
-    query = (
-        select(StudentSessions.ROLL)
-        .where(
-            StudentSessions.class_id == class_id,
-            StudentSessions.session_id == session_id,
-            StudentSessions.ROLL.isnot(None)
-        )
-        .order_by(StudentSessions.ROLL)
-    )
-
-    # Execute the query and get the list of rolls
-    result = db.session.execute(query).scalars().all()
-    rolls = list(result)
+    return get_gapped_rolls_for_classes([class_id], session_id)[int(class_id)]
 
-    if not rolls:
-        # No rolls exist, so no gaps, next roll is 1
-        return {
-            'gapped_rolls': [],
-            'next_roll': 1
-        }
 
-    # Find min and max roll
-    max_roll = max(rolls)
+def lock_class_rolls(class_id, session_id):
+    """
+    Serializes roll assignment in one class/session until the current
+    transaction commits or rolls back. Call it before checking a roll that is
+    about to be inserted, so two admissions can't both see the same roll free.
+    """
+    db.session.execute(
+        text("SELECT pg_advisory_xact_lock(:namespace, hashtext(:key))"),
+        {"namespace": ROLL_LOCK_NAMESPACE, "key": f"{int(class_id)}:{int(session_id)}"}
+    )
 
-    all_rolls = set(range(1, max_roll + 1))  # All rolls from 1 to max
-    existing_rolls = set(rolls)              # Existing rolls
-    gapped_rolls = sorted(all_rolls - existing_rolls)  # Missing roll
-    print(gapped_rolls)
 
-    # Next available roll
-    next_roll = max_roll + 1
+def reserve_next_roll(class_id, session_id):
+    """
+    Locks the class rolls and returns the lowest free roll. The roll stays
+    reserved until the caller's transaction ends, the caller inserts it.
+    """
+    lock_class_rolls(class_id, session_id)
+    available = get_gapped_rolls(class_id, session_id)
+    return available['gapped_rolls'][0] if available['gapped_rolls'] else available['next_roll']
 
 
-    return {
-        'gapped_rolls': gapped_rolls,
-        'next_roll': next_roll
-    }
\ No newline at end of file
+def roll_is_free(class_id, session_id, roll, exclude_student_session_id=None):
+    """True if nobody has `roll` in the class/session (cheaper than listing every gap)."""
+    query = text("""
+        SELECT NOT EXISTS (
+            SELECT 1 FROM "StudentSessions"
+            WHERE class_id = :class_id AND session_id = :session_id AND "ROLL" = :roll
+              AND id IS DISTINCT FROM :exclude_id
+        )
+    """)
+    return db.session.execute(query, {
+        "class_id": class_id, "session_id": session_id, "roll": roll, "exclude_id": exclude_student_session_id
+    }).scalar()
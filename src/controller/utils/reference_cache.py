@@ -0,0 +1,223 @@
+# src/controller/utils/reference_cache.py
+# Used in --> student_list.py, get_students_data_api.py, student_stats_api.py, idcard.py, fill_marks.py,
+#             get_result_api.py, bulk_download_results.py, get_admit_cards_api.py
+# Invalidated from --> add_staff_api.py, update_staff_api.py, fill_marks.py (update_exam_status),
+#                      `flask reload-reference-data`
+
+"""Per-school cache of slowly-changing reference rows.
+
+Classes, class access, subjects, exams, school details and signatures are read
+on almost every page but change a few times a year. They are cached in-process
+per school, under a write version kept in Redis (``reference_version:<school>``)
+so a bump from any app instance or worker invalidates every process. The
+version is read once per request.
+
+Cached values are shared between requests: plain rows / tuples / dicts that
+callers must not modify.
+"""
+
+import threading
+
+import redis
+from cachetools import TTLCache
+from flask import g
+
+from src import r, db
+from src.model import ClassData, ClassExams, Exams, Schools, Subjects, TeachersLogin
+from src.model.ClassAccess import ClassAccess
+from src.model.Roles import Roles
+
+
+REFERENCE_CACHE_SIZE = 512      # (school, kind) entries kept per process
+REFERENCE_CACHE_TTL = 10 * 60   # seconds, bounds staleness from edits made outside the app
+
+_reference_cache = TTLCache(maxsize=REFERENCE_CACHE_SIZE, ttl=REFERENCE_CACHE_TTL)
+_reference_cache_lock = threading.Lock()
+
+
+def _version_key(school_id):
+    return f"reference_version:{school_id}"
+
+
+def _school_version(school_id):
+    """Write version of the school, None if Redis is unavailable."""
+    versions = g.setdefault('_reference_versions', {})
+    if school_id not in versions:
+        try:
+            versions[school_id] = r.get(_version_key(school_id)) or "0"
+        except redis.exceptions.RedisError as e:
+            print("Reference cache disabled, Redis unavailable:", e)
+            versions[school_id] = None
+    return versions[school_id]
+
+
+def _cached(school_id, kind, loader):
+    school_id = str(school_id)
+    version = _school_version(school_id)
+    if version is None:
+        return loader(school_id)
+
+    cache_key = (school_id, kind, version)
+    with _reference_cache_lock:
+        value = _reference_cache.get(cache_key)
+
+    if value is None:
+        value = loader(school_id)
+        with _reference_cache_lock:
+            _reference_cache[cache_key] = value
+    return value
+
+
+# -------------------------------
+# Invalidation
+# -------------------------------
+
+def bump_reference_version(school_id):
+    """Invalidate every cached reference row of a school (call after the write is committed)."""
+    school_id = str(school_id)
+    try:
+        r.incr(_version_key(school_id))
+    except redis.exceptions.RedisError as e:
+        print("Unable to bump reference version:", e)
+    g.get('_reference_versions', {}).pop(school_id, None)
+
+
+# -------------------------------
+# Loaders
+# -------------------------------
+
+def _load_classes(school_id):
+    return tuple(
+        db.session.query(
+            ClassData.id, ClassData.CLASS, ClassData.Section,
+            ClassData.display_order, ClassData.grade_level
+        )
+        .filter(ClassData.school_id == school_id)
+        .order_by(ClassData.id.asc())
+        .all()
+    )
+
+
+def _load_class_access(school_id):
+    access = {}
+    rows = (
+        db.session.query(ClassAccess.staff_id, ClassAccess.class_id)
+        .join(ClassData, ClassData.id == ClassAccess.class_id)
+        .filter(ClassData.school_id == school_id)
+        .all()
+    )
+    for staff_id, class_id in rows:
+        access.setdefault(staff_id, set()).add(class_id)
+    return {staff_id: frozenset(class_ids) for staff_id, class_ids in access.items()}
+
+
+def _load_subjects(school_id):
+    return tuple(
+        db.session.query(Subjects.id, Subjects.subject, Subjects.display_order, Subjects.class_id)
+        .filter(Subjects.school_id == school_id, Subjects.is_active == True)
+        .order_by(Subjects.display_order.asc())
+        .all()
+    )
+
+
+def _load_exams(school_id):
+    exams = (
+        db.session.query(Exams.id, Exams.exam_name, Exams.is_enabled, Exams.display_order)
+        .filter(Exams.school_id == school_id)
+        .order_by(Exams.display_order.asc())
+        .all()
+    )
+
+    exam_classes = {}
+    rows = (
+        db.session.query(ClassExams.exam_id, ClassExams.class_id)
+        .join(Exams, Exams.id == ClassExams.exam_id)
+        .filter(Exams.school_id == school_id)
+        .all()
+    )
+    for exam_id, class_id in rows:
+        exam_classes.setdefault(exam_id, set()).add(class_id)
+
+    return tuple((exam, frozenset(exam_classes.get(exam.id, ()))) for exam in exams)
+
+
+def _load_school(school_id):
+    return (
+        db.session.query(
+            Schools.School_Name, Schools.Address, Schools.Phone, Schools.Logo,
+            Schools.UDISE, Schools.school_heading_image
+        )
+        .filter(Schools.id == school_id)
+        .first()
+    )
+
+
+def _load_signs(school_id):
+    rows = (
+        db.session.query(
+            TeachersLogin.Sign,
+            Roles.role_name,
+            ClassAccess.class_id
+        )
+        .join(Roles, Roles.id == TeachersLogin.role_id)
+        .outerjoin(ClassAccess, ClassAccess.staff_id == TeachersLogin.id)
+        .filter(
+            TeachersLogin.school_id == school_id,
+            Roles.role_name.in_(["Principal", "Teacher"])
+        )
+        .all()
+    )
+
+    principal_sign = None
+    teacher_signs = {}
+
+    for sign, role, cls_id in rows:
+        if role == "Principal":
+            principal_sign = sign
+        elif role == "Teacher" and cls_id is not None:
+            teacher_signs[cls_id] = sign
+
+    return principal_sign, teacher_signs
+
+
+# -------------------------------
+# Cached lookups
+# -------------------------------
+
+def school_classes(school_id):
+    """Every class of the school (id, CLASS, Section, display_order, grade_level), by id."""
+    return _cached(school_id, "classes", _load_classes)
+
+
+def user_class_ids(school_id, user_id):
+    """Ids of the classes the staff member can access (ClassAccess)."""
+    return _cached(school_id, "class_access", _load_class_access).get(int(user_id), frozenset())
+
+
+def user_classes(school_id, user_id):
+    """Classes the staff member can access, by id (the class dropdowns)."""
+    class_ids = user_class_ids(school_id, user_id)
+    return [cls for cls in school_classes(school_id) if cls.id in class_ids]
+
+
+def class_subjects(school_id, class_ids):
+    """Active subjects (id, subject, display_order, class_id) of the classes, by display_order."""
+    class_ids = set(class_ids)
+    return [s for s in _cached(school_id, "subjects", _load_subjects) if s.class_id in class_ids]
+
+
+def class_exams(school_id, class_ids):
+    """Exams (id, exam_name, is_enabled, display_order) given to any of the classes, by display_order."""
+    class_ids = set(class_ids)
+    return [exam for exam, exam_class_ids in _cached(school_id, "exams", _load_exams)
+            if not exam_class_ids.isdisjoint(class_ids)]
+
+
+def school_info(school_id):
+    """School_Name, Address, Phone, Logo, UDISE and school_heading_image, None for an unknown school."""
+    return _cached(school_id, "school", _load_school)
+
+
+def school_signs(school_id):
+    """(principal sign, {class_id: class teacher sign}) for report cards and ID cards."""
+    return _cached(school_id, "signs", _load_signs)
@@ -0,0 +1,196 @@
+# src/db_pool.py
+# Used in --> src/__init__.py (create_app), pool_metrics_api.py
+
+"""Database connection pool: engine options and instrumentation.
+
+Sizing. The database (or the pooler in front of it) allows DB_CONNECTION_LIMIT
+connections to the whole app. It is split between WEB_CONCURRENCY processes,
+and each process gets about 60% of its share as pool_size and the rest as
+max_overflow. The defaults (limit 5, one process) give the previous
+pool_size=3, max_overflow=2.
+
+Modes, selected by DB_POOL_MODE:
+  - "direct" (default): connections go straight to Postgres (Supabase session
+    pooler on 5432). pool_pre_ping is on, because idle server connections get
+    dropped.
+  - "pgbouncer": connections go to a transaction-mode pooler (Supabase on
+    6543). Many more client connections are allowed (default limit 20).
+    pool_pre_ping is off, because the pooler keeps its server connections
+    healthy. Driver statement caches are disabled, since a prepared statement
+    doesn't survive a change of server connection. The app only uses
+    transaction-scoped state (pg_advisory_xact_lock), which is safe there.
+
+Instrumentation (DB_POOL_METRICS, on by default) records, per process:
+  - how long each checkout waited
+  - how long each endpoint held its connection
+  - overflow usage and checkout timeouts
+It is read by GET /api/metrics/pool.
+"""
+
+import os
+import threading
+import time
+
+from flask import has_request_context, request
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from src.timings import Timings
+
+
+POOL_MODES = ("direct", "pgbouncer")
+DEFAULT_CONNECTION_LIMIT = {"direct": 5, "pgbouncer": 20}
+SLOW_CHECKOUT_WARNING = 1.0     # seconds, a checkout waiting longer is printed
+
+_metrics_lock = threading.Lock()
+_checkout_wait = Timings()
+_hold_by_endpoint = {}          # endpoint: Timings
+_counters = {"checkouts": 0, "overflow_checkouts": 0, "timeouts": 0, "peak_overflow": 0, "peak_checked_out": 0}
+_pool_config = {}
+
+
+def _env_flag(name, default):
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return value.lower() in ("1", "true", "yes", "on")
+
+
+def pool_sizes(connection_limit, processes):
+    """(pool_size, max_overflow) of one process."""
+    share = max(1, connection_limit // max(1, processes))
+    pool_size = max(1, round(share * 0.6))
+    return pool_size, share - pool_size
+
+
+def engine_options(uri=None, mode=None):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured DB_POOL_MODE."""
+    mode = (mode or os.getenv("DB_POOL_MODE", "direct")).lower()
+    if mode not in POOL_MODES:
+        raise ValueError(f"Unknown DB_POOL_MODE: {mode}")
+
+    connection_limit = int(os.getenv("DB_CONNECTION_LIMIT", DEFAULT_CONNECTION_LIMIT[mode]))
+    processes = int(os.getenv("WEB_CONCURRENCY", 1))
+    pool_size, max_overflow = pool_sizes(connection_limit, processes)
+
+    options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": 1800,
+        "pool_pre_ping": _env_flag("DB_POOL_PRE_PING", mode == "direct"),
+    }
+
+    if mode == "pgbouncer" and uri:
+        driver = make_url(uri).get_driver_name()
+        if driver == "psycopg":
+            # psycopg 3 prepares repeated statements on the server connection
+            options["connect_args"] = {"prepare_threshold": None}
+        elif driver == "asyncpg":
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+        # psycopg2 never prepares server-side statements, nothing to disable
+
+    if _env_flag("DB_POOL_METRICS", True):
+        options["poolclass"] = InstrumentedQueuePool
+
+    _pool_config.clear()
+    _pool_config.update(
+        {key: value for key, value in options.items() if key != "poolclass"},
+        mode=mode, connection_limit=connection_limit, processes=processes,
+        instrumented="poolclass" in options,
+    )
+    return options
+
+
+# -------------------------------
+# Instrumentation
+# -------------------------------
+
+def _current_endpoint():
+    if has_request_context():
+        return request.endpoint or request.path
+    return "(no request)"
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool recording checkout waits, hold time per endpoint and overflow usage."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            with _metrics_lock:
+                _counters["timeouts"] += 1
+            print(f"DB pool: checkout timed out after {time.perf_counter() - start:.1f}s ({_current_endpoint()})")
+            raise
+
+        waited = time.perf_counter() - start
+        endpoint = _current_endpoint()
+        _checkout_wait.add(waited)
+        if waited > SLOW_CHECKOUT_WARNING:
+            print(f"DB pool: waited {waited:.2f}s for a connection ({endpoint})")
+
+        overflow = max(self.overflow(), 0)
+        with _metrics_lock:
+            _counters["checkouts"] += 1
+            if overflow:
+                _counters["overflow_checkouts"] += 1
+            _counters["peak_overflow"] = max(_counters["peak_overflow"], overflow)
+            _counters["peak_checked_out"] = max(_counters["peak_checked_out"], self.checkedout())
+
+        record.info["checked_out_at"] = time.perf_counter()
+        record.info["endpoint"] = endpoint
+        return record
+
+    def _do_return_conn(self, record):
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            endpoint = record.info.pop("endpoint", None)
+            with _metrics_lock:
+                timings = _hold_by_endpoint.get(endpoint)
+                if timings is None:
+                    timings = _hold_by_endpoint[endpoint] = Timings()
+            timings.add(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+
+def pool_metrics(engine):
+    """Configuration, live state and recorded metrics of this process' pool."""
+    pool = engine.pool
+    with _metrics_lock:
+        counters = dict(_counters)
+        hold = dict(_hold_by_endpoint)
+
+    metrics = {
+        "pid": os.getpid(),
+        "config": dict(_pool_config),
+        "status": pool.status(),
+    }
+    if isinstance(pool, QueuePool):
+        metrics["state"] = {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(pool.overflow(), 0),
+        }
+    if isinstance(pool, InstrumentedQueuePool):
+        metrics["counters"] = counters
+        metrics["checkout_wait"] = _checkout_wait.summary()
+        # Endpoints holding connections longest first
+        metrics["hold_by_endpoint"] = dict(sorted(
+            ((endpoint, timings.summary()) for endpoint, timings in hold.items()),
+            key=lambda item: item[1].get("max_ms", 0), reverse=True
+        ))
+    return metrics
+
+
+def reset_pool_metrics():
+    global _checkout_wait
+
+    with _metrics_lock:
+        _checkout_wait = Timings()
+        _hold_by_endpoint.clear()
+        for key in _counters:
+            _counters[key] = 0
@@ -1,6 +1,6 @@
 from datetime import datetime
 from sqlalchemy import (
-    Column, Text, ForeignKey,BigInteger, Date
+    Column, Text, ForeignKey,BigInteger, Date, UniqueConstraint
 )
 from src import db
 
@@ -22,3 +22,7 @@ class StudentMarks(db.Model):
     school = db.relationship('Schools', back_populates='marks')
     session = db.relationship('Sessions', back_populates='marks')
     exams = db.relationship('Exams', back_populates='marks')
+
+    __table_args__ = (
+        UniqueConstraint('student_id', 'subject_id', 'exam_id', 'session_id', name='uix_student_marks_unique'),
+    )
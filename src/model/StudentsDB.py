@@ -1,11 +1,16 @@
 from sqlalchemy import (
     Column, Integer, BigInteger, Text, Date, Numeric, JSON,
-    ForeignKey, TypeDecorator, UniqueConstraint)
+    ForeignKey, TypeDecorator, UniqueConstraint, Index)
+
+from sqlalchemy.orm import deferred, validates
 
 from src import db
 from .enums import StudentsDBEnums
 
 import os
+import hmac
+import hashlib
+from functools import lru_cache
 from cryptography.fernet import Fernet
 
 
@@ -17,7 +22,17 @@ if not FERNET_KEY:
 
 fernet = Fernet(FERNET_KEY)
 
-def create_encrypted_text_type(fernet_instance):
+# Decrypted values kept in memory (ciphertext -> plaintext), 0 turns the cache off
+FERNET_CACHE_SIZE = int(os.environ.get('FERNET_CACHE_SIZE', 20000))
+
+def create_encrypted_text_type(fernet_instance, cache_size=FERNET_CACHE_SIZE):
+
+    # A stored token never changes (a new value is a new token), so every list load
+    # after the first one decrypts nothing
+    @lru_cache(maxsize=cache_size)
+    def decrypt(token):
+        return fernet_instance.decrypt(token.encode('utf-8')).decode('utf-8')
+
     class EncryptedText(TypeDecorator):
         impl = Text  # Underlying database type is Text
         cache_ok = True
@@ -32,15 +47,46 @@ def create_encrypted_text_type(fernet_instance):
         def process_result_value(self, value, dialect):
             """Decrypt the value after loading from the database."""
             if value is not None:
-                decrypted = fernet_instance.decrypt(value.encode('utf-8'))
-                return decrypted.decode('utf-8')
+                return decrypt(value)
             return value
 
+    EncryptedText.decrypt = staticmethod(decrypt)
     return EncryptedText
 
 # Create the EncryptedText type with the Fernet instance
 EncryptedText = create_encrypted_text_type(fernet)
 
+# Deferred loading group of the encrypted columns, undefer_group(ENCRYPTED_GROUP) loads them with the row
+ENCRYPTED_GROUP = 'encrypted'
+
+# Deferred loading group of the blind index columns, only the lookups that compare them read them
+BLIND_INDEX_GROUP = 'blind_index'
+
+
+# Blind index: Fernet ciphertexts are random, so equality lookups go through an HMAC of the value instead.
+# Changing BLIND_INDEX_KEY needs `flask --app app backfill-blind-index --all`.
+BLIND_INDEX_KEY = (os.environ.get('BLIND_INDEX_KEY') or
+                   hmac.new(FERNET_KEY.encode(), b'blind-index', hashlib.sha256).hexdigest()).encode()
+
+# encrypted column -> blind index column
+BLIND_INDEXED = {
+    'AADHAAR': 'AADHAAR_bidx',
+    'FATHERS_AADHAR': 'FATHERS_AADHAR_bidx',
+    'MOTHERS_AADHAR': 'MOTHERS_AADHAR_bidx',
+}
+
+# Entered when a student has no Aadhaar, never a conflict
+AADHAAR_PLACEHOLDER = '999999999999'
+
+def blind_index(value):
+    """HMAC-SHA256 of an Aadhaar number, spaces and dashes ignored."""
+    if value is None:
+        return None
+    value = ''.join(ch for ch in str(value) if ch.isalnum())
+    if not value:
+        return None
+    return hmac.new(BLIND_INDEX_KEY, value.encode(), hashlib.sha256).hexdigest()
+
 
 
 class StudentsDB(db.Model):
@@ -63,9 +109,21 @@ class StudentsDB(db.Model):
     MOTHERS_NAME = Column(Text, nullable=True)
     family_id = Column(Text, nullable=True)
 
-    FATHERS_AADHAR = db.Column(EncryptedText, nullable=True)
-    MOTHERS_AADHAR = db.Column(EncryptedText, nullable=True)
-    AADHAAR = db.Column(EncryptedText, unique=True, nullable=True)
+    # Not loaded with the student row, the group is fetched (and decrypted) when one of them is read.
+    # Column queries (db.session.query(StudentsDB.AADHAAR, ...)) still select them as usual.
+    FATHERS_AADHAR = deferred(db.Column(EncryptedText, nullable=True), group=ENCRYPTED_GROUP)
+    MOTHERS_AADHAR = deferred(db.Column(EncryptedText, nullable=True), group=ENCRYPTED_GROUP)
+    AADHAAR = deferred(db.Column(EncryptedText, unique=True, nullable=True), group=ENCRYPTED_GROUP)
+
+    # Filled from the values above on write (see set_blind_index), added by migrate_blind_index()
+    FATHERS_AADHAR_bidx = deferred(Column(Text, nullable=True), group=BLIND_INDEX_GROUP)
+    MOTHERS_AADHAR_bidx = deferred(Column(Text, nullable=True), group=BLIND_INDEX_GROUP)
+    AADHAAR_bidx = deferred(Column(Text, nullable=True), group=BLIND_INDEX_GROUP)
+
+    @validates(*BLIND_INDEXED)
+    def set_blind_index(self, key, value):
+        setattr(self, BLIND_INDEXED[key], blind_index(value))
+        return value
 
 
     PHONE = Column(Text, nullable=True)
@@ -118,4 +176,7 @@ class StudentsDB(db.Model):
     __table_args__ = (
         UniqueConstraint('school_id', 'SR', name='uix_school_SR'),
         UniqueConstraint('school_id', 'ADMISSION_NO', name='uix_school_ADMISSION_NO'),
+        Index('ix_StudentsDB_AADHAAR_bidx', 'school_id', 'AADHAAR_bidx'),
+        Index('ix_StudentsDB_FATHERS_AADHAR_bidx', 'school_id', 'FATHERS_AADHAR_bidx'),
+        Index('ix_StudentsDB_MOTHERS_AADHAR_bidx', 'school_id', 'MOTHERS_AADHAR_bidx'),
     )
\ No newline at end of file
@@ -0,0 +1,188 @@
+# src/profiler.py
+# Used in --> src/__init__.py (create_app), debug_perf_api.py
+
+"""Per-request profiler, enabled with PROFILER=1 (app.config['PROFILER_ENABLED']).
+
+When it is off nothing is registered: no SQLAlchemy event and no request hook.
+
+When it is on, every request records:
+  - its duration, per endpoint
+  - the number of queries and the time spent in them (cursor execute)
+  - statements repeated more than PROFILER_N_PLUS_ONE times (a loop issuing
+    one query per row), printed as an N+1 warning
+  - statements slower than PROFILER_SLOW_QUERY_MS, printed and kept in a
+    short list
+
+Responses get a Server-Timing header (db / app) for the browser dev tools.
+GET /debug/perf shows the per-endpoint percentiles of this process.
+"""
+
+import os
+import threading
+import time
+from collections import Counter, deque
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from src.timings import Timings
+
+
+SLOW_QUERIES_KEPT = 50
+STATEMENT_PREVIEW = 200         # characters of a statement shown in warnings
+
+_stats_lock = threading.Lock()
+_endpoints = {}                 # endpoint: {"request": Timings, "db": Timings, "queries": int, "max_queries": int, "n_plus_one": int}
+_slow_queries = deque(maxlen=SLOW_QUERIES_KEPT)
+_settings = {"enabled": False, "slow_query_ms": 200, "n_plus_one": 10}
+
+
+def profiler_enabled():
+    return _settings["enabled"]
+
+
+def _preview(statement):
+    return " ".join(statement.split())[:STATEMENT_PREVIEW]
+
+
+# -------------------------------
+# SQLAlchemy hooks
+# -------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("profiler_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("profiler_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+
+    if not has_request_context():
+        return
+    profile = g.get("_profile")
+    if profile is None:
+        return
+
+    profile["queries"] += 1
+    profile["db_time"] += elapsed
+    profile["statements"][statement] += 1
+
+    if elapsed * 1000 > _settings["slow_query_ms"]:
+        entry = {
+            "endpoint": request.endpoint,
+            "ms": round(elapsed * 1000, 2),
+            "statement": _preview(statement),
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with _stats_lock:
+            _slow_queries.append(entry)
+        print(f"Slow query ({entry['ms']} ms, {entry['endpoint']}): {entry['statement']}")
+
+
+def _query_failed(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("profiler_start"):
+        connection.info["profiler_start"].pop()
+
+
+# -------------------------------
+# Request hooks
+# -------------------------------
+
+def _start_request():
+    g._profile = {"start": time.perf_counter(), "queries": 0, "db_time": 0.0, "statements": Counter()}
+
+
+def _server_timing(response):
+    profile = g.get("_profile")
+    if profile is not None:
+        elapsed = time.perf_counter() - profile["start"]
+        response.headers["Server-Timing"] = (
+            f'db;dur={profile["db_time"] * 1000:.1f};desc="{profile["queries"]} queries", '
+            f'app;dur={elapsed * 1000:.1f}'
+        )
+    return response
+
+
+def _finish_request(exception=None):
+    profile = g.pop("_profile", None)
+    if profile is None:
+        return
+
+    endpoint = request.endpoint or "(unmatched)"
+    elapsed = time.perf_counter() - profile["start"]
+
+    repeated = [(statement, count) for statement, count in profile["statements"].items()
+                if count > _settings["n_plus_one"]]
+    for statement, count in repeated:
+        print(f"Possible N+1 in {endpoint}: statement ran {count} times: {_preview(statement)}")
+
+    with _stats_lock:
+        stats = _endpoints.get(endpoint)
+        if stats is None:
+            stats = _endpoints[endpoint] = {
+                "request": Timings(), "db": Timings(), "queries": 0, "max_queries": 0, "n_plus_one": 0
+            }
+        stats["queries"] += profile["queries"]
+        stats["max_queries"] = max(stats["max_queries"], profile["queries"])
+        stats["n_plus_one"] += len(repeated)
+
+    stats["request"].add(elapsed)
+    stats["db"].add(profile["db_time"])
+
+
+# -------------------------------
+# Setup / report
+# -------------------------------
+
+def init_profiler(app, engine):
+    """Hooks the profiler into the app and engine when app.config['PROFILER_ENABLED'] is set."""
+    if not app.config.get("PROFILER_ENABLED"):
+        return
+
+    _settings.update(
+        enabled=True,
+        slow_query_ms=float(app.config.get("PROFILER_SLOW_QUERY_MS", 200)),
+        n_plus_one=int(app.config.get("PROFILER_N_PLUS_ONE", 10)),
+    )
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _query_failed)
+
+    app.before_request(_start_request)
+    app.after_request(_server_timing)
+    app.teardown_request(_finish_request)
+
+
+def perf_report():
+    """Per-endpoint request / db percentiles and query counts, slowest p95 first."""
+    with _stats_lock:
+        endpoints = {endpoint: dict(stats) for endpoint, stats in _endpoints.items()}
+        slow_queries = list(_slow_queries)
+
+    report = {}
+    for endpoint, stats in endpoints.items():
+        request_summary = stats["request"].summary()
+        report[endpoint] = {
+            "request": request_summary,
+            "db": stats["db"].summary(),
+            "avg_queries": round(stats["queries"] / request_summary["count"], 1) if request_summary["count"] else 0,
+            "max_queries": stats["max_queries"],
+            "n_plus_one_warnings": stats["n_plus_one"],
+        }
+
+    return {
+        "pid": os.getpid(),
+        "settings": dict(_settings),
+        "endpoints": dict(sorted(report.items(), key=lambda item: item[1]["request"].get("p95_ms", 0), reverse=True)),
+        "slow_queries": slow_queries[::-1],
+    }
+
+
+def reset_perf_stats():
+    with _stats_lock:
+        _endpoints.clear()
+        _slow_queries.clear()
@@ -0,0 +1,46 @@
+# src/report_card_worker.py
+# Used in --> report_card_renderer.py (process pool workers)
+
+"""Worker side of the report card process pool.
+
+The pool uses a forkserver (or spawn) context, so workers start from a clean
+process instead of a fork of a threaded web worker. This module is what they
+import: it lives outside src.controller so that loading it does not import
+every blueprint. It needs only Flask/Jinja and the template folder.
+"""
+
+import os
+
+from flask import Flask
+
+
+CARD_TEMPLATE = "pdf-components/tall_result_card.html"
+
+_BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TEMPLATE_FOLDER = os.path.join(_BASE_DIR, "view", "templates")
+STATIC_FOLDER = os.path.join(_BASE_DIR, "view", "static")
+
+_card_template = None
+
+
+def _thumbnail_url(file_id, size=200):
+    # Same as thumbnail_cache.thumbnail_url, which can't be imported without src.controller
+    if not file_id:
+        return ""
+    return f"/img/{file_id}/{size}"
+
+
+def init_worker():
+    """Compiles the card template once per process."""
+    global _card_template
+
+    app = Flask("report_cards", template_folder=TEMPLATE_FOLDER, static_folder=STATIC_FOLDER)
+    app.jinja_env.globals['thumbnail_url'] = _thumbnail_url
+    # Same URLs as the web app, url_for() needs a request context
+    app.test_request_context("/").push()
+    _card_template = app.jinja_env.get_template(CARD_TEMPLATE)
+
+
+def render_chunk(students, context, template=None):
+    template = template or _card_template
+    return "".join(template.render(student=student, **context) for student in students)
@@ -0,0 +1,55 @@
+# src/timings.py
+# Used in --> db_pool.py, profiler.py
+
+"""Thread-safe duration statistics for the metrics endpoints.
+
+Count, total and max are exact; percentiles come from the last SAMPLE_SIZE
+samples, so they describe recent traffic and memory stays bounded.
+"""
+
+import threading
+from collections import deque
+
+
+SAMPLE_SIZE = 500
+
+
+def _percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, int(round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+class Timings:
+
+    def __init__(self, sample_size=SAMPLE_SIZE):
+        self._lock = threading.Lock()
+        self._samples = deque(maxlen=sample_size)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+            self._samples.append(seconds)
+
+    def summary(self):
+        """Milliseconds: count, avg, max, p50, p95 and p99."""
+        with self._lock:
+            count, total, maximum = self.count, self.total, self.max
+            samples = sorted(self._samples)
+
+        if not count:
+            return {"count": 0}
+
+        return {
+            "count": count,
+            "avg_ms": round(total / count * 1000, 2),
+            "max_ms": round(maximum * 1000, 2),
+            "p50_ms": round(_percentile(samples, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(samples, 0.99) * 1000, 2),
+        }
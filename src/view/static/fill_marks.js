@@ -1,29 +1,18 @@
 
-async function submit(button, inputID) {
-
-    const input = document.getElementById(inputID);
+// Returns { valid, score } for a marks input, reporting validation errors on the input
+function readScore(input, evaluation_type) {
     let score = input.value;
 
-    let marks_id = button.dataset.id;
-    const evaluation_type = button.dataset.evaluation_type;
-    const student_id = button.dataset.student_id;
-    const subject_id = button.dataset.subject_id;
-    const exam_id = button.dataset.exam_id;
-
     if (evaluation_type === 'grading') {
         if (!["A", "B", "C", "D", "E", "F", ""].includes(score)) {
             input.setCustomValidity("Invalid grade! Please enter A, B, C, D, E, or F.");
             input.reportValidity();
-            return;
+            return { valid: false };
         } else {
             input.setCustomValidity("");
         }
     }
 
-    if (marks_id === '' || marks_id === 'None') {
-        marks_id = null;
-    }
-
     // --- Validate Numeric ---
     if (evaluation_type === "numeric") {
         if (score === "") {
@@ -35,7 +24,7 @@ async function submit(button, inputID) {
             if (isNaN(num)) {
                 input.setCustomValidity("Please enter a valid number.");
                 input.reportValidity();
-                return;
+                return { valid: false };
             }
 
             const min = parseFloat(input.min) || 0;
@@ -44,13 +33,35 @@ async function submit(button, inputID) {
             if (num < min || num > max) {
                 input.setCustomValidity(`Score must be between ${min} and ${max}.`);
                 input.reportValidity();
-                return;
+                return { valid: false };
             } else {
                 input.setCustomValidity("");
             }
         }
     }
 
+    return { valid: true, score };
+}
+
+async function submit(button, inputID) {
+
+    const input = document.getElementById(inputID);
+
+    let marks_id = button.dataset.id;
+    const evaluation_type = button.dataset.evaluation_type;
+    const student_id = button.dataset.student_id;
+    const subject_id = button.dataset.subject_id;
+    const exam_id = button.dataset.exam_id;
+
+    const { valid, score } = readScore(input, evaluation_type);
+    if (!valid) {
+        return;
+    }
+
+    if (marks_id === '' || marks_id === 'None') {
+        marks_id = null;
+    }
+
     const originalButtonHTML = button.innerHTML;
     const originalBgClasses = [...button.classList].filter(c => c.includes("bg-"));
     button.disabled = true;
@@ -118,3 +129,73 @@ async function submit(button, inputID) {
         }
     }
 }
+
+
+// Saves every visible marks input of the grid with a single request
+async function submitAll(button) {
+
+    const desktop = document.getElementById("marks-desktop-container");
+    const isDesktop = desktop && desktop.offsetParent !== null;
+    const prefix = isDesktop ? "marks-desktop-" : "marks-mobile-";
+    const container = isDesktop ? desktop : document.getElementById("marks-mobile-container");
+
+    const marks = [];
+    let exam_id = null;
+
+    for (const rowButton of container.querySelectorAll(".submit-btn")) {
+        const input = document.getElementById(prefix + rowButton.dataset.student_id);
+        const { valid, score } = readScore(input, rowButton.dataset.evaluation_type);
+        if (!valid) {
+            input.classList.add("border-red-500");
+            input.focus();
+            return;
+        }
+
+        exam_id = rowButton.dataset.exam_id;
+        marks.push({
+            student_id: rowButton.dataset.student_id,
+            subject_id: rowButton.dataset.subject_id,
+            score
+        });
+    }
+
+    if (!marks.length) {
+        return;
+    }
+
+    const originalButtonHTML = button.innerHTML;
+    button.disabled = true;
+    button.innerHTML = "SAVING...";
+
+    try {
+        const response = await fetch("/bulk_update_marks_api", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ exam_id, marks })
+        });
+
+        const data = await response.json();
+        showAlert(response.status, data.message || "Failed to update marks.");
+
+        if (!response.ok) {
+            return;
+        }
+
+        // Keep the per-row buttons in sync with the saved mark ids
+        for (const saved of data.marks) {
+            document.querySelectorAll(
+                `.submit-btn[data-student_id="${saved.student_id}"][data-subject_id="${saved.subject_id}"]`
+            ).forEach(rowButton => { rowButton.dataset.id = saved.mark_id; });
+
+            const input = document.getElementById(prefix + saved.student_id);
+            input.classList.remove("border-red-500");
+            input.classList.add("is-valid");
+        }
+    } catch (error) {
+        console.error("Error:", error);
+        showAlert(400, "Unexpected error occurred. Please try again.");
+    } finally {
+        button.disabled = false;
+        button.innerHTML = originalButtonHTML;
+    }
+}
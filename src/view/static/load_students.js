@@ -171,14 +171,17 @@ function createStudentCard(student) {
     student.is_new = isAdmissionFromCurrentSession;
     
     const imageUrl = student.IMAGE 
-        ? `https://lh3.googleusercontent.com/d/${student.IMAGE}=s200`
+        ? `/img/${student.IMAGE}/200`
         : (student.GENDER.toLowerCase() === 'male' 
             ? '/static/no-student-boy-image.png'
             : '/static/no-student-girl-image.png');
     
     const rteTag = student.is_RTE ? '<span class="bg-yellow-500 text-gray-900 text-[9px] font-bold px-1.5 py-[2px] rounded">RTE</span>' : '';
     const newTag = student.student_status === 'new' ? '<span class="bg-blue-500 text-[9px] font-bold px-1.5 py-[2px] rounded">NEW</span>' : '';
-    const aadhaarTag = (!student.AADHAAR || student.AADHAAR === '' || student.AADHAAR === '999999999999') 
+    const noAadhaar = ('has_aadhaar' in student)
+        ? !student.has_aadhaar
+        : (!student.AADHAAR || student.AADHAAR === '' || student.AADHAAR === '999999999999');
+    const aadhaarTag = noAadhaar 
         ? '<span class="bg-red-500 text-[9px] font-bold px-1.5 py-[2px] rounded">No Aadhaar</span>' 
         : '';
     const penTag = (!student.PEN || student.PEN === '' || student.PEN === '999999999999') 
@@ -0,0 +1,146 @@
+import base64
+import os
+import tempfile
+import time
+
+from flask import Flask
+
+from src import db
+from src.model import StudentsDB
+from src.controller.students.utils import image_pipeline
+from src.controller.students.utils.image_pipeline import (
+    DELETED_IMAGES_FOLDER, IMAGE_JOB_KEY, IMAGE_RETRY, LocalImageStorage,
+    image_pending, process_next_job, queue_image_job,
+)
+
+
+# In-memory Redis, just the commands the image pipeline uses
+class FakeRedis:
+
+    def __init__(self):
+        self.values = {}
+        self.lists = {}
+        self.zsets = {}
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    def blpop(self, key, timeout=0):
+        if self.lists.get(key):
+            return key, self.lists[key].pop(0)
+        return None
+
+    def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zrangebyscore(self, key, low, high):
+        return [member for member, score in self.zsets.get(key, {}).items() if low <= score <= high]
+
+    def zrem(self, key, member):
+        return int(self.zsets.get(key, {}).pop(member, None) is not None)
+
+
+class FakePipeline:
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+# Fails the first upload, like a Drive timeout
+class FlakyStorage(LocalImageStorage):
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.failures = 1
+
+    def upload(self, image_base64, image_name, folder_id):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("Drive timed out")
+        return super().upload(image_base64, image_name, folder_id)
+
+
+def folder_files(root, folder):
+    path = os.path.join(root, folder)
+    return sorted(os.listdir(path)) if os.path.isdir(path) else []
+
+
+fake_redis = FakeRedis()
+image_pipeline.r = fake_redis
+image_pipeline.RETRY_BASE_SECONDS = 0  # retries are due right away
+
+app = Flask("image_pipeline_check")
+app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+db.init_app(app)
+
+root = tempfile.mkdtemp()
+storage = FlakyStorage(root)
+photo = base64.b64encode(b"new photo").decode()
+
+with app.app_context():
+    StudentsDB.__table__.create(db.engine)
+    db.session.add(StudentsDB(id=1, school_id=1, STUDENTS_NAME="Asha", GENDER="Female",
+                             admission_session_id=1, IMAGE="old_image"))
+    db.session.commit()
+
+    os.makedirs(os.path.join(root, "photos"))
+    open(os.path.join(root, "photos", "old_image"), "wb").close()
+
+    # queue
+    job_id = queue_image_job(1, "replace", image_base64=photo, image_name="Asha",
+                             folder_id="photos", old_image="old_image")
+    assert image_pending(1)
+    assert fake_redis.lists[image_pipeline.IMAGE_QUEUE] == [job_id]
+
+    # upload fails -> scheduled for a retry, IMAGE untouched
+    assert process_next_job(storage, poll_timeout=0)
+    assert job_id in fake_redis.zsets[IMAGE_RETRY]
+    assert '"attempts": 1' in fake_redis.get(IMAGE_JOB_KEY.format(job_id))
+    assert db.session.get(StudentsDB, 1).IMAGE == "old_image"
+    assert image_pending(1)
+
+    # retry is requeued, uploads and patches IMAGE, the old photo is moved away
+    time.sleep(0.01)
+    assert process_next_job(storage, poll_timeout=0)
+    new_image = db.session.get(StudentsDB, 1).IMAGE
+    assert new_image != "old_image"
+    assert folder_files(root, "photos") == [new_image]
+    assert folder_files(root, DELETED_IMAGES_FOLDER) == ["old_image"]
+    assert not image_pending(1)
+    assert fake_redis.get(IMAGE_JOB_KEY.format(job_id)) is None
+    assert not fake_redis.zsets[IMAGE_RETRY]
+
+    # IMAGE changed since the job was queued -> compare-and-set misses, the upload is discarded
+    queue_image_job(1, "replace", image_base64=photo, image_name="Asha",
+                    folder_id="photos", old_image="stale_image")
+    assert process_next_job(storage, poll_timeout=0)
+    assert db.session.get(StudentsDB, 1).IMAGE == new_image
+    assert folder_files(root, "photos") == [new_image]
+    assert len(folder_files(root, DELETED_IMAGES_FOLDER)) == 2
+    assert not image_pending(1)
+
+    assert not process_next_job(storage, poll_timeout=0)
+
+print("image pipeline OK")